@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+# 已解析文件的缓存：路径 -> ((mtime_ns, size), 解析结果)；文件被改写后按新的 mtime / 大小重新解析
+_parsed: dict[str, tuple[tuple[int, int], object]] = {}
+
+
+def read_cached(path: Path, parse: Callable[[Path], object]) -> Optional[object]:
+    # 文件不存在返回 None；解析出错时异常原样抛出且不缓存。返回的对象被多个调用方共享，需要改写时先复制
+    path = Path(path)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    key = str(path.resolve())
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _parsed.get(key)
+    if hit and hit[0] == stamp:
+        return hit[1]
+    value = parse(path)
+    _parsed[key] = (stamp, value)
+    return value
+
+
+def read_json(path: Path) -> Optional[object]:
+    return read_cached(path, lambda p: json.loads(p.read_text(encoding="utf-8")))
+
+
+def _parse_env(path: Path) -> dict:
+    # python-dotenv 只在确实要读 .env 时才导入，环境变量已给全的运行（如 cron）不需要它
+    from dotenv import dotenv_values
+
+    return dotenv_values(path)
+
+
+def read_env(path: Path) -> dict:
+    return read_cached(path, _parse_env) or {}
+
+
+class EnvFiles:
+    # 按顺序查找配置项：进程环境变量优先，其次依次是各 .env 文件；每个文件至多解析一次
+    def __init__(self, paths: Iterable[Path]) -> None:
+        self.paths = [Path(p) for p in paths]
+
+    def get(self, key: str) -> Optional[str]:
+        value = os.environ.get(key)
+        if value:
+            return value
+        for path in self.paths:
+            value = read_env(path).get(key)
+            if value:
+                return value
+        return None
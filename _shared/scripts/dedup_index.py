@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+# 规范见 ../dedup-scoring.md 第一节，TTL 默认值与 ../cache-schema.json 一致
+DEFAULT_TTL_DAYS = 7
+TRACKING_PARAMS = {"ref", "source"}
+
+_FINGERPRINT_STRIP_RE = re.compile(r"[\W_]+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dedup_entries (
+    scope TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (scope, kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_dedup_last_seen ON dedup_entries(scope, last_seen);
+"""
+
+
+def normalize_url(url: str) -> str:
+    parsed = urlparse((url or "").strip())
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+    path = parsed.path.rstrip("/")
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    ]
+    normalized = host + path
+    if query:
+        normalized += "?" + urlencode(sorted(query))
+    return normalized
+
+
+def content_fingerprint(title: str, summary: str = "") -> str:
+    return _FINGERPRINT_STRIP_RE.sub("", f"{title}{(summary or '')[:100]}".lower())[:50]
+
+
+def item_keys(item: dict) -> list[tuple[str, str]]:
+    keys = []
+    url_key = normalize_url(item.get("url", ""))
+    if url_key:
+        keys.append(("url", url_key))
+    fingerprint = content_fingerprint(item.get("title", ""), item.get("summary", ""))
+    if fingerprint:
+        keys.append(("hash", fingerprint))
+    return keys
+
+
+class DedupIndex:
+    # scope 区分不同使用方（report: 已收录进报告，notion: 已同步到 Notion），共用一个文件
+    def __init__(
+        self,
+        path: Path,
+        scope: str = "report",
+        ttl_days: int = DEFAULT_TTL_DAYS,
+        as_of: Optional[str] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.scope = scope
+        self.ttl_days = ttl_days
+        # 设置 as_of 时只把该日期之前首次出现的条目视为重复，同一天重跑不会把自己过滤掉
+        self.as_of = as_of
+        self.record_date = as_of or date.today().isoformat()
+        # 报告生成时 HN 源线程在抓取过程中就要查历史（边抓边排），连接允许跨线程使用，由 lock 串行化
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.executescript(SCHEMA)
+
+    def _seen_keys(self, keys: list[tuple[str, str]]) -> set[tuple[str, str]]:
+        seen = set()
+        for kind in ("url", "hash"):
+            values = [k for t, k in keys if t == kind]
+            for start in range(0, len(values), 900):
+                chunk = values[start : start + 900]
+                marks = ",".join("?" * len(chunk))
+                sql = f"SELECT key FROM dedup_entries WHERE scope = ? AND kind = ? AND key IN ({marks})"
+                params = [self.scope, kind, *chunk]
+                if self.as_of:
+                    sql += " AND first_seen < ?"
+                    params.append(self.as_of)
+                with self.lock:
+                    seen.update((kind, row[0]) for row in self.conn.execute(sql, params))
+        return seen
+
+    def contains(self, item: dict) -> bool:
+        return bool(self._seen_keys(item_keys(item)))
+
+    def filter_unseen(self, items: list[dict]) -> list[dict]:
+        per_item = [item_keys(x) for x in items]
+        seen = self._seen_keys([k for keys in per_item for k in keys])
+        return [x for x, keys in zip(items, per_item) if not any(k in seen for k in keys)]
+
+    def record(self, items: Iterable[dict]) -> None:
+        rows = [(self.scope, kind, key, self.record_date, self.record_date) for x in items for kind, key in item_keys(x)]
+        # 单个事务提交，中途失败不会留下半写状态
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO dedup_entries (scope, kind, key, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (scope, kind, key) DO UPDATE SET last_seen = MAX(last_seen, excluded.last_seen)",
+                rows,
+            )
+
+    def evict(self) -> int:
+        cutoff = (date.fromisoformat(self.record_date) - timedelta(days=self.ttl_days)).isoformat()
+        with self.lock, self.conn:
+            cur = self.conn.execute("DELETE FROM dedup_entries WHERE scope = ? AND last_seen < ?", (self.scope, cutoff))
+        return cur.rowcount
+
+    def import_cache_json(self, cache_path: Path) -> int:
+        # 迁移旧 cache.json 中的 url_cache / content_hashes 条目
+        if not Path(cache_path).exists():
+            return 0
+        cache = json.loads(Path(cache_path).read_text(encoding="utf-8"))
+        rows = []
+        for section, kind in (("url_cache", "url"), ("content_hashes", "hash")):
+            for key, seen in cache.get(section, {}).get("entries", {}).items():
+                key = normalize_url(key) if kind == "url" else key
+                if key and seen:
+                    rows.append((self.scope, kind, key, seen, seen))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO dedup_entries (scope, kind, key, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM dedup_entries WHERE scope = ?", (self.scope,)).fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import hashlib
+import io
+import json
+import os
+import random
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+RECORD = "record"
+REPLAY = "replay"
+
+# 录制时去掉条件请求头，保证夹具里存的都是完整响应；回放时再按夹具中的 ETag / Last-Modified 模拟 304
+CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+# 响应体已按 Content-Encoding 解码后再保存，这些头不能原样回放；Set-Cookie 可能带凭据，不落盘
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+
+def fixture_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    # 只按方法、完整 URL（含查询参数）和请求体区分，认证头等不参与，录制文件里也不保存
+    digest = hashlib.sha1(f"{method.upper()} {url}\n".encode("utf-8"))
+    if body:
+        digest.update(body if isinstance(body, bytes) else str(body).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class FixtureStore:
+    # 每个请求一个 JSON 文件：<dir>/<sha1>.json，写入走临时文件 + os.replace
+    def __init__(self, fixture_dir: Path) -> None:
+        self.dir = Path(fixture_dir)
+
+    def path(self, key: str) -> Path:
+        return self.dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        try:
+            return json.loads(self.path(key).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def put(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: dict,
+        content: bytes,
+        body: Optional[bytes] = None,
+        reason: str = "",
+    ) -> Path:
+        entry = {
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "reason": reason,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS},
+        }
+        try:
+            entry["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(content).decode("ascii")
+        self.dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(fixture_key(method, url, body))
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
+
+    def put_json(self, url: str, payload: object, headers: Optional[dict] = None, params: Optional[dict] = None) -> Path:
+        # 合成夹具用：URL 与查询参数按 requests 的规则拼接，和真实请求得到的键一致
+        url = requests.Request("GET", url, params=params).prepare().url
+        content = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        return self.put("GET", url, 200, {"Content-Type": "application/json", **(headers or {})}, content)
+
+
+class FixtureAdapter(HTTPAdapter):
+    # 挂到 requests.Session 上的传输层：record 模式照常请求并把响应写入夹具目录，
+    # replay 模式完全离线，从夹具构造响应，可附加合成延迟；找不到夹具时按连接错误处理
+    def __init__(
+        self,
+        fixture_dir: Path,
+        mode: str = REPLAY,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        seed: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"unknown fixture mode: {mode}")
+        self.store = FixtureStore(fixture_dir)
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rng = random.Random(seed)
+        self.recorded = 0
+        self.replayed = 0
+        self.missing = 0
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs) -> requests.Response:
+        if self.mode == RECORD:
+            return self.record(request, stream=stream, **kwargs)
+        return self.replay(request)
+
+    def record(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        for name in CONDITIONAL_HEADERS:
+            request.headers.pop(name, None)
+        resp = super().send(request, **kwargs)
+        content = resp.content
+        self.store.put(request.method, request.url, resp.status_code, dict(resp.headers), content, request.body, resp.reason)
+        self.recorded += 1
+        # 流式读取的调用方（如订阅源解析）仍从 raw 读，内容已读完，换成内存流
+        resp.raw = io.BytesIO(content)
+        return resp
+
+    def replay(self, request: requests.PreparedRequest) -> requests.Response:
+        delay = self.latency_ms + (self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        entry = self.store.get(fixture_key(request.method, request.url, request.body))
+        if entry is None:
+            self.missing += 1
+            raise requests.ConnectionError(f"no fixture for {request.method} {request.url}", request=request)
+        self.replayed += 1
+
+        headers = CaseInsensitiveDict(entry.get("headers", {}))
+        if "body_b64" in entry:
+            content = base64.b64decode(entry["body_b64"])
+        else:
+            content = entry.get("body", "").encode("utf-8")
+        status = entry["status"]
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if status == 200 and (
+            (etag and request.headers.get("If-None-Match") == etag)
+            or (last_modified and request.headers.get("If-Modified-Since") == last_modified)
+        ):
+            status, content = 304, b""
+
+        resp = requests.Response()
+        resp.status_code = status
+        resp.reason = "Not Modified" if status == 304 else entry.get("reason", "")
+        resp.headers = headers
+        resp.raw = io.BytesIO(content)
+        resp.url = request.url
+        resp.request = request
+        resp.encoding = requests.utils.get_encoding_from_headers(headers)
+        resp.connection = self
+        resp.elapsed = timedelta(0)
+        return resp
+
+
+def mount_fixtures(session: requests.Session, fixture_dir: Path, mode: str = REPLAY, **kwargs) -> FixtureAdapter:
+    # 需在调用方挂完自己的连接池 adapter 之后调用，覆盖 http:// 与 https://
+    adapter = FixtureAdapter(fixture_dir, mode, **kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
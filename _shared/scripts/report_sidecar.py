@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+# 报告旁的 JSON Lines 结构化副本：每行一条文章，字段与 notion-sync 的文章记录一致
+SIDECAR_SUFFIX = ".jsonl"
+ARTICLE_FIELDS = ("rank", "title", "summary", "key_points", "url", "source", "keywords", "score")
+
+
+def sidecar_path(report_path: Path) -> Path:
+    return Path(report_path).with_suffix(SIDECAR_SUFFIX)
+
+
+def write_sidecar(report_path: Path, records: Iterable[dict]) -> Path:
+    # 与报告一样先写临时文件再原子替换
+    path = sidecar_path(report_path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def fresh_sidecar(report_path: Path) -> Optional[Path]:
+    # 报告在 sidecar 之后被改动过（例如手工编辑）时 sidecar 视为过期，调用方应回退到解析 Markdown
+    path = sidecar_path(report_path)
+    try:
+        if path.stat().st_mtime >= Path(report_path).stat().st_mtime:
+            return path
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def iter_sidecar(path: Path) -> Iterator[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+from urllib.parse import urlparse
+
+# 当前线程在为哪个源工作；线程池提交任务时用 contextvars.copy_context() 传下去，HTTP 耗时据此归到对应的源
+current_source: ContextVar[Optional[str]] = ContextVar("current_source", default=None)
+
+
+def in_source(name: str, fn: Callable, *args) -> Callable:
+    def run():
+        token = current_source.set(name)
+        try:
+            return fn(*args)
+        finally:
+            current_source.reset(token)
+
+    return run
+
+
+def percentile(values: list[float], q: float) -> float:
+    # nearest-rank，样本少时不做插值
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class LatencyStats:
+    def __init__(self) -> None:
+        self.samples: list[float] = []
+        self.errors = 0
+
+    def add(self, ms: float, ok: bool = True) -> None:
+        self.samples.append(ms)
+        if not ok:
+            self.errors += 1
+
+    def summary(self) -> dict:
+        return {
+            "requests": len(self.samples),
+            "errors": self.errors,
+            "p50_ms": round(percentile(self.samples, 50), 1),
+            "p95_ms": round(percentile(self.samples, 95), 1),
+            "max_ms": round(max(self.samples, default=0.0), 1),
+        }
+
+
+class RunMetrics:
+    # 记录各阶段耗时、按源汇总的请求延迟，并可导出 Chrome trace（chrome://tracing / Perfetto 可直接打开）
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+        self.spans: list[dict] = []
+        self.stages: dict[str, float] = {}
+        self.latency: dict[str, LatencyStats] = {}
+
+    def _us(self, t: float) -> int:
+        return int((t - self.started) * 1e6)
+
+    def span(self, name: str, start: float, end: float, cat: str = "stage", **args) -> None:
+        # start / end 为 time.perf_counter() 读数
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": self._us(start),
+            "dur": max(0, int((end - start) * 1e6)),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self.lock:
+            self.spans.append(event)
+            if cat == "stage":
+                self.stages[name] = self.stages.get(name, 0.0) + (end - start) * 1000
+
+    @contextmanager
+    def stage(self, name: str, **args) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.span(name, start, time.perf_counter(), **args)
+
+    def observe(self, source: str, ms: float, ok: bool = True) -> None:
+        with self.lock:
+            self.latency.setdefault(source, LatencyStats()).add(ms, ok)
+
+    def response_hook(self, resp, *args, **kwargs) -> None:
+        # 挂在 requests.Session.hooks["response"] 上；elapsed 是发出请求到读完响应头的时间
+        end = time.perf_counter()
+        ms = resp.elapsed.total_seconds() * 1000
+        source = current_source.get() or urlparse(resp.url).hostname or "other"
+        ok = resp.status_code < 400
+        self.observe(source, ms, ok)
+        self.span(f"GET {urlparse(resp.url).hostname}", end - ms / 1000, end, cat="http", source=source, status=resp.status_code)
+
+    def request_failed(self, url: str, start: float) -> None:
+        # 超时、连接错误等没有响应的请求不会触发 response hook，由调用方补记为失败
+        end = time.perf_counter()
+        host = urlparse(url).hostname
+        source = current_source.get() or host or "other"
+        self.observe(source, (end - start) * 1000, ok=False)
+        self.span(f"GET {host}", start, end, cat="http", source=source, status="error")
+
+    def instrument(self, session) -> None:
+        session.hooks.setdefault("response", []).append(self.response_hook)
+
+    def stage_ms(self) -> dict[str, int]:
+        return {name: int(ms) for name, ms in self.stages.items()}
+
+    def latency_summary(self) -> dict[str, dict]:
+        with self.lock:
+            return {source: stats.summary() for source, stats in self.latency.items()}
+
+    def write_trace(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        events = [{"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": path.stem}}]
+        with self.lock:
+            events.extend(sorted(self.spans, key=lambda e: e["ts"]))
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from classifier import DEFAULT_RULES, FALLBACK_CATEGORY, KeywordClassifier, normalize_keyword  # noqa: E402
+
+SOURCES_EXAMPLE = Path(__file__).resolve().parents[2] / "info-skills" / "daily-news-report" / "sources.json.example"
+
+FILLER = (
+    "the a of for with from how why new show ask google said again paragon going against "
+    "bringing maintain tooling clinic orgasmic models agents released postgres kernel notes week"
+).split()
+
+
+def substring_classify(text: str) -> str:
+    # 旧实现：逐分类 any(k in t)，作为基线
+    t = text.lower()
+    for name, keywords in DEFAULT_RULES:
+        if any(k in t for k in keywords):
+            return name
+    return FALLBACK_CATEGORY
+
+
+def keyword_regex_classifier(rules: list[tuple[str, list[str]]]):
+    # 正确性基线：每个关键词一个带词边界的正则，逐分类按规则顺序检查，第一个命中的分类胜出
+    compiled = [
+        (name, [re.compile(r"(?<![a-z0-9])" + re.escape(normalize_keyword(k)).replace(r"\ ", r"[\s\-]+") + r"s?(?![a-z0-9])") for k in keywords])
+        for name, keywords in rules
+    ]
+
+    def classify(text: str) -> str:
+        t = text.lower()
+        for name, patterns in compiled:
+            if any(p.search(t) for p in patterns):
+                return name
+        return FALLBACK_CATEGORY
+
+    return classify
+
+
+def synthetic_titles(n: int, seed: int = 11) -> list[str]:
+    rng = random.Random(seed)
+    keywords = [k for _, words in DEFAULT_RULES for k in words]
+    titles = []
+    for _ in range(n):
+        words = rng.sample(FILLER, rng.randint(5, 10))
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        titles.append(" ".join(words).capitalize())
+    return titles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the compiled keyword classifier against substring scans")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma separated title counts")
+    args = parser.parse_args()
+
+    # differs 以逐关键词正则为准：substring 的差异来自错误的子串命中，compiled 应与它完全一致（config 用的是另一套规则）
+    classifiers = {
+        "per-kw": keyword_regex_classifier(DEFAULT_RULES),
+        "substring": substring_classify,
+        "compiled": KeywordClassifier(DEFAULT_RULES).classify,
+        "config": KeywordClassifier.from_sources_config(json.loads(SOURCES_EXAMPLE.read_text(encoding="utf-8"))).classify,
+    }
+
+    print(f"{'titles':>8} {'classifier':>10} {'seconds':>9} {'us/title':>9} {'differs':>8}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        titles = synthetic_titles(n)
+        baseline = None
+        for name, classify in classifiers.items():
+            started = time.perf_counter()
+            labels = [classify(t) for t in titles]
+            elapsed = time.perf_counter() - started
+            baseline = baseline or labels
+            differs = sum(1 for a, b in zip(baseline, labels) if a != b)
+            print(f"{n:>8} {name:>10} {elapsed:>9.3f} {elapsed * 1e6 / n:>9.2f} {differs:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "_shared" / "scripts"))
+
+from dedup import deduplicate  # noqa: E402
+
+VOCAB = [f"w{i}" for i in range(5000)]
+
+
+def synthetic_items(n: int, dup_ratio: float, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        if items and rng.random() < dup_ratio:
+            base = rng.choice(items)
+            words = base["title"].split()
+            # 近似重复：改动一个词，或原样换个带追踪参数的 URL
+            if rng.random() < 0.5:
+                words[rng.randrange(len(words))] = rng.choice(VOCAB)
+                url = f"https://example.com/p/{i}"
+            else:
+                url = base["url"] + "/?utm_source=bench"
+            items.append({"title": " ".join(words), "url": url, "weighted": rng.random() * 10})
+            continue
+        title = " ".join(rng.sample(VOCAB, rng.randint(8, 14)))
+        items.append({"title": title, "url": f"https://example.com/p/{i}", "weighted": rng.random() * 10})
+    return items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark URL/fingerprint/MinHash-LSH dedup")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma separated item counts")
+    parser.add_argument("--dup-ratio", type=float, default=0.2, help="share of near-duplicate items")
+    args = parser.parse_args()
+
+    print(f"{'items':>8} {'kept':>8} {'seconds':>9} {'us/item':>9}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        items = synthetic_items(n, args.dup_ratio)
+        started = time.perf_counter()
+        kept = deduplicate(items)
+        elapsed = time.perf_counter() - started
+        print(f"{n:>8} {len(kept):>8} {elapsed:>9.3f} {elapsed * 1e6 / n:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
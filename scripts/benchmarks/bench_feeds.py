@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "_shared" / "scripts"))
+
+from fetch_pool import FetchPool  # noqa: E402
+from source_registry import SourceRegistry  # noqa: E402
+
+
+def feed_handler(items_per_feed: int, latency: float) -> type:
+    now = time.time()
+    counts = {"200": 0, "304": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        stats = counts
+
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            time.sleep(latency)
+            etag = f'"{self.path}"'
+            if self.headers.get("If-None-Match") == etag:
+                counts["304"] += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            counts["200"] += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("ETag", etag)
+            self.end_headers()
+            # 分块写出，模拟大文档；客户端取够条数后会提前断开
+            try:
+                self.wfile.write(b'<?xml version="1.0"?><rss version="2.0"><channel><title>bench</title>')
+                for i in range(items_per_feed):
+                    self.wfile.write(
+                        f"<item><title>{self.path} post {i}</title><link>https://bench.test{self.path}/{i}</link>"
+                        f"<pubDate>{formatdate(now - i * 3600)}</pubDate>"
+                        f"<description>{'lorem ipsum ' * 40}</description></item>".encode()
+                    )
+                self.wfile.write(b"</channel></rss>")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return Handler
+
+
+class FeedServer(ThreadingHTTPServer):
+    # 默认 backlog 只有 5，并发连接会被内核丢弃重试，测出来的是服务端而不是抓取器
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the rss_batch fetcher against a local feed server")
+    parser.add_argument("--feeds", type=int, default=90, help="number of feeds, default 90 (Karpathy Top 90)")
+    parser.add_argument("--items", type=int, default=200, help="items per feed document")
+    parser.add_argument("--latency", type=float, default=0.05, help="server latency per request in seconds")
+    parser.add_argument("--concurrency", type=int, default=10, help="rss_config.concurrency")
+    args = parser.parse_args()
+
+    handler = feed_handler(args.items, args.latency)
+    server = FeedServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    config = {
+        "sources": {
+            "tier1_hn_blogs": {
+                "fetch_method": "rss_batch",
+                "rss_config": {
+                    "concurrency": args.concurrency,
+                    "timeout_ms": 15000,
+                    "time_window_hours": 72,
+                    "max_articles_per_feed": 3,
+                },
+                "feeds": [{"id": f"f{i}", "name": f"feed {i}", "rss_url": f"{base}/f{i}"} for i in range(args.feeds)],
+            }
+        }
+    }
+
+    pool = FetchPool(concurrency=args.concurrency)
+    print(f"{'run':>6} {'items':>6} {'ok':>4} {'200':>5} {'304':>5} {'seconds':>8}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for run in ("cold", "warm"):
+            handler.stats.update({"200": 0, "304": 0})
+            started = time.perf_counter()
+            items, results = SourceRegistry(pool, config, cache_dir=Path(cache_dir)).run()
+            elapsed = time.perf_counter() - started
+            ok = sum(1 for r in results.values() if r.ok)
+            s = handler.stats
+            print(f"{run:>6} {len(items):>6} {ok:>4} {s['200']:>5} {s['304']:>5} {elapsed:>8.2f}")
+
+    # tracemalloc 会明显拖慢解析，峰值内存单独跑一次冷启动来量
+    tracemalloc.start()
+    SourceRegistry(pool, config).run()
+    print(f"peak traced memory (cold): {tracemalloc.get_traced_memory()[1] / 1e6:.1f} MB")
+    tracemalloc.stop()
+    pool.close()
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import itertools
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from keywords import KeywordCounter, extract_keywords  # noqa: E402
+
+CJK_WORDS = ["大模型", "推理", "优化", "数据库", "开源", "智能体", "编译器", "安全漏洞", "发布", "实践"]
+
+
+def synthetic_titles(n: int, vocab: int, seed: int = 3) -> list[str]:
+    # 词频近似 Zipf 分布，约三成标题是中文
+    rng = random.Random(seed)
+    words = [f"term{i}" for i in range(vocab)]
+    cum_weights = list(itertools.accumulate(1.0 / (i + 1) for i in range(vocab)))
+    titles = []
+    for _ in range(n):
+        if rng.random() < 0.3:
+            titles.append("的".join(rng.sample(CJK_WORDS, 3)) + " " + " ".join(rng.choices(words, cum_weights=cum_weights, k=3)))
+        else:
+            titles.append(" ".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(6, 12))))
+    return titles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark keyword extraction and exact vs heavy-hitter counting")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma separated title counts")
+    parser.add_argument("--vocab", type=int, default=50000, help="distinct English terms")
+    parser.add_argument("--capacity", type=int, default=500, help="heavy-hitter counter capacity")
+    parser.add_argument("--top", type=int, default=40, help="top-k compared against exact counts")
+    args = parser.parse_args()
+
+    print(f"{'titles':>8} {'counter':>8} {'seconds':>9} {'us/title':>9} {'entries':>8} {'top-k hit':>10}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        titles = synthetic_titles(n, args.vocab)
+        exact_top = None
+        for name, capacity in (("exact", None), ("bounded", args.capacity)):
+            counter = KeywordCounter(capacity)
+            started = time.perf_counter()
+            for title in titles:
+                counter.update(extract_keywords(title))
+            top = [kw for kw, _ in counter.most_common(args.top)]
+            elapsed = time.perf_counter() - started
+            exact_top = exact_top or set(top)
+            hit = len(exact_top.intersection(top)) / max(1, len(exact_top))
+            print(f"{n:>8} {name:>8} {elapsed:>9.3f} {elapsed * 1e6 / n:>9.2f} {len(counter):>8} {hit:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
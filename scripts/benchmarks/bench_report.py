@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import generate_full_7d_report as report  # noqa: E402
+from fetch_pool import FetchPool  # noqa: E402
+from github_search import GITHUB_API, DEFAULT_MAX_RESULTS, MAX_PER_PAGE, GitHubSearchClient  # noqa: E402
+from hn_scan import DEFAULT_MAX_SCAN, DEFAULT_PATIENCE, HN_LISTS  # noqa: E402
+from hn_search import DEFAULT_MIN_POINTS, HNSearchBackend, session_transport  # noqa: E402
+from http_fixtures import REPLAY, FixtureStore, mount_fixtures  # noqa: E402
+from run_metrics import RunMetrics  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[2]
+TOP90_FILE = ROOT / "info-skills" / "daily-news-report" / "hn-karpathy-top90.json"
+STAGES = ("fetch", "classify", "rank", "render", "write")
+
+WORDS = (
+    "llm agent inference compiler database kernel rust postgres security exploit release framework "
+    "startup career essay gpu training open source memory latency cache scheduler browser protocol"
+).split()
+
+
+def synthetic_stories(n: int, start_ts: int, end_ts: int, seed: int = 7) -> list[dict]:
+    # 时间在窗口内均匀分布、按时间倒序，id 与真实 HN 一样随时间递增；约四成链接指向 Top 90 博客，分数近似长尾分布
+    rng = random.Random(seed)
+    hosts = [urlparse(f["homepage"]).hostname for f in report.read_karpathy_top90(TOP90_FILE)[0] if f.get("homepage")]
+    step = max(1, (end_ts - start_ts) // max(1, n))
+    stories = []
+    for i in range(n):
+        host = rng.choice(hosts) if rng.random() < 0.4 else f"site{rng.randrange(5000)}.example"
+        stories.append(
+            {
+                "id": 40_000_000 + n - i,
+                "type": "story",
+                "title": " ".join(rng.choices(WORDS, k=rng.randint(4, 9))).capitalize(),
+                "url": f"https://{host}/posts/{i}",
+                "time": end_ts - i * step,
+                "score": int(20 + rng.paretovariate(1.2) * 10),
+                "descendants": rng.randrange(400),
+            }
+        )
+    return stories
+
+
+def synthetic_repos(n: int, end_ts: int, seed: int = 13) -> list[dict]:
+    rng = random.Random(seed)
+    repos = []
+    for i in range(n):
+        pushed = datetime.fromtimestamp(end_ts - rng.randrange(6 * 86400), timezone.utc)
+        repos.append(
+            {
+                "full_name": f"bench/repo-{i}",
+                "description": " ".join(rng.choices(WORDS, k=8)),
+                "html_url": f"https://github.com/bench/repo-{i}",
+                "stargazers_count": int(150 + rng.paretovariate(1.1) * 100),
+                "language": rng.choice(["Python", "Rust", "Go", "TypeScript"]),
+                "pushed_at": pushed.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        )
+    return repos
+
+
+def list_order(hn_source: str, stories: list[dict], end_ts: int) -> list[dict]:
+    # 近似 HN 的榜单顺序：topstories 按 (points - 1) / (age_hours + 2)^1.8，beststories 按分数，newstories 按 id 倒序
+    if hn_source == "topstories":
+        return sorted(stories, key=lambda s: (s["score"] - 1) / ((end_ts - s["time"]) / 3600 + 2) ** 1.8, reverse=True)
+    if hn_source == "beststories":
+        return sorted(stories, key=lambda s: s["score"], reverse=True)
+    return sorted(stories, key=lambda s: s["id"], reverse=True)
+
+
+def write_fixtures(fixture_dir: Path, n: int, hn_source: str, start_date: datetime, start_ts: int, end_ts: int) -> None:
+    # 合成夹具的 URL 由真实客户端代码生成：用一个边查询边落盘的 transport 驱动 HNSearchBackend 跑一遍
+    store = FixtureStore(fixture_dir)
+    stories = synthetic_stories(n, start_ts, end_ts)
+    if hn_source in HN_LISTS:
+        store.put_json(f"{report.HN_API}/{hn_source}.json", [s["id"] for s in list_order(hn_source, stories, end_ts)])
+        for s in stories:
+            store.put_json(f"{report.HN_API}/item/{s['id']}.json", s)
+    else:
+        def transport(url: str, params: dict, timeout=None) -> dict:
+            upper = int(params["numericFilters"].split("created_at_i<")[1].split(",")[0])
+            hits = [
+                {
+                    "objectID": str(s["id"]),
+                    "title": s["title"],
+                    "url": s["url"],
+                    "created_at_i": s["time"],
+                    "points": s["score"],
+                    "num_comments": s["descendants"],
+                }
+                for s in stories
+                if start_ts <= s["time"] < upper
+            ][: params["hitsPerPage"]]
+            payload = {"hits": hits}
+            store.put_json(url, payload, params=params)
+            return payload
+
+        for _ in HNSearchBackend(transport, min_points=0).iter_stories(start_ts, end_ts):
+            pass
+
+    per_page = min(MAX_PER_PAGE, DEFAULT_MAX_RESULTS)
+    params = {"q": report.github_query(start_date), "sort": "stars", "order": "desc", "per_page": per_page}
+    store.put_json(f"{GITHUB_API}/search/repositories", {"items": synthetic_repos(per_page, end_ts)}, params=params)
+
+
+def run_once(fixture_dir: Path, out_dir: Path, args, hn_source: str, min_points: int, start_date, end_date) -> tuple[float, dict, int]:
+    metrics = RunMetrics()
+    pool = FetchPool(concurrency=args.concurrency, metrics=metrics)
+    adapter = mount_fixtures(
+        pool.session,
+        fixture_dir,
+        REPLAY,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        seed=1,
+        pool_maxsize=pool.concurrency + pool.hedge_slots,
+    )
+    metrics.instrument(pool.session)
+    search = HNSearchBackend(session_transport(pool), min_points=min_points) if hn_source == "search" else None
+    github = GitHubSearchClient(session=pool.session)
+    started = time.perf_counter()
+    try:
+        result = report.render_report(
+            start_date,
+            end_date,
+            ROOT,
+            TOP90_FILE,
+            out_dir / "report.md",
+            pool=pool,
+            search=search,
+            github=github,
+            keyword_capacity=args.keyword_capacity,
+            metrics=metrics,
+            hn_list=hn_source if hn_source in HN_LISTS else "topstories",
+            hn_max_scan=args.hn_max_scan,
+            hn_patience=args.hn_patience,
+        )
+    finally:
+        pool.close()
+    elapsed = time.perf_counter() - started
+    if adapter.missing:
+        print(f"[warn] {adapter.missing} requests had no fixture", file=sys.stderr)
+    return elapsed, result, adapter.replayed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark generate_full_7d_report offline against replayed HTTP fixtures")
+    parser.add_argument("--sizes", default="120,1000,10000", help="comma separated synthetic HN story counts")
+    parser.add_argument("--fixtures", default=None, help="replay a directory recorded with --record instead of synthetic data")
+    parser.add_argument(
+        "--hn-source", choices=["auto", *HN_LISTS, "search"], default="auto", help="auto: topstories up to --hn-max-scan stories, search above"
+    )
+    parser.add_argument("--hn-max-scan", type=int, default=DEFAULT_MAX_SCAN, help="list scan: at most this many ids")
+    parser.add_argument("--hn-patience", type=int, default=DEFAULT_PATIENCE, help="list scan early-stop patience, 0 disables the heuristic")
+    parser.add_argument("--end-date", default="2026-01-25", help="report end date, must match the recording when --fixtures is used")
+    parser.add_argument("--days", type=int, default=7, help="window size, default 7")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="synthetic latency per replayed response")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="uniform jitter around --latency-ms")
+    parser.add_argument("--concurrency", type=int, default=10, help="max in-flight requests")
+    parser.add_argument("--keyword-capacity", type=int, default=None, help="bounded keyword counting, default exact")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    args = parser.parse_args()
+
+    end_date = datetime.strptime(args.end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    start_date = end_date - timedelta(days=max(1, args.days) - 1)
+    start_ts = int(start_date.timestamp())
+    end_ts = int((end_date + timedelta(days=1)).timestamp()) - 1
+
+    if args.fixtures:
+        runs = [("recorded", Path(args.fixtures), args.hn_source if args.hn_source in HN_LISTS else "search", DEFAULT_MIN_POINTS)]
+    else:
+        runs = []
+        for n in (int(x) for x in args.sizes.split(",")):
+            hn_source = args.hn_source if args.hn_source != "auto" else ("topstories" if n <= args.hn_max_scan else "search")
+            runs.append((n, None, hn_source, 0))
+
+    header = f"{'items':>8} {'hn':>10} {'requests':>8} {'fetched':>8} {'seconds':>8} " + " ".join(f"{s:>8}" for s in STAGES)
+    print(header + f" {'peak MB':>8}")
+    for n, fixture_dir, hn_source, min_points in runs:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            if fixture_dir is None:
+                fixture_dir = tmp / "fixtures"
+                write_fixtures(fixture_dir, n, hn_source, start_date, start_ts, end_ts)
+            elapsed, result, requests_made = run_once(fixture_dir, tmp, args, hn_source, min_points, start_date, end_date)
+            stages = result["stages_ms"]
+            peak = ""
+            if not args.no_memory:
+                # tracemalloc 会拖慢解析和排序，峰值内存单独再跑一次
+                tracemalloc.start()
+                run_once(fixture_dir, tmp, args, hn_source, min_points, start_date, end_date)
+                peak = f"{tracemalloc.get_traced_memory()[1] / 1e6:.1f}"
+                tracemalloc.stop()
+            print(
+                f"{n:>8} {hn_source:>10} {requests_made:>8} {result['items_fetched']:>8} {elapsed:>8.2f} "
+                + " ".join(f"{stages.get(s, 0):>8}" for s in STAGES)
+                + f" {peak:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "utility-skills" / "notion-sync" / "scripts"))
+
+from report_parser import iter_report  # noqa: E402
+
+WORDS = ["agent", "model", "kernel", "database", "release", "compiler", "rust", "gpu", "security", "模型", "推理", "开源"]
+
+
+def synthetic_report(path: Path, articles: int, summary_lines: int, seed: int = 7) -> None:
+    # 按 _shared/format-spec.md 的条目格式生成报告，summary_lines 控制每条摘要折行数（模拟超长正文）
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# 每日资讯（2026-01-26）\n\n> synthetic\n\n---\n\n## 🔥 HackerNews 热帖\n\n")
+        for i in range(1, articles + 1):
+            title = " ".join(rng.choices(WORDS, k=6))
+            f.write(f"### {i}. {title}\n\n")
+            f.write(f"- **摘要**：{' '.join(rng.choices(WORDS, k=30))}\n")
+            for _ in range(summary_lines - 1):
+                f.write(f"  {' '.join(rng.choices(WORDS, k=30))}\n")
+            f.write("- **推荐理由**：值得一读\n- **要点**：\n")
+            for n in range(1, 4):
+                f.write(f"  {n}. {' '.join(rng.choices(WORDS, k=8))}\n")
+            f.write(f"- **来源**：[HackerNews](https://news.ycombinator.com/item?id={i}) | [原文](https://example.com/p/{i})\n")
+            f.write(f"- **关键词**：{' '.join(f'`{w}`' for w in rng.sample(WORDS, 4))}\n")
+            f.write(f"- **评分**：{'⭐' * rng.randint(1, 5)} ({rng.randint(1, 5)}/5)\n")
+            f.write("- **分类**：🤖 AI / ML\n\n")
+        f.write("---\n\n## 📊 数据概览\n\n| 指标 | 数值 |\n|------|:----:|\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the line-oriented notion-sync report parser")
+    parser.add_argument("--sizes", default="1000,10000,50000", help="comma separated article counts")
+    parser.add_argument("--summary-lines", type=int, default=1, help="wrapped lines per summary")
+    args = parser.parse_args()
+
+    print(f"{'articles':>9} {'MB':>8} {'seconds':>9} {'MB/s':>8} {'us/article':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (int(x) for x in args.sizes.split(",")):
+            path = Path(tmp) / f"report-{n}.md"
+            synthetic_report(path, n, args.summary_lines)
+            size_mb = path.stat().st_size / 1e6
+            started = time.perf_counter()
+            count = sum(1 for _ in iter_report(path))
+            elapsed = time.perf_counter() - started
+            assert count == n, (count, n)
+            print(f"{n:>9} {size_mb:>8.1f} {elapsed:>9.3f} {size_mb / elapsed:>8.1f} {elapsed * 1e6 / n:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
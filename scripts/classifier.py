@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+import re
+
+FALLBACK_CATEGORY = "📝 其他"
+
+# sources.json 没有 categories 时使用的内置规则；列表顺序即分类优先级，命中多个分类时取排在最前的
+DEFAULT_RULES = [
+    ("🤖 AI / ML", ["ai", "llm", "gpt", "agent", "model", "rag", "inference", "embedding", "anthropic", "openai", "mcp"]),
+    ("🔒 安全", ["security", "vulnerability", "cve", "exploit", "privacy", "malware", "breach"]),
+    ("⚙️ 工程", ["compiler", "database", "distributed", "kernel", "performance", "rust", "go", "postgres", "architecture"]),
+    ("🛠 工具 / 开源", ["github", "release", "tool", "framework", "library", "sdk", "cli", "open source"]),
+    ("💡 观点 / 杂谈", ["career", "opinion", "startup", "management", "culture", "essay"]),
+]
+
+_SEPARATOR_RE = re.compile(r"[\s\-]+")
+
+
+def normalize_keyword(keyword: str) -> str:
+    return " ".join(_SEPARATOR_RE.split(keyword.strip().lower())).strip()
+
+
+def trie_pattern(keys: list[str]) -> str:
+    # 把关键词按公共前缀合并成嵌套分组，正则引擎每个位置只需沿一条分支往下比，不必逐个尝试全部关键词
+    trie: dict = {}
+    for key in keys:
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [(r"[\s\-]+" if ch == " " else re.escape(ch)) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordClassifier:
+    # 所有分类的关键词编译成一个带词边界的正则，一次扫描得到各分类命中数：
+    # "go" 不再命中 "google"，"ai" 不再命中 "said"；多词关键词允许空格或连字符，结尾允许复数 s
+    def __init__(self, rules: list[tuple[str, list[str]]], fallback: str = FALLBACK_CATEGORY) -> None:
+        self.categories = [name for name, _ in rules]
+        self.fallback = fallback
+        self.lookup: dict[str, list[int]] = {}
+        for idx, (_, keywords) in enumerate(rules):
+            for keyword in keywords:
+                key = normalize_keyword(keyword)
+                if key and idx not in self.lookup.setdefault(key, []):
+                    self.lookup[key].append(idx)
+        # 每个关键词所属分类中优先级最高的一个
+        self.first = {key: indices[0] for key, indices in self.lookup.items()}
+
+        # 可选分支是贪婪的，"open source" 会优先于 "open" 匹配；词边界回溯时再退回短词
+        self.pattern = re.compile(r"(?<![a-z0-9])(" + trie_pattern(list(self.lookup)) + r")s?(?![a-z0-9])") if self.lookup else None
+
+    @classmethod
+    def from_sources_config(cls, config: dict) -> "KeywordClassifier":
+        entries = config.get("categories", {}).get("list", [])
+        rules = [(c["name"], c["keywords"]) for c in entries if c.get("name") and c.get("keywords")]
+        if not rules:
+            return cls(DEFAULT_RULES)
+        fallback = next((c["name"] for c in entries if c.get("name") and not c.get("keywords")), FALLBACK_CATEGORY)
+        return cls(rules, fallback)
+
+    def counts(self, text: str) -> list[int]:
+        counts = [0] * len(self.categories)
+        if self.pattern is not None:
+            for keyword in self.pattern.findall(text.lower()):
+                for idx in self.lookup.get(keyword) or self.lookup[_SEPARATOR_RE.sub(" ", keyword)]:
+                    counts[idx] += 1
+        return counts
+
+    def hits(self, text: str) -> dict[str, int]:
+        # 各分类的关键词命中次数，只包含命中过的分类
+        return {self.categories[idx]: c for idx, c in enumerate(self.counts(text)) if c}
+
+    def classify(self, text: str) -> str:
+        # 与逐分类扫描的旧实现一致：命中的分类里规则顺序最靠前的胜出；命中第一个分类即可提前结束
+        if self.pattern is None:
+            return self.fallback
+        best = len(self.categories)
+        for match in self.pattern.finditer(text.lower()):
+            keyword = match.group(1)
+            idx = self.first.get(keyword)
+            if idx is None:
+                idx = self.first[_SEPARATOR_RE.sub(" ", keyword)]
+            if idx < best:
+                best = idx
+                if best == 0:
+                    break
+        return self.categories[best] if best < len(self.categories) else self.fallback
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+from hn_item_store import DEFAULT_FREEZE_HOURS
+
+# 一天结束后再过多少小时才把当天的分片视为定稿。HN 分数在发帖后约 48h 内仍会变化，
+# 分片又是按 min_points 过滤后的结果，定稿过早会永久漏掉之后才过线的帖子，因此与条目缓存的冻结时间一致
+DEFAULT_SETTLE_HOURS = DEFAULT_FREEZE_HOURS
+
+
+def day_bounds(day: date) -> tuple[int, int]:
+    start = int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+    return start, start + 86400 - 1
+
+
+def iter_days(start_ts: int, end_ts: int, now: Optional[int] = None) -> Iterator[date]:
+    # 窗口覆盖到的每个 UTC 自然日，尚未开始的日期跳过
+    now = int(now or time.time())
+    day = datetime.fromtimestamp(start_ts, timezone.utc).date()
+    last = datetime.fromtimestamp(min(end_ts, now), timezone.utc).date()
+    while day <= last:
+        yield day
+        day += timedelta(days=1)
+
+
+class DayPartials:
+    # 每个 UTC 日一份 JSON 分片：hn-YYYY-MM-DD.json，保存当天抓到的全部候选条目（评分、筛选前）
+    def __init__(self, directory: Path, settle_hours: float = DEFAULT_SETTLE_HOURS) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.settle_seconds = int(settle_hours * 3600)
+
+    def path(self, day: date) -> Path:
+        return self.directory / f"hn-{day.isoformat()}.json"
+
+    def load(self, day: date, params: dict) -> Optional[list[dict]]:
+        # 缺失、未定稿或抓取参数不同的分片都返回 None，由调用方重新抓取
+        try:
+            data = json.loads(self.path(day).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if data.get("params") != params:
+            return None
+        if data.get("fetched_at", 0) < day_bounds(day)[1] + self.settle_seconds:
+            return None
+        return data.get("items", [])
+
+    def save(self, day: date, items: list[dict], params: dict, now: Optional[int] = None) -> None:
+        path = self.path(day)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        payload = {"day": day.isoformat(), "fetched_at": int(now or time.time()), "params": params, "items": items}
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def drop_before(self, day: date) -> int:
+        dropped = 0
+        for path in self.directory.glob("hn-*.json"):
+            try:
+                file_day = date.fromisoformat(path.stem[3:])
+            except ValueError:
+                continue
+            if file_day < day:
+                path.unlink(missing_ok=True)
+                dropped += 1
+        return dropped
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+import re
+import zlib
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from dedup_index import content_fingerprint, normalize_url
+
+# 去重规范见 _shared/dedup-scoring.md 第一节
+TITLE_SIMILARITY_THRESHOLD = 0.8
+TITLE_STOPWORDS = frozenset({"the", "a", "an", "is", "are", "of", "to", "in", "for"})
+
+# 64 个哈希切成 16 段 × 4 行：Jaccard 0.8 的标题落入同一桶的概率 > 99.9%
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[\u3400-\u9fff]")
+
+_rng = np.random.default_rng(0x5EED)
+_PERM_A = _rng.integers(1, 2**63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64)
+
+
+def title_tokens(title: str) -> frozenset:
+    return frozenset(t for t in _TOKEN_RE.findall((title or "").lower()) if t not in TITLE_STOPWORDS)
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(tokens: Iterable[str]) -> np.ndarray:
+    hashes = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64)
+    if hashes.size == 0:
+        return np.zeros(NUM_PERM, dtype=np.uint64)
+    # multiply-shift 哈希族，uint64 乘法溢出即取模 2^64
+    with np.errstate(over="ignore"):
+        mixed = (hashes[:, None] * _PERM_A[None, :] + _PERM_B[None, :]) >> np.uint64(32)
+    return mixed.min(axis=0)
+
+
+def minhash_batch(token_sets: list[frozenset], chunk: int = 2048) -> np.ndarray:
+    # 分块展开全部 token 哈希，用 reduceat 一次求出每个集合的签名，避免逐条调用 numpy
+    signatures = np.zeros((len(token_sets), NUM_PERM), dtype=np.uint64)
+    for start in range(0, len(token_sets), chunk):
+        block = token_sets[start : start + chunk]
+        sizes = np.fromiter((len(t) for t in block), dtype=np.int64, count=len(block))
+        nonempty = np.flatnonzero(sizes)
+        if nonempty.size == 0:
+            continue
+        hashes = np.fromiter(
+            (zlib.crc32(t.encode("utf-8")) for tokens in block for t in tokens),
+            dtype=np.uint64,
+            count=int(sizes.sum()),
+        )
+        with np.errstate(over="ignore"):
+            mixed = (hashes[:, None] * _PERM_A[None, :] + _PERM_B[None, :]) >> np.uint64(32)
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))[nonempty]
+        signatures[start + nonempty] = np.minimum.reduceat(mixed, offsets, axis=0)
+    return signatures
+
+
+def lsh_keys(signature: np.ndarray) -> list[tuple[int, bytes]]:
+    raw = signature.tobytes()
+    step = LSH_ROWS * signature.itemsize
+    return [(band, raw[band * step : (band + 1) * step]) for band in range(LSH_BANDS)]
+
+
+class NearDuplicateIndex:
+    def __init__(self, threshold: float = TITLE_SIMILARITY_THRESHOLD) -> None:
+        self.threshold = threshold
+        self.buckets: dict[tuple[int, bytes], list[int]] = {}
+        self.token_sets: list[frozenset] = []
+
+    def find(self, tokens: frozenset, keys: list[tuple[int, bytes]]) -> Optional[int]:
+        checked = set()
+        for key in keys:
+            for idx in self.buckets.get(key, ()):
+                if idx in checked:
+                    continue
+                checked.add(idx)
+                if jaccard(tokens, self.token_sets[idx]) > self.threshold:
+                    return idx
+        return None
+
+    def add(self, tokens: frozenset, keys: list[tuple[int, bytes]]) -> int:
+        idx = len(self.token_sets)
+        self.token_sets.append(tokens)
+        for key in keys:
+            self.buckets.setdefault(key, []).append(idx)
+        return idx
+
+
+def deduplicate(
+    items: list[dict],
+    score_key: Callable[[dict], float] = lambda x: x.get("weighted", x.get("score_norm", 0)),
+    threshold: float = TITLE_SIMILARITY_THRESHOLD,
+) -> list[dict]:
+    # 按评分从高到低依次接纳，重复项保留评分更高的那条；返回值保持输入顺序
+    order = sorted(range(len(items)), key=lambda i: score_key(items[i]), reverse=True)
+    token_sets = [title_tokens(x.get("title", "")) for x in items]
+    signatures = minhash_batch(token_sets)
+    seen_urls: set[str] = set()
+    seen_hashes: set[str] = set()
+    near = NearDuplicateIndex(threshold)
+    kept = []
+
+    for i in order:
+        item = items[i]
+        url_key = normalize_url(item.get("url", ""))
+        if url_key and url_key in seen_urls:
+            continue
+
+        fingerprint = content_fingerprint(item.get("title", ""), item.get("summary", ""))
+        if fingerprint and fingerprint in seen_hashes:
+            continue
+
+        tokens = token_sets[i]
+        keys = lsh_keys(signatures[i]) if tokens else []
+        if keys and near.find(tokens, keys) is not None:
+            continue
+
+        if url_key:
+            seen_urls.add(url_key)
+        if fingerprint:
+            seen_hashes.add(fingerprint)
+        if keys:
+            near.add(tokens, keys)
+        kept.append(i)
+
+    kept.sort()
+    return [items[i] for i in kept]
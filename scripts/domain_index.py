@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+
+def normalize_host(host: str) -> str:
+    host = (host or "").strip().lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+class DomainIndex:
+    # 以域名为键的哈希表；匹配时依次查找 host 的各级父域名，耗时 O(labels)，与源数量无关
+    def __init__(self) -> None:
+        self._ranks: dict[str, int] = {}
+
+    @classmethod
+    def from_feeds(cls, feeds: Iterable[dict]) -> "DomainIndex":
+        index = cls()
+        for pos, f in enumerate(feeds, 1):
+            if f.get("enabled") is False:
+                continue
+            host = urlparse(f.get("homepage", "")).hostname or ""
+            index.add(host, int(f.get("rank") or pos))
+        return index
+
+    def add(self, host: str, rank: int) -> None:
+        host = normalize_host(host)
+        if not host:
+            return
+        # 同一域名下有多个源时保留排名最靠前的
+        if host not in self._ranks or rank < self._ranks[host]:
+            self._ranks[host] = rank
+
+    def match(self, host: str) -> Optional[int]:
+        host = normalize_host(host)
+        if not host:
+            return None
+        labels = host.split(".")
+        for i in range(len(labels) - 1):
+            rank = self._ranks.get(".".join(labels[i:]))
+            if rank is not None:
+                return rank
+        return None
+
+    def __contains__(self, host: str) -> bool:
+        return self.match(host) is not None
+
+    def __len__(self) -> int:
+        return len(self._ranks)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import html
+import io
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+from urllib.parse import urljoin
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+FEED_TYPES = ("application/rss+xml", "application/atom+xml", "application/feed+xml")
+
+_LINK_TAG_RE = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""([a-zA-Z-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def discover_feed_url(page: str, base_url: str) -> Optional[str]:
+    # 从首页 <link rel="alternate" type="application/rss+xml"> 找订阅地址
+    for tag in _LINK_TAG_RE.findall(page):
+        attrs = {m.group(1).lower(): m.group(2) or m.group(3) or m.group(4) or "" for m in _ATTR_RE.finditer(tag)}
+        if "alternate" in attrs.get("rel", "").lower().split() and attrs.get("type", "").lower() in FEED_TYPES:
+            if attrs.get("href"):
+                return urljoin(base_url, html.unescape(attrs["href"]))
+    return None
+
+
+def parse_time(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return int(parsedate_to_datetime(value).timestamp())
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
+
+def plain_text(value: Optional[str], limit: int = 300) -> str:
+    text = _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", value or ""))).strip()
+    return text[:limit]
+
+
+def _text(elem: Optional[ET.Element], *paths: str) -> Optional[str]:
+    if elem is None:
+        return None
+    for path in paths:
+        found = elem.find(path)
+        if found is not None and (found.text or "").strip():
+            return found.text
+    return None
+
+
+def _atom_entry(entry: ET.Element) -> dict:
+    url = ""
+    for link in entry.findall(f"{ATOM_NS}link"):
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            url = link.get("href")
+            break
+    return {
+        "title": plain_text(_text(entry, f"{ATOM_NS}title"), 200),
+        "url": url,
+        "time": parse_time(_text(entry, f"{ATOM_NS}published", f"{ATOM_NS}updated")),
+        "summary": plain_text(_text(entry, f"{ATOM_NS}summary", f"{ATOM_NS}content")),
+    }
+
+
+def _rss_item(item: ET.Element) -> dict:
+    return {
+        "title": plain_text(_text(item, "title"), 200),
+        "url": (_text(item, "link") or "").strip(),
+        "time": parse_time(_text(item, "pubDate", "{http://purl.org/dc/elements/1.1/}date")),
+        "summary": plain_text(_text(item, "description")),
+    }
+
+
+def iter_feed(stream: BinaryIO) -> Iterator[dict]:
+    # 同时支持 RSS 2.0 和 Atom，边读边解析，逐条产出 {title, url, time, summary}，保持订阅源原有顺序；
+    # 每条处理完即从父节点摘除，内存占用只和单条大小有关，与整个文档大小无关
+    stack: list[ET.Element] = []
+    entry_tag = None
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            if entry_tag is None:
+                entry_tag = f"{ATOM_NS}entry" if elem.tag == f"{ATOM_NS}feed" else "item"
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag != entry_tag:
+            continue
+        entry = _atom_entry(elem) if entry_tag != "item" else _rss_item(elem)
+        if stack:
+            stack[-1].remove(elem)
+        if entry["title"] and entry["url"]:
+            yield entry
+
+
+def parse_feed(content: bytes) -> list[dict]:
+    return list(iter_feed(io.BytesIO(content)))
+
+
+class FeedCache:
+    # 按订阅地址保存 ETag / Last-Modified 和上次解析出的条目；服务端返回 304 时直接复用，不再下载和解析
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[dict]:
+        try:
+            return json.loads(self.path(url).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], entries: list[dict]) -> None:
+        path = self.path(url)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        entry = {"url": url, "etag": etag, "last_modified": last_modified, "entries": entries}
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, path)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from run_metrics import in_source
+
+DEFAULT_SOURCE_TIMEOUT = 120.0
+
+# 超时后仍在运行的源线程。线程无法强制结束，它们可能还在用共享的 session 和本地缓存，
+# 调用方应在 wait_stragglers() 返回 True 之后再关闭这些资源
+_stragglers: list[threading.Thread] = []
+
+
+def utc_timestamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class SourceFetch:
+    def __init__(self, name: str, fetch: Callable[[], Any], timeout: Optional[float] = DEFAULT_SOURCE_TIMEOUT) -> None:
+        self.name = name
+        self.fetch = fetch
+        self.timeout = timeout
+
+
+class SourceResult:
+    def __init__(
+        self, name: str, value: Any = None, error: Optional[str] = None, duration_ms: int = 0, skipped: bool = False
+    ) -> None:
+        self.name = name
+        self.value = value
+        self.error = error
+        self.duration_ms = duration_ms
+        # skipped: 该源在当前环境下无法抓取（例如需要浏览器），既不算成功也不算失败
+        self.skipped = skipped
+        self.finished_at = utc_timestamp()
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+
+def wait_stragglers(timeout: float = 0.0) -> bool:
+    # 最多等 timeout 秒；之前超时的源线程都已结束时返回 True
+    deadline = time.monotonic() + timeout
+    for thread in list(_stragglers):
+        thread.join(max(0.0, deadline - time.monotonic()))
+    _stragglers[:] = [t for t in _stragglers if t.is_alive()]
+    return not _stragglers
+
+
+def start_source(task: SourceFetch) -> tuple[Future, threading.Thread]:
+    # 每个源一个守护线程：超时的源不会在解释器退出时被 join，--source-timeout 真正限制总耗时
+    fut: Future = Future()
+    run = in_source(task.name, task.fetch)
+
+    def worker() -> None:
+        if not fut.set_running_or_notify_cancel():
+            return
+        try:
+            fut.set_result(run())
+        except BaseException as e:
+            fut.set_exception(e)
+
+    thread = threading.Thread(target=worker, name=f"source-{task.name}", daemon=True)
+    thread.start()
+    return fut, thread
+
+
+def run_sources(tasks: list[SourceFetch]) -> dict[str, SourceResult]:
+    # 所有源同时开始，各自计时；超时或抛异常只记为该源失败，不影响其他源，总耗时取决于最慢的源
+    started = time.monotonic()
+    results: dict[str, SourceResult] = {}
+    futures: dict[Future, SourceFetch] = {}
+    threads: dict[Future, threading.Thread] = {}
+    for t in tasks:
+        fut, thread = start_source(t)
+        futures[fut] = t
+        threads[fut] = thread
+
+    def elapsed_ms() -> int:
+        return int((time.monotonic() - started) * 1000)
+
+    pending = set(futures)
+    while pending:
+        deadlines = [futures[f].timeout for f in pending if futures[f].timeout is not None]
+        remaining = max(0.0, min(deadlines) - (time.monotonic() - started)) if deadlines else None
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for fut in done:
+            task = futures[fut]
+            try:
+                results[task.name] = SourceResult(task.name, value=fut.result(), duration_ms=elapsed_ms())
+            except Exception as e:
+                results[task.name] = SourceResult(task.name, error=f"{type(e).__name__}: {e}", duration_ms=elapsed_ms())
+        for fut in list(pending):
+            task = futures[fut]
+            if task.timeout is not None and time.monotonic() - started >= task.timeout:
+                # 不再等待它的结果，线程交给 wait_stragglers 跟踪
+                pending.discard(fut)
+                _stragglers.append(threads[fut])
+                results[task.name] = SourceResult(task.name, error=f"timed out after {task.timeout:g}s", duration_ms=elapsed_ms())
+
+    return {t.name: results[t.name] for t in tasks}
+
+
+def run_summary(results: dict[str, SourceResult]) -> dict:
+    # 对应 _shared/cache-schema.json 中 last_run 的 sources_success / sources_failed / errors
+    return {
+        "sources_success": [name for name, r in results.items() if r.ok],
+        "sources_failed": [name for name, r in results.items() if not r.ok and not r.skipped],
+        "errors": [
+            {"source": name, "error": r.error, "timestamp": r.finished_at}
+            for name, r in results.items()
+            if not r.ok and not r.skipped
+        ],
+    }
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+import contextvars
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 与 sources.json 中 rss_config.concurrency 保持一致
+DEFAULT_CONCURRENCY = 10
+DEFAULT_TIMEOUT = 4.0
+# 对冲请求最多占全部请求的比例，以及额外占用的连接 / 线程数（相对 concurrency）
+HEDGE_BUDGET = 0.1
+HEDGE_SLOTS_RATIO = 0.5
+
+
+class FetchPool:
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+        deadline: Optional[float] = None,
+        session: Optional[requests.Session] = None,
+        metrics=None,
+    ) -> None:
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.deadline = deadline
+        self.hedge_slots = max(1, int(self.concurrency * HEDGE_SLOTS_RATIO))
+        # RunMetrics：响应由 session hook 记录，这里补记没有拿到响应的失败（超时、连接错误）
+        self.metrics = metrics
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency + self.hedge_slots)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get_json(self, url: str, timeout: Optional[float] = None):
+        started = time.perf_counter()
+        try:
+            resp = self.session.get(url, timeout=timeout or self.timeout)
+        except requests.RequestException:
+            if self.metrics:
+                self.metrics.request_failed(url, started)
+            raise
+        resp.raise_for_status()
+        return resp.json()
+
+    def map_json(
+        self, urls: Iterable[str], timeout: Optional[float] = None, hedge_after: Optional[float] = None
+    ) -> Iterator[tuple[int, str, object]]:
+        # 按完成顺序产出 (index, url, payload)；失败的请求 payload 为 None。
+        # 超过 deadline 后不再提交新请求，也不再等待未完成的请求。
+        # hedge_after：请求超过这么多秒仍未返回时再发一份相同的请求，先成功的为准，数量受 HEDGE_BUDGET 限制
+        started = time.monotonic()
+        pending_urls = iter(enumerate(urls))
+        in_flight = {}
+        attempts: dict[int, list] = {}
+        submitted_at: dict[int, float] = {}
+        submitted = hedges = 0
+
+        executor = ThreadPoolExecutor(max_workers=self.concurrency + (self.hedge_slots if hedge_after else 0))
+
+        def submit(idx: int, url: str) -> None:
+            # 带上调用方的 contextvars（例如当前所属的源），工作线程里的请求才能归到正确的源
+            fut = executor.submit(contextvars.copy_context().run, self.get_json, url, timeout)
+            in_flight[fut] = (idx, url)
+            attempts.setdefault(idx, []).append(fut)
+
+        def submit_next() -> bool:
+            nonlocal submitted
+            try:
+                idx, url = next(pending_urls)
+            except StopIteration:
+                return False
+            submit(idx, url)
+            submitted_at[idx] = time.monotonic()
+            submitted += 1
+            return True
+
+        def hedge_room() -> int:
+            # 还能发出的对冲请求数：同时受 HEDGE_BUDGET 和空闲的对冲槽位限制
+            if not hedge_after:
+                return 0
+            budget = math.ceil(submitted * HEDGE_BUDGET) - hedges
+            return min(budget, self.concurrency + self.hedge_slots - len(in_flight))
+
+        def hedge_candidates() -> list[tuple[int, str]]:
+            room = hedge_room()
+            if room <= 0:
+                return []
+            now = time.monotonic()
+            slow = sorted(
+                {(idx, url) for idx, url in in_flight.values() if len(attempts[idx]) == 1 and now - submitted_at[idx] >= hedge_after}
+            )
+            return slow[:room]
+
+        def next_hedge_in() -> Optional[float]:
+            # 槽位占满时不按对冲时间醒来，等有请求完成再说，否则会以 0 超时反复空转
+            if hedge_room() <= 0:
+                return None
+            waiting = [submitted_at[idx] + hedge_after for idx, _ in in_flight.values() if len(attempts[idx]) == 1]
+            return max(0.0, min(waiting) - time.monotonic()) if waiting else None
+
+        try:
+            for _ in range(self.concurrency):
+                if not submit_next():
+                    break
+
+            while in_flight:
+                remaining = None
+                if self.deadline is not None:
+                    remaining = self.deadline - (time.monotonic() - started)
+                    if remaining <= 0:
+                        break
+                hedge_in = next_hedge_in()
+                if hedge_in is not None:
+                    remaining = hedge_in if remaining is None else min(remaining, hedge_in)
+                done, _ = wait(in_flight, timeout=remaining, return_when=FIRST_COMPLETED)
+                for idx, url in hedge_candidates():
+                    submit(idx, url)
+                    hedges += 1
+                if not done:
+                    if hedge_in is not None:
+                        continue
+                    break
+                for fut in done:
+                    if fut not in in_flight:
+                        continue
+                    idx, url = in_flight.pop(fut)
+                    try:
+                        payload = fut.result()
+                    except Exception:
+                        payload = None
+                    others = [f for f in attempts[idx] if f is not fut and f in in_flight]
+                    if payload is None and others:
+                        # 对冲中的另一份请求还没结束，等它的结果
+                        continue
+                    for other in others:
+                        # 另一份请求的结果不再需要；已在运行的线程无法取消，只是不再等待
+                        in_flight.pop(other)
+                        other.cancel()
+                    yield idx, url, payload
+                    submit_next()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        self.session.close()
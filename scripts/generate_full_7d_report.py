@@ -1,18 +1,55 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from __future__ import annotations
+
 import argparse
 import json
 import math
-import re
 import subprocess
+import sys
+import tempfile
+import time
 from collections import Counter
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Iterable, Iterator
 from urllib.parse import quote_plus, urlparse
 
 import requests
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "_shared" / "scripts"))
+
+from classifier import DEFAULT_RULES, KeywordClassifier
+from config_loader import read_json
+from day_partials import DEFAULT_SETTLE_HOURS, DayPartials, day_bounds, iter_days
+from dedup import deduplicate
+from dedup_index import DedupIndex
+from domain_index import DomainIndex
+from fetch_orchestrator import DEFAULT_SOURCE_TIMEOUT, SourceFetch, SourceResult, run_sources, run_summary, utc_timestamp, wait_stragglers
+from fetch_pool import DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT, FetchPool
+from github_search import DEFAULT_MAX_RESULTS, GITHUB_API, GITHUB_TIMEOUT, MAX_PER_PAGE, GitHubAPIError, GitHubSearchClient
+from hn_item_store import DEFAULT_TTL_DAYS, HNItemStore, to_hn_item
+from hn_scan import DEFAULT_MAX_SCAN, DEFAULT_PATIENCE, DEFAULT_TARGET, HN_LISTS, ScanRanker
+from hn_search import ALGOLIA_API, DEFAULT_MIN_POINTS, HNSearchBackend, session_transport
+from http_fixtures import RECORD, REPLAY, mount_fixtures
+from keywords import KeywordCounter, extract_keywords
+from report_sidecar import write_sidecar
+from report_writer import write_report
+from run_cache import load_cache, update_last_run
+from run_metrics import RunMetrics
+from scoring import ScoringWeights, score_batch
+from source_health import CircuitOpen, SourceHealth
+from source_registry import SourceRegistry
+from topk import TopK
+
+HN_API = "https://hacker-news.firebaseio.com/v0"
+HN_LIST_LABELS = {"topstories": "Top Stories", "beststories": "Best Stories", "newstories": "New Stories"}
+GITHUB_LIMIT = 10
+SOURCE_LIMIT = 15
+# 榜单扫描多定下这么多名，给跨源去重去掉的 HN 条目留出补位；不够时再完整扫描一次
+HN_DEDUP_MARGIN = 5
+
 CATEGORY_ORDER = [
     "🤖 AI / ML",
     "⚙️ 工程",
@@ -32,60 +69,180 @@ CATEGORY_COLOR = {
 }
 
 
-def classify(text: str) -> str:
-    t = text.lower()
-    if any(k in t for k in ["ai", "llm", "gpt", "agent", "model", "rag", "inference", "embedding", "anthropic", "openai", "mcp"]):
-        return "🤖 AI / ML"
-    if any(k in t for k in ["security", "vulnerability", "cve", "exploit", "privacy", "malware", "breach"]):
-        return "🔒 安全"
-    if any(k in t for k in ["compiler", "database", "distributed", "kernel", "performance", "rust", "go", "postgres", "architecture"]):
-        return "⚙️ 工程"
-    if any(k in t for k in ["github", "release", "tool", "framework", "library", "sdk", "cli", "open source"]):
-        return "🛠 工具 / 开源"
-    if any(k in t for k in ["career", "opinion", "startup", "management", "culture", "essay"]):
-        return "💡 观点 / 杂谈"
-    return "📝 其他"
+DEFAULT_CLASSIFIER = KeywordClassifier(DEFAULT_RULES)
+
+
+def classify(text: str, classifier: KeywordClassifier | None = None) -> str:
+    return (classifier or DEFAULT_CLASSIFIER).classify(text)
+
+
+def classify_items(items: Iterable[dict], text_of, classifier: KeywordClassifier | None = None) -> None:
+    # 抓取结果统一分类一次，排序阶段直接读 category
+    for x in items:
+        x["category"] = classify(text_of(x), classifier)
 
 
 def star_rating(score: float) -> int:
-    return max(1, min(5, int(round(score))))
+    return max(1, min(5, int(math.floor(score + 0.5))))
+
+
+def score_detail(item: dict) -> str:
+    return f"相关性 {item['relevance']} | 质量 {item['quality']} | 时效 {item['timeliness']}"
 
 
-def read_karpathy_top90(path: Path) -> tuple[list[dict], set[str]]:
+def read_karpathy_top90(path: Path) -> tuple[list[dict], DomainIndex]:
     data = json.loads(path.read_text(encoding="utf-8"))
     feeds = data.get("feeds", [])
-    domains = set()
-    for f in feeds:
-        homepage = f.get("homepage", "")
-        host = (urlparse(homepage).hostname or "").lower()
-        if host.startswith("www."):
-            host = host[4:]
-        if host:
-            domains.add(host)
-    return feeds, domains
-
-
-def host_match(host: str, allowed: set[str]) -> bool:
-    if not host:
-        return False
-    host = host.lower()
-    if host.startswith("www."):
-        host = host[4:]
-    if host in allowed:
-        return True
-    return any(host.endswith("." + d) for d in allowed)
-
-
-def fetch_hn_items(start_ts: int, end_ts: int, allowed_domains: set[str], max_scan: int = 120) -> tuple[list[dict], int]:
-    ids = requests.get("https://hacker-news.firebaseio.com/v0/topstories.json", timeout=10).json()[:max_scan]
-    matched_items = []
-    fallback_items = []
-
-    for sid in ids:
+    return feeds, DomainIndex.from_feeds(feeds)
+
+
+def host_match(host: str, allowed: DomainIndex) -> bool:
+    return allowed.match(host) is not None
+
+
+def load_sources_config(plugin_root: Path, example: bool = True) -> dict:
+    skill_dir = plugin_root / "info-skills" / "daily-news-report"
+    candidates = [skill_dir / "sources.json"]
+    if example:
+        candidates.append(skill_dir / "sources.json.example")
+    for candidate in candidates:
         try:
-            item = requests.get(f"https://hacker-news.firebaseio.com/v0/item/{sid}.json", timeout=4).json()
-        except Exception:
+            config = read_json(candidate)
+        except json.JSONDecodeError:
             continue
+        if config is not None:
+            return config
+    return {}
+
+
+def load_classifier(plugin_root: Path) -> KeywordClassifier:
+    # 分类规则只取用户自己的 sources.json；.example 里的关键词是给 skill 人工归类参考的，与内置规则不同，
+    # 没有 sources.json 时用它兜底会悄悄改变归类结果
+    config = load_sources_config(plugin_root, example=False)
+    return KeywordClassifier.from_sources_config(config) if config else DEFAULT_CLASSIFIER
+
+
+def rss_config(sources_config: dict) -> dict:
+    return sources_config.get("sources", {}).get("tier1_hn_blogs", {}).get("rss_config", {})
+
+
+def url_cache_ttl_days(cache: dict) -> int:
+    try:
+        return int(cache.get("url_cache", {}).get("ttl_days", DEFAULT_TTL_DAYS))
+    except (TypeError, ValueError):
+        return DEFAULT_TTL_DAYS
+
+
+def iter_list_items(
+    pool: FetchPool,
+    store: HNItemStore | None,
+    max_scan: int,
+    timeout: float | None = None,
+    hedge_after: float | None = None,
+    list_name: str = "topstories",
+    ranker: ScanRanker | None = None,
+) -> Iterator[dict]:
+    ids = pool.get_json(f"{HN_API}/{list_name}.json", timeout=10)[:max_scan]
+
+    fetched: dict[int, dict] = {}
+    cached = store.get_many(ids) if store else {}
+    to_fetch = []
+    for idx, sid in enumerate(ids):
+        row = cached.get(sid)
+        if row is not None and not store.needs_refresh(row):
+            fetched[idx] = to_hn_item(row)
+            if ranker:
+                ranker.add(fetched[idx])
+        else:
+            to_fetch.append((idx, sid))
+
+    # 按榜单顺序惰性提交：每次补请求前先问 ranker，已确定在窗口外的 id 跳过，剩余 id 不可能进入前列时不再提交
+    queued = []
+    stopped = 0
+
+    def urls() -> Iterator[str]:
+        nonlocal stopped
+        for n, (idx, sid) in enumerate(to_fetch):
+            if ranker:
+                if ranker.out_of_window(sid):
+                    continue
+                if ranker.can_stop(s for _, s in to_fetch[n:]):
+                    stopped = len(to_fetch) - n
+                    return
+            queued.append((idx, sid))
+            yield f"{HN_API}/item/{sid}.json"
+
+    fresh = []
+    for pos, _, payload in pool.map_json(urls(), timeout=timeout, hedge_after=hedge_after):
+        idx, sid = queued[pos]
+        if payload:
+            fetched[idx] = payload
+            fresh.append(payload)
+        elif sid in cached:
+            fetched[idx] = to_hn_item(cached[sid])
+        if ranker:
+            ranker.add(fetched.get(idx))
+    if store and fresh:
+        store.put_many(fresh)
+    # 失败或超过 deadline 且没有缓存可用的条目只能丢弃，至少让它可见
+    missing = sum(1 for idx, _ in queued if idx not in fetched)
+    if missing:
+        print(f"[warn] {missing} of {len(ids)} HN items could not be fetched", file=sys.stderr)
+    skipped = len(to_fetch) - len(queued)
+    if skipped:
+        settled = f" ({stopped} after the top {ranker.top.k} settled)" if stopped else ""
+        print(f"[info] HN {list_name}: skipped {skipped} of {len(ids)} items{settled}", file=sys.stderr)
+
+    for idx in sorted(fetched):
+        yield fetched[idx]
+
+
+def iter_search_items(search: HNSearchBackend, start_ts: int, end_ts: int, store: HNItemStore | None) -> Iterator[dict]:
+    batch = []
+    for item in search.iter_stories(start_ts, end_ts):
+        batch.append(item)
+        if store and len(batch) >= 500:
+            store.put_many(batch)
+            batch = []
+        yield item
+    if store and batch:
+        store.put_many(batch)
+
+
+def iter_partial_items(
+    search: HNSearchBackend, partials: DayPartials, start_ts: int, end_ts: int, store: HNItemStore | None
+) -> Iterator[dict]:
+    # 已定稿的日分片直接复用，只有新的一天（及未定稿的日子）走网络；按日期倒序产出，与整窗口搜索的顺序一致
+    params = {"source": "search", "base_url": search.base_url, "min_points": search.min_points}
+    for day in reversed(list(iter_days(start_ts, end_ts))):
+        items = partials.load(day, params)
+        if items is None:
+            day_start, day_end = day_bounds(day)
+            items = list(iter_search_items(search, day_start, day_end, store))
+            partials.save(day, items, params)
+        yield from items
+
+
+def rank_key(x: dict) -> tuple:
+    heat = x.get("score", x.get("stars", 0))
+    return (x["final_star"], x["weighted"], heat, x.get("comments", 0), x.get("time", 0))
+
+
+def hn_key(x: dict) -> tuple:
+    # Top 90 博客源的条目整体排在前面，其余条目只用来补足名额
+    return (x["in_top90"], *rank_key(x))
+
+
+def hn_records(
+    items: Iterable[dict],
+    start_ts: int,
+    end_ts: int,
+    allowed_domains: DomainIndex,
+    classifier: KeywordClassifier | None = None,
+) -> list[dict]:
+    records = []
+
+    for item in items:
         if not item or item.get("type") != "story":
             continue
 
@@ -100,40 +257,85 @@ def fetch_hn_items(start_ts: int, end_ts: int, allowed_domains: set[str], max_sc
 
         score = int(item.get("score", 0))
         comments = int(item.get("descendants", 0))
-        score_norm = min(5.0, max(1.0, 1.8 + score / 260.0 + comments / 900.0))
-
-        record = {
-            "source": "HackerNews",
-            "title": title,
-            "url": url,
-            "hn_url": f"https://news.ycombinator.com/item?id={item.get('id')}",
-            "score": score,
-            "comments": comments,
-            "host": host,
-            "time": ts,
-            "score_norm": score_norm,
-            "category": classify(title),
-            "in_top90": host_match(host, allowed_domains),
-        }
-
-        if record["in_top90"]:
-            matched_items.append(record)
-        else:
-            fallback_items.append(record)
-
-    matched_items.sort(key=lambda x: (x["score_norm"], x["score"], x["comments"]), reverse=True)
-    fallback_items.sort(key=lambda x: (x["score_norm"], x["score"], x["comments"]), reverse=True)
+        top90_rank = allowed_domains.match(host)
 
-    chosen = matched_items[:15]
-    if len(chosen) < 15:
-        chosen.extend(fallback_items[: 15 - len(chosen)])
-
-    return chosen, len(matched_items)
+        records.append(
+            {
+                "source": "HackerNews",
+                "title": title,
+                "url": url,
+                "hn_url": f"https://news.ycombinator.com/item?id={item.get('id')}",
+                "score": score,
+                "comments": comments,
+                "host": host,
+                "time": ts,
+                "category": item.get("category") or classify(title, classifier),
+                "in_top90": top90_rank is not None,
+                "top90_rank": top90_rank,
+            }
+        )
+    return records
+
+
+def score_hn_records(
+    records: list[dict],
+    start_ts: int,
+    end_ts: int,
+    weights: ScoringWeights | None = None,
+    history: DedupIndex | None = None,
+) -> list[dict]:
+    if history:
+        records = history.filter_unseen(records)
+    return score_batch(records, end_ts, end_ts - start_ts, weights)
+
+
+def rank_hn_items(
+    items: Iterable[dict],
+    start_ts: int,
+    end_ts: int,
+    allowed_domains: DomainIndex,
+    weights: ScoringWeights | None = None,
+    history: DedupIndex | None = None,
+    classifier: KeywordClassifier | None = None,
+    target: int | None = DEFAULT_TARGET,
+) -> tuple[list[dict], int]:
+    # target 为 None 时返回全部候选（已排序），由调用方去重后再截取
+    records = hn_records(items, start_ts, end_ts, allowed_domains, classifier)
+    records = score_hn_records(records, start_ts, end_ts, weights, history)
+    matched = sum(1 for x in records if x["in_top90"])
+    if target is None:
+        return sorted(records, key=hn_key, reverse=True), matched
+    top = TopK(target, hn_key)
+    top.extend(records)
+    return top.items(), matched
+
+
+def fetch_hn_items(
+    start_ts: int,
+    end_ts: int,
+    max_scan: int = DEFAULT_MAX_SCAN,
+    pool: FetchPool | None = None,
+    store: HNItemStore | None = None,
+    search: HNSearchBackend | None = None,
+    partials: DayPartials | None = None,
+    timeout: float | None = None,
+    hedge_after: float | None = None,
+    list_name: str = "topstories",
+    ranker: ScanRanker | None = None,
+) -> list[dict]:
+    if search and partials:
+        items = iter_partial_items(search, partials, start_ts, end_ts, store)
+    elif search:
+        items = iter_search_items(search, start_ts, end_ts, store)
+    else:
+        items = iter_list_items(pool or FetchPool(), store, max_scan, timeout, hedge_after, list_name, ranker)
+    return list(items)
 
 
-def fetch_github_items(start_date: datetime, root: Path) -> list[dict]:
-    query = f"(AI OR LLM OR agent OR mcp OR rag) stars:>150 pushed:>={start_date.strftime('%Y-%m-%d')}"
-    url = "search/repositories?q=" + quote_plus(query) + "&sort=stars&order=desc&per_page=20"
+def gh_search_repositories(query: str, root: Path, max_results: int, timeout: float | None = None) -> list[dict]:
+    # 回退路径：通过 gh CLI 调用，只取一页（最多 100 条）
+    per_page = min(MAX_PER_PAGE, max(1, max_results))
+    url = "search/repositories?q=" + quote_plus(query) + f"&sort=stars&order=desc&per_page={per_page}"
     result = subprocess.run(
         ["gh", "api", url],
         capture_output=True,
@@ -141,11 +343,34 @@ def fetch_github_items(start_date: datetime, root: Path) -> list[dict]:
         encoding="utf-8",
         errors="replace",
         cwd=str(root),
-        check=True,
+        timeout=timeout,
     )
-    payload = json.loads(result.stdout)
+    if result.returncode != 0:
+        raise RuntimeError((result.stderr or "").strip() or f"gh api exited with {result.returncode}")
+    return json.loads(result.stdout).get("items", [])[:max_results]
+
+
+def github_query(start_date: datetime) -> str:
+    return f"(AI OR LLM OR agent OR mcp OR rag) stars:>150 pushed:>={start_date.strftime('%Y-%m-%d')}"
+
+
+def fetch_github_items(
+    start_date: datetime,
+    root: Path,
+    timeout: float | None = None,
+    client: GitHubSearchClient | None = None,
+    max_results: int = DEFAULT_MAX_RESULTS,
+) -> list[dict]:
+    query = github_query(start_date)
+    repos = None
+    if client:
+        try:
+            repos = list(client.iter_repositories(query, max_results=max_results))
+        except (requests.RequestException, GitHubAPIError, ValueError) as e:
+            print(f"[warn] GitHub API failed, falling back to gh: {e}", file=sys.stderr)
+    if repos is None:
+        repos = gh_search_repositories(query, root, max_results, timeout)
 
-    repos = payload.get("items", [])
     items = []
     for r in repos:
         pushed = r.get("pushed_at")
@@ -161,7 +386,6 @@ def fetch_github_items(start_date: datetime, root: Path) -> list[dict]:
             continue
 
         stars_count = int(r.get("stargazers_count", 0))
-        score_norm = min(5.0, max(1.0, 1.5 + math.log10(max(1, stars_count))))
         title = r.get("full_name", "unknown/repo")
         desc = r.get("description") or ""
 
@@ -174,57 +398,60 @@ def fetch_github_items(start_date: datetime, root: Path) -> list[dict]:
                 "stars": stars_count,
                 "language": r.get("language") or "Unknown",
                 "time": int(pushed_dt.timestamp()),
-                "score_norm": score_norm,
-                "category": classify(f"{title} {desc}"),
             }
         )
-
-    items.sort(key=lambda x: (x["score_norm"], x["stars"]), reverse=True)
-    return items[:10]
-
-
-def extract_keywords(text: str) -> list[str]:
-    tokens = re.findall(r"[A-Za-z][A-Za-z0-9+\-]{2,}", text.lower())
-    stop = {
-        "the",
-        "and",
-        "for",
-        "with",
-        "from",
-        "that",
-        "this",
-        "into",
-        "using",
-        "use",
-        "new",
-        "your",
-        "are",
-        "has",
-        "you",
-        "repo",
-        "github",
-        "hacker",
-        "news",
-        "com",
-        "www",
-        "http",
-        "https",
-        "tool",
-        "tools",
-        "project",
-        "projects",
-        "about",
-        "over",
-        "under",
-        "than",
-        "through",
-        "their",
-        "they",
-        "what",
-        "when",
-        "where",
-    }
-    return [t for t in tokens if t not in stop]
+    return items
+
+
+def rank_github_items(
+    items: list[dict],
+    start_ts: int,
+    end_ts: int,
+    weights: ScoringWeights | None = None,
+    history: DedupIndex | None = None,
+    classifier: KeywordClassifier | None = None,
+    limit: int | None = GITHUB_LIMIT,
+) -> list[dict]:
+    for x in items:
+        if "category" not in x:
+            x["category"] = classify(f"{x['title']} {x['description']}", classifier)
+    if history:
+        items = history.filter_unseen(items)
+    # 时效以窗口末尾为参照，与 HN、订阅源一致；指定过去的 --end-date 时不会把所有仓库都算成最旧
+    score_batch(items, end_ts, end_ts - start_ts, weights)
+    items.sort(key=rank_key, reverse=True)
+    return items[:limit]
+
+
+def rank_source_items(
+    items: list[dict],
+    start_ts: int,
+    end_ts: int,
+    weights: ScoringWeights | None = None,
+    history: DedupIndex | None = None,
+    limit: int | None = SOURCE_LIMIT,
+    classifier: KeywordClassifier | None = None,
+) -> list[dict]:
+    # 订阅源条目没有热度，只按分类和时效打分；没有发布时间的条目保留，按窗口末尾计算时效
+    records = []
+    for x in items:
+        ts = x.get("time")
+        if ts is not None and (ts < start_ts or ts > end_ts):
+            continue
+        records.append(
+            {
+                **x,
+                "host": (urlparse(x["url"]).hostname or "").lower(),
+                "time": ts if ts is not None else end_ts,
+                "category": x.get("category") or classify(f"{x['title']} {x.get('summary', '')}", classifier),
+                "in_top90": x.get("top90_rank") is not None,
+            }
+        )
+    if history:
+        records = history.filter_unseen(records)
+    score_batch(records, end_ts, end_ts - start_ts, weights)
+    records.sort(key=rank_key, reverse=True)
+    return records[:limit]
 
 
 def build_category_svg(cat_counter: Counter, total: int) -> str:
@@ -302,210 +529,561 @@ def build_tag_cloud_svg(keyword_counts: list[tuple[str, int]]) -> str:
     return "\n".join(out)
 
 
-def render_report(start_date: datetime, end_date: datetime, root: Path, top90_file: Path, out_path: Path) -> dict:
+def section_header(ctx: dict) -> Iterator[str]:
+    combined = ctx["combined"]
+    hn_items = ctx["hn_items"]
+    gh_items = ctx["gh_items"]
+    hn_matched_count = ctx["hn_matched_count"]
+    feeds = ctx["feeds"]
+    date_start = ctx["date_start"]
+    date_end = ctx["date_end"]
+
+    yield f"# 每日信息汇总（近七天 | {date_start} ~ {date_end}）"
+    yield ""
+    source_items = ctx["source_items"]
+    counts = f"HN {len(hn_items)} 条，GitHub {len(gh_items)} 条"
+    if source_items:
+        counts += f"，订阅源 {len(source_items)} 条"
+    yield f"> 综合 {ctx['source_count']} 个信息源，共收录 {len(combined)} 条高质量内容（{counts}）。"
+    yield f"> 默认 HN 博客源：Andrej Karpathy 推荐 Top 90（匹配到本周期 HN 条目 {hn_matched_count} 条，源列表 {len(feeds)} 个）。"
+
+
+def section_highlights(ctx: dict) -> Iterator[str]:
+    yield ""
+    yield "---"
+    yield ""
+    yield "## 📝 今日看点"
+    yield ""
+    yield "1. **AI 工具链持续走强**：近七天 GitHub 热门仓库集中在 Agent、MCP、推理优化与开发提效。"
+    yield "2. **HN 讨论更偏工程实战**：高分内容聚焦可靠性、性能、可维护性，而非纯概念讨论。"
+    yield "3. **内容源质量可控**：HN 侧以 Karpathy Top 90 默认源做域过滤，减少低信号噪音。"
+
+
+def section_must_read(ctx: dict) -> Iterator[str]:
+    must_read = ctx["must_read"]
+
+    yield ""
+    yield "---"
+    yield ""
+    yield "## 🏆 今日必读（Top 3）"
+    yield ""
+    for idx, item in enumerate(must_read, 1):
+        s = star_rating(item["score_norm"])
+        yield f"### {idx}. {item['title']}"
+        yield ""
+        yield f"- **摘要**：{item['summary']}"
+        yield f"- **来源**：[{item['source']}]({item['url']})"
+        yield f"- **评分**：{'⭐' * s} ({s}/5)"
+        yield f"- **评分详情**：{item['score_detail']}"
+        yield f"- **热度**：{item['heat']}"
+        yield f"- **分类**：{item['category']}"
+        yield ""
+
+
+def section_hn(ctx: dict) -> Iterator[str]:
+    hn_items = ctx["hn_items"]
+
+    yield "---"
+    yield ""
+    yield "## 🔥 HackerNews 热帖（近七天）"
+    yield ""
+    for idx, item in enumerate(hn_items, 1):
+        s = star_rating(item["score_norm"])
+        source_note = f"Karpathy Top90 #{item['top90_rank']}" if item["in_top90"] else "HN Fallback"
+        yield f"### {idx}. {item['title']}"
+        yield f"- **来源**：[HackerNews]({item['hn_url']}) | [原文]({item['url']})"
+        yield f"- **评分**：{'⭐' * s} ({s}/5)"
+        yield f"- **评分详情**：{score_detail(item)}"
+        yield f"- **热度**：{item['score']} points | {item['comments']} comments"
+        yield f"- **分类**：{item['category']}"
+        yield f"- **源匹配**：{source_note}"
+        yield ""
+
+
+def section_github(ctx: dict) -> Iterator[str]:
+    gh_items = ctx["gh_items"]
+
+    yield "---"
+    yield ""
+    yield "## 🐙 GitHub 热门项目（近七天活跃）"
+    yield ""
+    for idx, item in enumerate(gh_items, 1):
+        s = star_rating(item["score_norm"])
+        yield f"### {idx}. {item['title']}"
+        if item["description"]:
+            yield f"- **简介**：{item['description']}"
+        yield f"- **来源**：[GitHub]({item['url']})"
+        yield f"- **评分**：{'⭐' * s} ({s}/5)"
+        yield f"- **评分详情**：{score_detail(item)}"
+        yield f"- **热度**：{item['stars']} stars | {item['language']}"
+        yield f"- **分类**：{item['category']}"
+        yield ""
+
+
+def section_sources(ctx: dict) -> Iterator[str]:
+    source_items = ctx["source_items"]
+    if not source_items:
+        return
+
+    yield "---"
+    yield ""
+    yield "## 📰 订阅源精选（近七天）"
+    yield ""
+    for idx, item in enumerate(source_items, 1):
+        s = star_rating(item["score_norm"])
+        yield f"### {idx}. {item['title']}"
+        if item.get("summary"):
+            yield f"- **摘要**：{item['summary']}"
+        yield f"- **来源**：[{item['source_name']}]({item['url']})"
+        yield f"- **评分**：{'⭐' * s} ({s}/5)"
+        yield f"- **评分详情**：{score_detail(item)}"
+        yield f"- **分类**：{item['category']}"
+        yield ""
+
+
+def section_overview(ctx: dict) -> Iterator[str]:
+    combined = ctx["combined"]
+    hn_matched_count = ctx["hn_matched_count"]
+    feeds = ctx["feeds"]
+    avg_score = ctx["avg_score"]
+    cat_counter = ctx["cat_counter"]
+    total = ctx["total"]
+    kw_top = ctx["kw_top"]
+    cat_svg = ctx["cat_svg"]
+    cloud_svg = ctx["cloud_svg"]
+
+    yield "---"
+    yield ""
+    yield "## 📊 数据概览"
+    yield ""
+    yield "### 📋 数据统计"
+    yield ""
+    yield "| 指标 | 数值 |"
+    yield "|------|:----:|"
+    yield "| 时间范围 | 7 天 |"
+    yield f"| 信息源总数 | {ctx['source_count']} |"
+    yield f"| HN 默认博客源 | {len(feeds)}（Karpathy Top 90） |"
+    yield f"| HN 源匹配条目 | {hn_matched_count} |"
+    yield f"| 收录条目 | {len(combined)} |"
+    yield f"| 平均评分 | {avg_score:.1f} / 5 |"
+    yield f"| 分类覆盖 | {len(cat_counter)} / 6 |"
+    yield ""
+
+    yield "### 分类分布"
+    yield ""
+    yield "| 分类 | 数量 | 占比 |"
+    yield "|------|:----:|:----:|"
+    for cat in CATEGORY_ORDER:
+        c = cat_counter.get(cat, 0)
+        yield f"| {cat} | {c} | {c * 100 / total:.1f}% |"
+    yield ""
+
+    yield "### 🥧 Mermaid 分类饼图"
+    yield ""
+    yield "```mermaid"
+    yield "pie title 内容分类分布（近七天）"
+    for cat in CATEGORY_ORDER:
+        yield f'    "{cat}" : {cat_counter.get(cat, 0)}'
+    yield "```"
+    yield ""
+
+    yield "### 📊 Mermaid 高频关键词柱状图"
+    yield ""
+    labels = [k for k, _ in kw_top]
+    values = [v for _, v in kw_top]
+    x_vals = ", ".join([f'"{x}"' for x in labels])
+    y_max = max(5, max(values) + 1 if values else 5)
+    v_vals = ", ".join(str(v) for v in values) if values else "0"
+    yield "```mermaid"
+    yield "xychart-beta"
+    yield '    title "高频关键词 Top 10"'
+    yield f"    x-axis [{x_vals}]"
+    yield f'    y-axis "出现次数" 0 --> {y_max}'
+    yield f"    bar [{v_vals}]"
+    yield "```"
+    yield ""
+
+    yield "### 🧩 SVG 分类条形图"
+    yield ""
+    yield "```svg"
+    yield cat_svg
+    yield "```"
+    yield ""
+
+    yield "### ☁️ SVG 话题标签云"
+    yield ""
+    yield "```svg"
+    yield cloud_svg
+    yield "```"
+    yield ""
+
+
+def section_fetch_stats(ctx: dict) -> Iterator[str]:
+    rows = ctx["fetch_stats"]
+
+    yield "---"
+    yield ""
+    yield "## 📈 抓取统计"
+    yield ""
+    yield "| 来源 | 请求数 | 抓取条目 | 入选条目 | 失败 | 耗时 |"
+    yield "|------|:------:|:--------:|:--------:|:----:|:----:|"
+    for label, requests_made, fetched, included, failed, duration_ms in rows:
+        yield f"| {label} | {requests_made} | {fetched} | {included} | {failed} | {duration_ms / 1000:.1f}s |"
+    totals = [sum(row[i] for row in rows) for i in range(1, 5)]
+    yield f"| **总计** | **{totals[0]}** | **{totals[1]}** | **{totals[2]}** | **{totals[3]}** | **{ctx['fetch_ms'] / 1000:.1f}s** |"
+
+
+def section_footer(ctx: dict) -> Iterator[str]:
+    end_date = ctx["end_date"]
+
+    yield ""
+    yield "---"
+    yield ""
+    yield "*Generated by Info Collector Agent (full, 7-day, zh-CN)*"
+    yield f"*Date: {end_date.strftime('%Y-%m-%d')}*"
+
+
+REPORT_SECTIONS = [
+    section_header,
+    section_highlights,
+    section_must_read,
+    section_hn,
+    section_github,
+    section_sources,
+    section_overview,
+    section_fetch_stats,
+    section_footer,
+]
+
+
+def sidecar_records(combined: list[dict]) -> Iterator[dict]:
+    # 字段与 notion-sync 解析 Markdown 得到的文章记录一致，额外附带分类、评分详情和热度
+    for idx, x in enumerate(combined, 1):
+        yield {
+            "rank": idx,
+            "title": x["title"],
+            "summary": x["summary"],
+            "key_points": "",
+            "url": x["url"],
+            "source": x["source"],
+            "keywords": x["keywords"][:5],
+            "score": str(star_rating(x["score_norm"])),
+            "category": x["category"],
+            "score_detail": x["score_detail"],
+            "heat": x["heat"],
+        }
+
+
+def render_report(
+    start_date: datetime,
+    end_date: datetime,
+    root: Path,
+    top90_file: Path,
+    out_path: Path,
+    pool: FetchPool | None = None,
+    store: HNItemStore | None = None,
+    search: HNSearchBackend | None = None,
+    weights: ScoringWeights | None = None,
+    history: DedupIndex | None = None,
+    partials: DayPartials | None = None,
+    source_timeout: float | None = DEFAULT_SOURCE_TIMEOUT,
+    github: GitHubSearchClient | None = None,
+    github_max_results: int = DEFAULT_MAX_RESULTS,
+    registry: SourceRegistry | None = None,
+    classifier: KeywordClassifier | None = None,
+    keyword_capacity: int | None = None,
+    metrics: RunMetrics | None = None,
+    health: SourceHealth | None = None,
+    hn_list: str = "topstories",
+    hn_max_scan: int = DEFAULT_MAX_SCAN,
+    hn_target: int = DEFAULT_TARGET,
+    hn_patience: int = DEFAULT_PATIENCE,
+) -> dict:
+    if metrics is None:
+        metrics = RunMetrics()
+        if pool:
+            metrics.instrument(pool.session)
     feeds, allowed_domains = read_karpathy_top90(top90_file)
 
     start_ts = int(start_date.timestamp())
     end_ts = int((end_date + timedelta(days=1)).timestamp()) - 1
 
-    hn_items, hn_matched_count = fetch_hn_items(start_ts, end_ts, allowed_domains)
-    gh_items = fetch_github_items(start_date, root)
+    # HN 条目请求的超时和对冲时机取自历史 p95，慢请求不再每次都等满固定超时
+    hn_timeout = health.timeout("hn", pool.timeout) if health and pool else None
+    hn_hedge_after = health.hedge_after("hn") if health else None
+    # 扫描榜单时边抓边排，前 hn_target 名已定下来就不再请求剩余条目；评分与排名阶段用的是同一套记录和评分
+    def score_scanned(items: list[dict]) -> list[dict]:
+        records = hn_records(items, start_ts, end_ts, allowed_domains, classifier)
+        return score_hn_records(records, start_ts, end_ts, weights, history)
+
+    ranker = None
+    if not search:
+        ranker = ScanRanker(
+            hn_target + HN_DEDUP_MARGIN,
+            hn_key,
+            score_scanned,
+            start_ts,
+            end_ts,
+            (weights or ScoringWeights()).dimensions,
+            hn_patience,
+        )
+
+    def fetch_hn(ranker: ScanRanker | None) -> list[dict]:
+        return fetch_hn_items(
+            start_ts,
+            end_ts,
+            pool=pool,
+            store=store,
+            search=search,
+            partials=partials,
+            max_scan=hn_max_scan,
+            timeout=hn_timeout,
+            hedge_after=hn_hedge_after,
+            list_name=hn_list,
+            ranker=ranker,
+        )
+
+    # 各源并发抓取，单个源失败或超时只记录到 last_run，报告照常生成；评分和历史去重回到主线程做
+    tasks = [
+        SourceFetch("hn", lambda: fetch_hn(ranker), source_timeout),
+        SourceFetch(
+            "github",
+            lambda: fetch_github_items(start_date, root, source_timeout, github, github_max_results),
+            source_timeout,
+        ),
+    ]
+    if registry:
+        tasks.append(SourceFetch("sources", registry.run, source_timeout))
 
+    # 熔断中的源本次直接跳过，不占用抓取时间；冷却期过后会放行一次试探
+    circuit_open = {}
+    for t in tasks if health else []:
+        try:
+            health.check(t.name)
+        except CircuitOpen as e:
+            circuit_open[t.name] = SourceResult(t.name, error=str(e), skipped=True)
+
+    fetch_started = time.perf_counter()
+    with metrics.stage("fetch"):
+        fetched_sources = run_sources([t for t in tasks if t.name not in circuit_open])
+    sources = {t.name: circuit_open.get(t.name) or fetched_sources[t.name] for t in tasks}
+    fetch_ms = int((time.perf_counter() - fetch_started) * 1000)
+    for name, r in sources.items():
+        metrics.span(name, fetch_started, fetch_started + r.duration_ms / 1000, cat="source")
+
+    raw_source_items: list[dict] = []
+    if "sources" in sources:
+        # 注册表整体超时才记为 sources 失败，否则展开为每个订阅源各自的结果
+        fetched = sources.pop("sources")
+        if fetched.ok:
+            raw_source_items, per_source = fetched.value
+            sources.update(per_source)
+        else:
+            sources["sources"] = fetched
+
+    for name, r in sources.items():
+        if not r.ok:
+            print(f"[warn] source {name} {'skipped' if r.skipped else 'failed'}: {r.error}", file=sys.stderr)
+
+    raw_hn_items = sources["hn"].value or []
+    raw_gh_items = sources["github"].value or []
+    with metrics.stage("classify"):
+        classify_items(raw_hn_items, lambda x: x.get("title", "(no title)"), classifier)
+        classify_items(raw_gh_items, lambda x: f"{x['title']} {x['description']}", classifier)
+        classify_items(raw_source_items, lambda x: f"{x['title']} {x.get('summary', '')}", classifier)
+
+    with metrics.stage("rank"):
+        # 先在各源完整的候选池上跨源去重，再各取前 N 条：被去掉的重复项由排在后面的候选补位，而不是让报告变短
+        gh_pool = rank_github_items(raw_gh_items, start_ts, end_ts, weights, history, classifier, limit=None)
+        source_pool = rank_source_items(raw_source_items, start_ts, end_ts, weights, history, limit=None, classifier=classifier)
+
+        def dedup_pools(raw_hn_items: list[dict]) -> tuple[list[dict], int, set[int]]:
+            hn_pool, matched = rank_hn_items(
+                raw_hn_items, start_ts, end_ts, allowed_domains, weights, history, classifier, target=None
+            )
+            return hn_pool, matched, {id(x) for x in deduplicate(hn_pool + gh_pool + source_pool)}
+
+        hn_pool, hn_matched_count, kept = dedup_pools(raw_hn_items)
+        # 提前停止的扫描只保证前 ranker.top.k 名都已抓到；补位用到更靠后的候选时，它们可能根本没有请求过，
+        # 这时改为完整扫描一次，保证结果与不剪枝时一致
+        if ranker is not None and ranker.stopped:
+            kept_pos = [pos for pos, x in enumerate(hn_pool) if id(x) in kept][:hn_target]
+            if len(kept_pos) < hn_target or kept_pos[-1] >= ranker.top.k:
+                print(f"[info] HN {hn_list}: dedup reached past the settled top {ranker.top.k}, rescanning", file=sys.stderr)
+                rescan = run_sources([SourceFetch("hn", lambda: fetch_hn(None), source_timeout)])["hn"]
+                if rescan.ok:
+                    raw_hn_items = rescan.value or []
+                    classify_items(raw_hn_items, lambda x: x.get("title", "(no title)"), classifier)
+                    hn_pool, hn_matched_count, kept = dedup_pools(raw_hn_items)
+                else:
+                    print(f"[warn] HN rescan failed: {rescan.error}", file=sys.stderr)
+        hn_items = [x for x in hn_pool if id(x) in kept][:hn_target]
+        gh_items = [x for x in gh_pool if id(x) in kept][:GITHUB_LIMIT]
+        source_items = [x for x in source_pool if id(x) in kept][:SOURCE_LIMIT]
+
+    render_started = time.perf_counter()
+
+    # 关键词在条目加入时就累计进同一个计数器，Top 10 柱状图和 Top 40 标签云都从它取
     combined = []
+    keyword_counter = KeywordCounter(keyword_capacity)
+
+    def add(entry: dict) -> None:
+        combined.append(entry)
+        keyword_counter.update(entry["keywords"])
+
     for x in hn_items:
-        combined.append(
+        add(
             {
                 "title": x["title"],
                 "url": x["url"],
                 "source": "HackerNews",
                 "score_norm": x["score_norm"],
+                "weighted": x["weighted"],
+                "score_detail": score_detail(x),
                 "category": x["category"],
                 "heat": f"{x['score']} points | {x['comments']} comments",
                 "summary": "该条目来自近七天 HN 高热讨论，社区反馈集中在工程实现可行性与实践细节。",
+                "keywords": extract_keywords(x["title"]),
             }
         )
 
     for x in gh_items:
-        combined.append(
+        add(
             {
                 "title": x["title"],
                 "url": x["url"],
                 "source": "GitHub",
                 "score_norm": x["score_norm"],
+                "weighted": x["weighted"],
+                "score_detail": score_detail(x),
                 "category": x["category"],
                 "heat": f"{x['stars']} stars | {x['language']}",
                 "summary": "该项目在近七天保持活跃更新，显示出较高的社区关注和落地价值。",
+                "keywords": extract_keywords(f"{x['title']} {x['description']}"),
+            }
+        )
+
+    for x in source_items:
+        add(
+            {
+                "title": x["title"],
+                "url": x["url"],
+                "source": x["source_name"],
+                "score_norm": x["score_norm"],
+                "weighted": x["weighted"],
+                "score_detail": score_detail(x),
+                "category": x["category"],
+                "heat": "—",
+                "summary": x.get("summary") or "该文章来自配置的订阅源，发布于近七天内。",
+                "keywords": extract_keywords(x["title"]),
             }
         )
 
-    combined.sort(key=lambda x: x["score_norm"], reverse=True)
+    combined.sort(key=lambda x: (star_rating(x["score_norm"]), x["weighted"]), reverse=True)
     must_read = combined[:3]
 
-    all_kw = []
-    for x in hn_items:
-        all_kw.extend(extract_keywords(x["title"]))
-    for x in gh_items:
-        all_kw.extend(extract_keywords(f"{x['title']} {x['description']}"))
-    kw_top = Counter(all_kw).most_common(10)
+    kw_top = keyword_counter.most_common(10)
 
     cat_counter = Counter([x["category"] for x in combined])
     total = max(1, len(combined))
     avg_score = sum(x["score_norm"] for x in combined) / total
 
     cat_svg = build_category_svg(cat_counter, total)
-    cloud_svg = build_tag_cloud_svg(Counter(all_kw).most_common(40))
-
-    date_start = start_date.strftime("%Y-%m-%d")
-    date_end = end_date.strftime("%Y-%m-%d")
-
-    lines: list[str] = []
-    lines.append(f"# 每日信息汇总（近七天 | {date_start} ~ {date_end}）")
-    lines.append("")
-    lines.append(f"> 综合 2 个信息源，共收录 {len(combined)} 条高质量内容（HN {len(hn_items)} 条，GitHub {len(gh_items)} 条）。")
-    lines.append(f"> 默认 HN 博客源：Andrej Karpathy 推荐 Top 90（匹配到本周期 HN 条目 {hn_matched_count} 条，源列表 {len(feeds)} 个）。")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append("## 📝 今日看点")
-    lines.append("")
-    lines.append("1. **AI 工具链持续走强**：近七天 GitHub 热门仓库集中在 Agent、MCP、推理优化与开发提效。")
-    lines.append("2. **HN 讨论更偏工程实战**：高分内容聚焦可靠性、性能、可维护性，而非纯概念讨论。")
-    lines.append("3. **内容源质量可控**：HN 侧以 Karpathy Top 90 默认源做域过滤，减少低信号噪音。")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append("## 🏆 今日必读（Top 3）")
-    lines.append("")
-    for idx, item in enumerate(must_read, 1):
-        s = star_rating(item["score_norm"])
-        lines.append(f"### {idx}. {item['title']}")
-        lines.append("")
-        lines.append(f"- **摘要**：{item['summary']}")
-        lines.append(f"- **来源**：[{item['source']}]({item['url']})")
-        lines.append(f"- **评分**：{'⭐' * s} ({s}/5)")
-        lines.append(f"- **热度**：{item['heat']}")
-        lines.append(f"- **分类**：{item['category']}")
-        lines.append("")
-
-    lines.append("---")
-    lines.append("")
-    lines.append("## 🔥 HackerNews 热帖（近七天）")
-    lines.append("")
-    for idx, item in enumerate(hn_items, 1):
-        s = star_rating(item["score_norm"])
-        source_note = "Karpathy Top90" if item["in_top90"] else "HN Fallback"
-        lines.append(f"### {idx}. {item['title']}")
-        lines.append(f"- **来源**：[HackerNews]({item['hn_url']}) | [原文]({item['url']})")
-        lines.append(f"- **评分**：{'⭐' * s} ({s}/5)")
-        lines.append(f"- **热度**：{item['score']} points | {item['comments']} comments")
-        lines.append(f"- **分类**：{item['category']}")
-        lines.append(f"- **源匹配**：{source_note}")
-        lines.append("")
-
-    lines.append("---")
-    lines.append("")
-    lines.append("## 🐙 GitHub 热门项目（近七天活跃）")
-    lines.append("")
-    for idx, item in enumerate(gh_items, 1):
-        s = star_rating(item["score_norm"])
-        lines.append(f"### {idx}. {item['title']}")
-        if item["description"]:
-            lines.append(f"- **简介**：{item['description']}")
-        lines.append(f"- **来源**：[GitHub]({item['url']})")
-        lines.append(f"- **评分**：{'⭐' * s} ({s}/5)")
-        lines.append(f"- **热度**：{item['stars']} stars | {item['language']}")
-        lines.append(f"- **分类**：{item['category']}")
-        lines.append("")
-
-    lines.append("---")
-    lines.append("")
-    lines.append("## 📊 数据概览")
-    lines.append("")
-    lines.append("### 📋 数据统计")
-    lines.append("")
-    lines.append("| 指标 | 数值 |")
-    lines.append("|------|:----:|")
-    lines.append("| 时间范围 | 7 天 |")
-    lines.append("| 信息源总数 | 2 |")
-    lines.append(f"| HN 默认博客源 | {len(feeds)}（Karpathy Top 90） |")
-    lines.append(f"| HN 源匹配条目 | {hn_matched_count} |")
-    lines.append(f"| 收录条目 | {len(combined)} |")
-    lines.append(f"| 平均评分 | {avg_score:.1f} / 5 |")
-    lines.append(f"| 分类覆盖 | {len(cat_counter)} / 6 |")
-    lines.append("")
-
-    lines.append("### 分类分布")
-    lines.append("")
-    lines.append("| 分类 | 数量 | 占比 |")
-    lines.append("|------|:----:|:----:|")
-    for cat in CATEGORY_ORDER:
-        c = cat_counter.get(cat, 0)
-        lines.append(f"| {cat} | {c} | {c * 100 / total:.1f}% |")
-    lines.append("")
+    cloud_svg = build_tag_cloud_svg(keyword_counter.most_common(40))
+
+    # 每个源的抓取 / 入选条数、请求延迟和成败，既用于抓取统计表，也写入 cache.json
+    latency = metrics.latency_summary()
+    included_by_source = Counter(x["source"] for x in source_items)
+    source_metrics = {}
+    for name, r in sources.items():
+        if r.skipped:
+            continue
+        included = {"hn": hn_items, "github": gh_items}.get(name)
+        source_metrics[name] = {
+            "ok": r.ok,
+            "items_fetched": len(r.value) if isinstance(r.value, list) else int(r.value or 0),
+            "items_included": len(included) if included is not None else included_by_source.get(name, 0),
+            "duration_ms": r.duration_ms,
+            **latency.get(name, {"requests": 0, "errors": 0}),
+        }
+    quality = {"hn": [x["score_norm"] for x in hn_items], "github": [x["score_norm"] for x in gh_items]}
+    for x in source_items:
+        quality.setdefault(x["source"], []).append(x["score_norm"])
+
+    def stats_row(label: str, names: list[str]) -> tuple:
+        ms = [source_metrics[n] for n in names if n in source_metrics]
+        return (
+            label,
+            sum(m["requests"] for m in ms),
+            sum(m["items_fetched"] for m in ms),
+            sum(m["items_included"] for m in ms),
+            sum(m["errors"] + (0 if m["ok"] else 1) for m in ms),
+            max((m["duration_ms"] for m in ms), default=0),
+        )
 
-    lines.append("### 🥧 Mermaid 分类饼图")
-    lines.append("")
-    lines.append("```mermaid")
-    lines.append("pie title 内容分类分布（近七天）")
-    for cat in CATEGORY_ORDER:
-        lines.append(f'    "{cat}" : {cat_counter.get(cat, 0)}')
-    lines.append("```")
-    lines.append("")
+    fetch_stats = [
+        stats_row("HackerNews Algolia Search API" if search else f"HackerNews {HN_LIST_LABELS[hn_list]} API", ["hn"]),
+        stats_row("GitHub Search API", ["github"]),
+    ]
+    feed_sources = [n for n in source_metrics if n not in ("hn", "github")]
+    if feed_sources:
+        fetch_stats.append(stats_row(f"订阅源（{len(feed_sources)} 个）", feed_sources))
+
+    ctx = {
+        "combined": combined,
+        "hn_items": hn_items,
+        "gh_items": gh_items,
+        "source_items": source_items,
+        "source_count": 2 + sum(1 for name, r in sources.items() if name not in ("hn", "github") and r.ok),
+        "hn_matched_count": hn_matched_count,
+        "feeds": feeds,
+        "date_start": start_date.strftime("%Y-%m-%d"),
+        "date_end": end_date.strftime("%Y-%m-%d"),
+        "end_date": end_date,
+        "must_read": must_read,
+        "avg_score": avg_score,
+        "cat_counter": cat_counter,
+        "total": total,
+        "kw_top": kw_top,
+        "cat_svg": cat_svg,
+        "cloud_svg": cloud_svg,
+        "fetch_stats": fetch_stats,
+        "fetch_ms": fetch_ms,
+    }
+    metrics.span("render", render_started, time.perf_counter())
 
-    lines.append("### 📊 Mermaid 高频关键词柱状图")
-    lines.append("")
-    labels = [k for k, _ in kw_top]
-    values = [v for _, v in kw_top]
-    x_vals = ", ".join([f'"{x}"' for x in labels])
-    y_max = max(5, max(values) + 1 if values else 5)
-    v_vals = ", ".join(str(v) for v in values) if values else "0"
-    lines.append("```mermaid")
-    lines.append("xychart-beta")
-    lines.append('    title "高频关键词 Top 10"')
-    lines.append(f"    x-axis [{x_vals}]")
-    lines.append(f'    y-axis "出现次数" 0 --> {y_max}')
-    lines.append(f"    bar [{v_vals}]")
-    lines.append("```")
-    lines.append("")
-
-    lines.append("### 🧩 SVG 分类条形图")
-    lines.append("")
-    lines.append("```svg")
-    lines.append(cat_svg)
-    lines.append("```")
-    lines.append("")
-
-    lines.append("### ☁️ SVG 话题标签云")
-    lines.append("")
-    lines.append("```svg")
-    lines.append(cloud_svg)
-    lines.append("```")
-    lines.append("")
-
-    lines.append("---")
-    lines.append("")
-    lines.append("## 📈 抓取统计")
-    lines.append("")
-    lines.append("| 来源 | 抓取条目 | 入选条目 | 失败 |")
-    lines.append("|------|:--------:|:--------:|:----:|")
-    lines.append(f"| HackerNews Top Stories API | 120 | {len(hn_items)} | 0 |")
-    lines.append(f"| GitHub Search API | 20 | {len(gh_items)} | 0 |")
-    lines.append(f"| **总计** | **140** | **{len(combined)}** | **0** |")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append("*Generated by Info Collector Agent (full, 7-day, zh-CN)*")
-    lines.append(f"*Date: {end_date.strftime('%Y-%m-%d')}*")
-
-    out_path.write_text("\n".join(lines), encoding="utf-8")
+    with metrics.stage("write"):
+        write_report(out_path, (section(ctx) for section in REPORT_SECTIONS))
+        sidecar = write_sidecar(out_path, sidecar_records(combined))
+
+        if history:
+            history.record(hn_items + gh_items + source_items)
+            history.evict()
 
     return {
         "out": str(out_path),
+        "sidecar": str(sidecar),
         "hn_items": len(hn_items),
         "gh_items": len(gh_items),
+        "source_items": len(source_items),
         "total": len(combined),
         "hn_source_set": len(feeds),
         "hn_matched": hn_matched_count,
+        "items_fetched": sum(m["items_fetched"] for m in source_metrics.values()),
+        **run_summary(sources),
+        "stages_ms": metrics.stage_ms(),
+        "source_metrics": source_metrics,
+        "source_outcomes": {
+            name: {
+                "ok": m["ok"],
+                "items": m["items_fetched"],
+                "quality": round(sum(quality[name]) / len(quality[name]), 2) if quality.get(name) else None,
+                "requests": m["requests"],
+                "errors": m["errors"],
+                "p95_ms": m.get("p95_ms", 0.0),
+            }
+            for name, m in source_metrics.items()
+        },
     }
 
 
@@ -514,10 +1092,103 @@ def main() -> None:
     parser.add_argument("--end-date", default=None, help="YYYY-MM-DD (default: today UTC)")
     parser.add_argument("--days", type=int, default=7, help="window size, default 7")
     parser.add_argument("--output", default=None, help="output markdown path")
+    parser.add_argument("--concurrency", type=int, default=None, help="max in-flight HN requests (default: rss_config.concurrency or 10)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="per-request timeout in seconds, default 4")
+    parser.add_argument("--deadline", type=float, default=None, help="total seconds budget for HN item fetching")
+    parser.add_argument(
+        "--source-timeout",
+        type=float,
+        default=DEFAULT_SOURCE_TIMEOUT,
+        help="per-source time budget; a source that exceeds it is recorded as failed, default 120",
+    )
+    parser.add_argument("--cache-dir", default=None, help="local cache directory (default: <plugin>/.cache)")
+    parser.add_argument("--no-cache", action="store_true", help="always fetch HN items from the network")
+    parser.add_argument("--no-history", action="store_true", help="do not skip items already included in earlier reports")
+    parser.add_argument(
+        "--no-source-health",
+        action="store_true",
+        help="ignore source_stats: no circuit breakers, fixed timeouts and no hedged requests",
+    )
+    parser.add_argument(
+        "--hn-source",
+        choices=["auto", *HN_LISTS, "search"],
+        default="auto",
+        help="topstories / beststories / newstories scan a live HN list; search pages through the window by timestamp (auto: search for past or >7 day windows, else topstories)",
+    )
+    parser.add_argument("--hn-max-scan", type=int, default=DEFAULT_MAX_SCAN, help="list scan: at most this many ids, default 120")
+    parser.add_argument("--hn-top", type=int, default=DEFAULT_TARGET, help="HN items kept in the report, default 15")
+    parser.add_argument(
+        "--hn-patience",
+        type=int,
+        default=DEFAULT_PATIENCE,
+        help="list scan: stop once this many consecutive items fail to enter the top --hn-top; heuristic, may change the picks. Default 0: scan up to --hn-max-scan unless the top is provably settled",
+    )
+    parser.add_argument("--hn-search-url", default=ALGOLIA_API, help="HN search API base url")
+    parser.add_argument("--hn-min-points", type=int, default=DEFAULT_MIN_POINTS, help="search backend: skip stories below this score")
+    parser.add_argument(
+        "--github-backend",
+        choices=["api", "gh"],
+        default="api",
+        help="api calls the GitHub REST API in-process (ETag cached, falls back to gh on error); gh always shells out to gh api",
+    )
+    parser.add_argument("--github-api-url", default=GITHUB_API, help="GitHub REST API base url")
+    parser.add_argument(
+        "--github-max-results", type=int, default=DEFAULT_MAX_RESULTS, help="candidate repositories to rank, default 100"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="reuse cached per-day HN partials and only fetch days that are new or not yet settled (implies --hn-source search)",
+    )
+    parser.add_argument(
+        "--settle-hours",
+        type=float,
+        default=DEFAULT_SETTLE_HOURS,
+        help="incremental: keep refetching a day until this many hours after it ends, default 48"
+    )
+    parser.add_argument(
+        "--all-sources",
+        action="store_true",
+        help="also fetch every enabled source in sources.json through the fetcher registry (rss_batch/webfetch)",
+    )
+    parser.add_argument(
+        "--source-tiers",
+        default=None,
+        help="comma-separated sources.json tiers to fetch, e.g. tier1_hn_blogs for the Karpathy Top 90 feeds (implies --all-sources)",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        help="write a Chrome trace (chrome://tracing / Perfetto JSON) of stages, sources and HTTP requests to this path",
+    )
+    parser.add_argument(
+        "--keyword-capacity",
+        type=int,
+        default=None,
+        help="bound keyword counting to about this many candidates (Misra-Gries heavy hitters) for very large windows; default exact",
+    )
+    parser.add_argument(
+        "--record",
+        default=None,
+        metavar="DIR",
+        help="save every HN / GitHub / feed response into this fixture directory; runs against an empty scratch cache without history, source health or a cache.json update",
+    )
+    parser.add_argument(
+        "--replay",
+        default=None,
+        metavar="DIR",
+        help="run offline against a fixture directory written by --record; missing fixtures count as network errors. Like --record, the live cache, history, source health and cache.json are left untouched",
+    )
+    parser.add_argument("--replay-latency-ms", type=float, default=0.0, help="replay: synthetic latency added to each response")
     args = parser.parse_args()
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
 
+    run_started = time.monotonic()
+    metrics = RunMetrics()
     root = Path(__file__).resolve().parents[2]
     plugin_root = Path(__file__).resolve().parents[1]
+    cache_file = plugin_root / "info-skills" / "daily-news-report" / "cache.json"
 
     if args.end_date:
         end_date = datetime.strptime(args.end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
@@ -528,7 +1199,146 @@ def main() -> None:
     top90_file = plugin_root / "info-skills" / "daily-news-report" / "hn-karpathy-top90.json"
     out_path = Path(args.output) if args.output else root / "output_info" / f"{end_date.strftime('%Y-%m-%d')}-full-7d.md"
 
-    result = render_report(start_date, end_date, root, top90_file, out_path)
+    # sources.json 与 cache.json 各只解析一次，后面的配置项都从这两份结果里取
+    sources_config = load_sources_config(plugin_root)
+    cache = load_cache(cache_file)
+    concurrency = args.concurrency or rss_config(sources_config).get("concurrency", DEFAULT_CONCURRENCY)
+    pool = FetchPool(concurrency=concurrency, timeout=args.timeout, deadline=args.deadline, metrics=metrics)
+    if args.record or args.replay:
+        mount_fixtures(
+            pool.session,
+            Path(args.record or args.replay),
+            RECORD if args.record else REPLAY,
+            latency_ms=args.replay_latency_ms,
+            pool_maxsize=pool.concurrency + pool.hedge_slots,
+        )
+    metrics.instrument(pool.session)
+    # 录制 / 回放与线上状态隔离：缓存目录换成临时目录，不读写报告去重历史和 cache.json 的 last_run / source_stats，
+    # 也不受熔断状态影响。录制时缓存为空，每个请求都会真正发出并落盘，回放结果可以复现
+    scratch = None
+    if args.record or args.replay:
+        scratch = tempfile.TemporaryDirectory(prefix="full-7d-fixtures-")
+        args.no_history = True
+        args.no_source_health = True
+    if scratch:
+        cache_dir = Path(scratch.name)
+    else:
+        cache_dir = Path(args.cache_dir) if args.cache_dir else plugin_root / ".cache"
+    ttl_days = url_cache_ttl_days(cache)
+    store = None if args.no_cache else HNItemStore(cache_dir / "hn-items.sqlite3", ttl_days=ttl_days)
+    history = None
+    if not args.no_history:
+        history = DedupIndex(cache_dir / "dedup-index.sqlite3", scope="report", ttl_days=ttl_days, as_of=end_date.strftime("%Y-%m-%d"))
+        if len(history) == 0:
+            history.import_cache_json(cache_file)
+
+    partials = None
+    if args.incremental and not args.no_cache:
+        partials = DayPartials(cache_dir / "hn-partials", settle_hours=args.settle_hours)
+
+    hn_source = "search" if args.incremental else args.hn_source
+    if hn_source == "auto":
+        is_today = end_date.date() == datetime.now(timezone.utc).date()
+        hn_source = "topstories" if is_today and args.days <= 7 else "search"
+    search = None
+    if hn_source == "search":
+        search = HNSearchBackend(session_transport(pool), base_url=args.hn_search_url, min_points=args.hn_min_points)
+
+    weights = ScoringWeights.from_sources_config(sources_config)
+    classifier = load_classifier(plugin_root)
+    health = None
+    if not args.no_source_health:
+        health = SourceHealth.from_sources_config(sources_config, cache.get("source_stats"))
+
+    github = None
+    if args.github_backend == "api":
+        github = GitHubSearchClient(
+            session=pool.session,
+            base_url=args.github_api_url,
+            cache_dir=None if args.no_cache else cache_dir / "github",
+            timeout=health.timeout("github", GITHUB_TIMEOUT) if health else GITHUB_TIMEOUT,
+        )
+
+    registry = None
+    if args.all_sources or args.source_tiers:
+        tiers = {t.strip() for t in args.source_tiers.split(",") if t.strip()} if args.source_tiers else None
+        # 订阅源的 time_window_hours 以报告结束时刻为终点，回补历史日期时同样适用
+        as_of = min(time.time(), (end_date + timedelta(days=1)).timestamp())
+        registry = SourceRegistry(
+            pool,
+            sources_config,
+            cache_dir=None if args.no_cache else cache_dir,
+            tiers=tiers,
+            as_of=as_of,
+            metrics=metrics,
+            health=health,
+        )
+
+    try:
+        result = render_report(
+            start_date,
+            end_date,
+            root,
+            top90_file,
+            out_path,
+            pool=pool,
+            store=store,
+            search=search,
+            weights=weights,
+            history=history,
+            partials=partials,
+            source_timeout=args.source_timeout,
+            github=github,
+            github_max_results=args.github_max_results,
+            registry=registry,
+            classifier=classifier,
+            keyword_capacity=args.keyword_capacity,
+            metrics=metrics,
+            health=health,
+            hn_list=hn_source if hn_source in HN_LISTS else "topstories",
+            hn_max_scan=args.hn_max_scan,
+            hn_target=args.hn_top,
+            hn_patience=args.hn_patience,
+        )
+        # 超时的源线程可能还在用共享的 session、条目缓存和去重历史，它们结束之前不清理也不关闭，进程退出时一并释放
+        if wait_stragglers():
+            if store:
+                store.prune(keep_after_ts=int(start_date.timestamp()))
+            if partials:
+                partials.drop_before(start_date.date())
+    finally:
+        if wait_stragglers():
+            pool.close()
+            if store:
+                store.close()
+            if history:
+                history.close()
+            if scratch:
+                scratch.cleanup()
+        else:
+            print("[info] timed-out sources are still running; shared session and caches are released at exit", file=sys.stderr)
+    source_outcomes = result.pop("source_outcomes")
+    if scratch:
+        print("[info] fixture run: cache.json not updated", file=sys.stderr)
+    else:
+        update_last_run(
+            cache_file,
+            {
+                "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+                "timestamp": utc_timestamp(),
+                "duration_ms": int((time.monotonic() - run_started) * 1000),
+                "items_fetched": result["items_fetched"],
+                "items_included": result["total"],
+                "sources_success": result["sources_success"],
+                "sources_failed": result["sources_failed"],
+                "errors": result["errors"],
+                "stages_ms": result["stages_ms"],
+                "source_metrics": result["source_metrics"],
+            },
+            source_outcomes=source_outcomes,
+        )
+    if args.trace:
+        result["trace"] = str(metrics.write_trace(Path(args.trace)))
     print(json.dumps(result, ensure_ascii=False, indent=2))
 
 
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterator, Optional
+
+import requests
+
+GITHUB_API = "https://api.github.com"
+GITHUB_API_VERSION = "2022-11-28"
+# Search API 单页最多 100 条，单个查询最多翻到第 1000 条
+MAX_PER_PAGE = 100
+DEFAULT_MAX_RESULTS = 100
+GITHUB_TIMEOUT = 10.0
+
+
+class GitHubAPIError(RuntimeError):
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(f"GitHub API {status_code}: {message}")
+        self.status_code = status_code
+
+
+class ResponseCache:
+    # 按完整请求 URL 保存 ETag、响应体和下一页链接；命中 304 时直接复用，304 不计入 GitHub 限流额度
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[dict]:
+        try:
+            return json.loads(self.path(url).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, url: str, etag: str, body: dict, next_url: Optional[str]) -> None:
+        path = self.path(url)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        entry = {"url": url, "etag": etag, "next": next_url, "body": body}
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+class GitHubSearchClient:
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        base_url: str = GITHUB_API,
+        token: Optional[str] = None,
+        cache_dir: Optional[Path] = None,
+        timeout: float = GITHUB_TIMEOUT,
+    ) -> None:
+        self.session = session or requests.Session()
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        # 与 HN 共用连接池 session，认证头按请求附加，不写进 session
+        self.headers = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": GITHUB_API_VERSION}
+        token = token or os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+        self.requests = 0
+        self.not_modified = 0
+
+    def get_json(self, url: str, params: Optional[dict] = None) -> tuple[dict, Optional[str]]:
+        url = requests.Request("GET", url, params=params).prepare().url
+        cached = self.cache.get(url) if self.cache else None
+        headers = dict(self.headers)
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+
+        resp = self.session.get(url, headers=headers, timeout=self.timeout)
+        self.requests += 1
+        if resp.status_code == 304 and cached:
+            self.not_modified += 1
+            return cached["body"], cached.get("next")
+        if resp.status_code != 200:
+            try:
+                message = resp.json().get("message", resp.reason)
+            except ValueError:
+                message = resp.reason
+            raise GitHubAPIError(resp.status_code, message)
+
+        body = resp.json()
+        next_url = resp.links.get("next", {}).get("url")
+        etag = resp.headers.get("ETag")
+        if self.cache and etag:
+            self.cache.put(url, etag, body, next_url)
+        return body, next_url
+
+    def iter_repositories(
+        self, query: str, sort: str = "stars", order: str = "desc", max_results: int = DEFAULT_MAX_RESULTS
+    ) -> Iterator[dict]:
+        # 沿 Link: rel="next" 逐页产出，取够 max_results 即停止，不多翻页
+        params = {"q": query, "sort": sort, "order": order, "per_page": min(MAX_PER_PAGE, max(1, max_results))}
+        url: Optional[str] = f"{self.base_url}/search/repositories"
+        count = 0
+        while url and count < max_results:
+            body, url = self.get_json(url, params)
+            params = None
+            items = body.get("items", [])
+            if not items:
+                return
+            for repo in items:
+                yield repo
+                count += 1
+                if count >= max_results:
+                    return
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+# 与 _shared/cache-schema.json 中 url_cache.ttl_days 的默认值一致
+DEFAULT_TTL_DAYS = 7
+# 发布超过 48h 的帖子分数/评论数基本稳定，直接读本地副本
+DEFAULT_FREEZE_HOURS = 48
+# 年轻帖子在本地副本过期前不重复抓取
+DEFAULT_REFRESH_MINUTES = 60
+
+ITEM_FIELDS = ("id", "type", "title", "url", "time", "score", "descendants")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hn_items (
+    id INTEGER PRIMARY KEY,
+    type TEXT,
+    title TEXT,
+    url TEXT,
+    time INTEGER NOT NULL DEFAULT 0,
+    score INTEGER NOT NULL DEFAULT 0,
+    descendants INTEGER NOT NULL DEFAULT 0,
+    fetched_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_hn_items_time ON hn_items(time);
+"""
+
+
+class HNItemStore:
+    def __init__(
+        self,
+        path: Path,
+        ttl_days: int = DEFAULT_TTL_DAYS,
+        freeze_hours: float = DEFAULT_FREEZE_HOURS,
+        refresh_minutes: float = DEFAULT_REFRESH_MINUTES,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_days = ttl_days
+        self.freeze_seconds = int(freeze_hours * 3600)
+        self.refresh_seconds = int(refresh_minutes * 60)
+        # 抓取在工作线程中进行，但同一时刻只有一个线程使用该连接
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def get_many(self, ids: Iterable[int]) -> dict[int, dict]:
+        ids = [int(i) for i in ids]
+        found: dict[int, dict] = {}
+        # SQLite 默认最多 999 个绑定参数
+        for start in range(0, len(ids), 900):
+            chunk = ids[start : start + 900]
+            marks = ",".join("?" * len(chunk))
+            for row in self.conn.execute(f"SELECT * FROM hn_items WHERE id IN ({marks})", chunk):
+                found[row["id"]] = dict(row)
+        return found
+
+    def needs_refresh(self, row: dict, now: Optional[int] = None) -> bool:
+        now = int(now or time.time())
+        posted = int(row.get("time") or 0)
+        fetched_at = int(row["fetched_at"])
+        stale = now - fetched_at >= self.refresh_seconds
+        if now - posted >= self.freeze_seconds:
+            # 已冻结的帖子只需在越过冻结线后补抓一次，拿到稳定的分数
+            return stale and fetched_at - posted < self.freeze_seconds
+        return stale
+
+    def put_many(self, items: Iterable[dict], now: Optional[int] = None) -> None:
+        now = int(now or time.time())
+        rows = [
+            (
+                int(item["id"]),
+                item.get("type"),
+                item.get("title"),
+                item.get("url"),
+                int(item.get("time") or 0),
+                int(item.get("score") or 0),
+                int(item.get("descendants") or 0),
+                now,
+            )
+            for item in items
+            if item and item.get("id") is not None
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO hn_items (id, type, title, url, time, score, descendants, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def prune(self, keep_after_ts: Optional[int] = None, now: Optional[int] = None) -> int:
+        now = int(now or time.time())
+        cutoff = now - self.ttl_days * 86400
+        if keep_after_ts is not None:
+            cutoff = min(cutoff, int(keep_after_ts))
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM hn_items WHERE time < ?", (cutoff,))
+        return cur.rowcount
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def to_hn_item(row: dict) -> dict:
+    return {k: row.get(k) for k in ITEM_FIELDS}
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+import math
+from bisect import bisect_right, insort
+from typing import Callable, Iterable, Optional
+
+from topk import TopK
+
+# Firebase API 的榜单：topstories 为首页排序，beststories 为近期高分，newstories 按 id 倒序（即最新提交在前）
+HN_LISTS = ("topstories", "beststories", "newstories")
+DEFAULT_MAX_SCAN = 120
+DEFAULT_TARGET = 15
+# 榜单已满后，连续这么多条新抓到的条目都挤不进前 target 名就停止扫描。这是启发式，可能改变入选条目，
+# 默认 0 关闭，只做严格的上界剪枝
+DEFAULT_PATIENCE = 0
+MAX_STARS = 5
+
+
+class ScanRanker:
+    # 扫描 HN 榜单时边抓边排：score(items) 负责建记录、历史去重和评分（不在窗口内的条目返回空），
+    # 前 target 名按 key 保存在有界堆里，据此判断还没发出的请求是否还有必要。
+    # 停止条件：堆已满，且 (a) 剩余 id 的乐观上界都进不了前 target 名，或 (b) 连续 patience 条没有改变排名。
+    # (a) 是严格的：HN id 随提交时间递增，一个未抓取 id 的发布时间不晚于已抓到的、比它大的最小 id，
+    # 于是时效分有上界，相关性和质量按满分估计；(b) 是启发式的，可用 patience=0 关闭
+    def __init__(
+        self,
+        target: int,
+        key: Callable[[dict], tuple],
+        score: Callable[[list[dict]], list[dict]],
+        start_ts: int,
+        end_ts: int,
+        dimensions: dict,
+        patience: int = DEFAULT_PATIENCE,
+    ) -> None:
+        self.top = TopK(target, key)
+        self.score = score
+        self.start_ts = start_ts
+        self.end_ts = end_ts
+        self.window = max(1, end_ts - start_ts)
+        self.dimensions = dimensions
+        self.patience = patience
+        self.stale = 0
+        self.scanned = 0
+        self.matched = 0
+        # can_stop 返回过 True，即有 id 因剪枝没有请求
+        self.stopped = False
+        # 已抓到条目的 (id, time)，按 id 排序
+        self.seen: list[tuple[int, int]] = []
+
+    def add(self, item: Optional[dict]) -> None:
+        if not item:
+            return
+        self.scanned += 1
+        if item.get("id") is not None and item.get("time"):
+            insort(self.seen, (int(item["id"]), int(item["time"])))
+        entered = False
+        for record in self.score([item]):
+            self.matched += bool(record.get("in_top90"))
+            entered = self.top.push(record) or entered
+        if self.top.full:
+            self.stale = 0 if entered else self.stale + 1
+
+    def time_bound(self, sid: int) -> Optional[int]:
+        pos = bisect_right(self.seen, (sid, math.inf))
+        return self.seen[pos][1] if pos < len(self.seen) else None
+
+    def out_of_window(self, sid: int) -> bool:
+        bound = self.time_bound(sid)
+        return bound is not None and bound < self.start_ts
+
+    def optimistic_key(self, sid: int) -> tuple:
+        bound = self.time_bound(sid)
+        age_ratio = 0.0 if bound is None else min(1.0, max(0.0, (self.end_ts - bound) / self.window))
+        d = self.dimensions
+        weighted = 10.0 * d["relevance"] + 10.0 * d["quality"] + max(1.0, 10.0 - 7.0 * age_ratio) * d["timeliness"]
+        stars = min(MAX_STARS, math.floor(weighted / 2.0 + 0.5))
+        return (True, stars, weighted)
+
+    def can_stop(self, unseen_ids: Iterable[int]) -> bool:
+        floor = self.top.floor()
+        if floor is None:
+            return False
+        if self.patience and self.stale >= self.patience:
+            self.stopped = True
+        elif all(self.optimistic_key(sid) < floor[:3] for sid in unseen_ids):
+            self.stopped = True
+        return self.stopped
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+from typing import Callable, Iterator, Optional
+
+from fetch_pool import FetchPool
+
+ALGOLIA_API = "https://hn.algolia.com/api/v1"
+# Algolia 单次查询最多翻到第 1000 条，因此按时间游标分段而不是按页码翻页
+HITS_PER_PAGE = 1000
+DEFAULT_MIN_POINTS = 20
+
+# transport(url, params, timeout) -> 解析后的 JSON
+Transport = Callable[[str, dict, Optional[float]], dict]
+
+
+def session_transport(pool: FetchPool) -> Transport:
+    def get(url: str, params: dict, timeout: Optional[float] = None) -> dict:
+        resp = pool.session.get(url, params=params, timeout=timeout or pool.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    return get
+
+
+def hit_to_item(hit: dict) -> dict:
+    return {
+        "id": int(hit["objectID"]),
+        "type": "story",
+        "title": hit.get("title") or "(no title)",
+        "url": hit.get("url") or None,
+        "time": int(hit.get("created_at_i") or 0),
+        "score": int(hit.get("points") or 0),
+        "descendants": int(hit.get("num_comments") or 0),
+    }
+
+
+class HNSearchBackend:
+    def __init__(
+        self,
+        transport: Transport,
+        base_url: str = ALGOLIA_API,
+        min_points: int = DEFAULT_MIN_POINTS,
+        hits_per_page: int = HITS_PER_PAGE,
+        timeout: Optional[float] = 10,
+    ) -> None:
+        self.transport = transport
+        self.base_url = base_url.rstrip("/")
+        self.min_points = min_points
+        self.hits_per_page = hits_per_page
+        self.timeout = timeout
+
+    def iter_stories(self, start_ts: int, end_ts: int) -> Iterator[dict]:
+        # 从 end_ts 向前推进时间游标，每批取 created_at_i < upper 的最新一批
+        upper = end_ts + 1
+        seen: set[int] = set()
+        while upper > start_ts:
+            filters = [f"created_at_i>={start_ts}", f"created_at_i<{upper}"]
+            if self.min_points > 0:
+                filters.append(f"points>={self.min_points}")
+            params = {
+                "tags": "story",
+                "numericFilters": ",".join(filters),
+                "hitsPerPage": self.hits_per_page,
+            }
+            payload = self.transport(f"{self.base_url}/search_by_date", params, self.timeout)
+            hits = payload.get("hits", [])
+            if not hits:
+                return
+
+            oldest = upper
+            for hit in hits:
+                item = hit_to_item(hit)
+                oldest = min(oldest, item["time"])
+                if item["id"] in seen:
+                    continue
+                seen.add(item["id"])
+                yield item
+
+            if len(hits) < self.hits_per_page:
+                return
+            # 下一批包含 oldest 这一秒，以免漏掉同秒的剩余条目；seen 负责去重。
+            # 若游标没有前进（同一秒内超过一整批），则跳过这一秒保证终止。
+            next_upper = oldest + 1
+            upper = next_upper if next_upper < upper else oldest
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+import heapq
+import re
+from operator import itemgetter
+from typing import Iterable, Optional
+
+STOP_WORDS = frozenset(
+    {
+        "the",
+        "and",
+        "for",
+        "with",
+        "from",
+        "that",
+        "this",
+        "into",
+        "using",
+        "use",
+        "new",
+        "your",
+        "are",
+        "has",
+        "you",
+        "repo",
+        "github",
+        "hacker",
+        "news",
+        "com",
+        "www",
+        "http",
+        "https",
+        "tool",
+        "tools",
+        "project",
+        "projects",
+        "about",
+        "over",
+        "under",
+        "than",
+        "through",
+        "their",
+        "they",
+        "what",
+        "when",
+        "where",
+        "一个",
+        "我们",
+        "如何",
+        "什么",
+        "这个",
+        "可以",
+        "没有",
+        "以及",
+        "为什么",
+    }
+)
+
+# 中日韩文字没有空格分词：先按虚词切开，2-4 字的片段整体作为关键词，更长的片段退化为二字组
+CJK_BREAK_CHARS = "的了是在和与及等为对把被就都而也从到让用之其或のはがをにへでとや"
+# 假名、CJK 统一汉字（含扩展 A）、韩文音节
+_CJK = r"\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"
+_TOKEN_RE = re.compile(rf"[a-z][a-z0-9+\-]{{2,}}|[{_CJK}]{{2,}}")
+_CJK_BREAK_RE = re.compile(f"[{CJK_BREAK_CHARS}]")
+MAX_CJK_TERM = 4
+
+
+def _cjk_terms(run: str) -> Iterable[str]:
+    for segment in _CJK_BREAK_RE.split(run):
+        if len(segment) < 2:
+            continue
+        if len(segment) <= MAX_CJK_TERM:
+            yield segment
+        else:
+            yield from (segment[i : i + 2] for i in range(len(segment) - 1))
+
+
+def extract_keywords(text: str) -> list[str]:
+    keywords = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token.isascii():
+            if token not in STOP_WORDS:
+                keywords.append(token)
+        else:
+            keywords.extend(t for t in _cjk_terms(token) if t not in STOP_WORDS)
+    return keywords
+
+
+class KeywordCounter:
+    # capacity 为空时精确计数；设定后按 Misra-Gries 只保留约 capacity 个候选，内存有上界，
+    # 计数可能偏低，但出现次数超过 总数/(capacity+1) 的关键词一定会保留下来
+    def __init__(self, capacity: Optional[int] = None) -> None:
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        self.total = 0
+
+    def update(self, keywords: Iterable[str]) -> None:
+        counts = self.counts
+        for kw in keywords:
+            counts[kw] = counts.get(kw, 0) + 1
+            self.total += 1
+        if self.capacity and len(counts) > 2 * self.capacity:
+            self._prune()
+
+    def _prune(self) -> None:
+        # 攒到 2 倍容量再统一扣减，摊还到每个关键词是 O(1)
+        floor = heapq.nlargest(self.capacity + 1, self.counts.values())[-1]
+        self.counts = {kw: c - floor for kw, c in self.counts.items() if c > floor}
+
+    def most_common(self, n: int) -> list[tuple[str, int]]:
+        # 与 Counter.most_common 一致：次数相同按首次出现的顺序
+        return heapq.nlargest(n, self.counts.items(), key=itemgetter(1))
+
+    def __len__(self) -> int:
+        return len(self.counts)
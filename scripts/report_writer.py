@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+import os
+from pathlib import Path
+from typing import Iterable
+
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+
+class ReportWriter:
+    # 先写到同目录临时文件，成功后 os.replace 原子替换；异常时删除临时文件，最终文件名下不会出现半截报告
+    def __init__(self, out_path: Path, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        self.out_path = Path(out_path)
+        self.tmp_path = self.out_path.with_name(f".{self.out_path.name}.{os.getpid()}.tmp")
+        self.buffer_size = buffer_size
+        self._fh = None
+        self._first = True
+
+    def __enter__(self) -> "ReportWriter":
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.tmp_path, "w", encoding="utf-8", newline="\n", buffering=self.buffer_size)
+        return self
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        # 行之间以 \n 分隔、末尾不追加换行，与 "\n".join(lines) 的输出一致
+        fh = self._fh
+        for line in lines:
+            if self._first:
+                self._first = False
+            else:
+                fh.write("\n")
+            fh.write(line)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        fh, self._fh = self._fh, None
+        if exc_type is not None:
+            fh.close()
+            self.tmp_path.unlink(missing_ok=True)
+            return
+        try:
+            fh.flush()
+            os.fsync(fh.fileno())
+        finally:
+            fh.close()
+        os.replace(self.tmp_path, self.out_path)
+
+
+def write_report(out_path: Path, sections: Iterable[Iterable[str]], buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+    with ReportWriter(out_path, buffer_size) as writer:
+        for section in sections:
+            writer.write_lines(section)
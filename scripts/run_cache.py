@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+from pathlib import Path
+
+from config_loader import read_json
+from source_health import smooth
+
+# 格式见 _shared/cache-schema.json；与 daily-news-report skill 共用同一个 cache.json，只改写 last_run，其余字段原样保留
+CACHE_VERSION = "1.0"
+
+
+def load_cache(cache_path: Path) -> dict:
+    # 按 mtime 缓存解析结果，同一次运行多处读取只解析一次；返回值共享，需要改写时先复制
+    try:
+        return read_json(cache_path) or {}
+    except json.JSONDecodeError:
+        return {}
+
+
+def save_cache(cache_path: Path, cache: dict) -> None:
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(cache, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+
+
+def update_source_stats(cache: dict, outcomes: dict[str, dict], timestamp: str) -> dict:
+    # outcomes: {source: {"ok": bool, "items": 抓取条数, "quality": 入选条目平均分 1-5 或 None,
+    #                     "requests": 请求数, "errors": 失败请求数, "p95_ms": 请求延迟 p95}}
+    stats = cache.setdefault("source_stats", {})
+    for name, outcome in outcomes.items():
+        s = stats.setdefault(name, {})
+        s["total_runs"] = s.get("total_runs", 0) + 1
+        if outcome["ok"]:
+            s["success_count"] = s.get("success_count", 0) + 1
+            s["consecutive_failures"] = 0
+            s["last_success"] = timestamp
+            # 平均值只统计成功的运行，按增量方式更新
+            n = s["success_count"]
+            s["avg_items"] = round(s.get("avg_items", 0.0) + (outcome["items"] - s.get("avg_items", 0.0)) / n, 2)
+            if outcome.get("quality") is not None:
+                avg = s.get("avg_quality", outcome["quality"])
+                s["avg_quality"] = round(avg + (outcome["quality"] - avg) / n, 2)
+        else:
+            s.setdefault("success_count", 0)
+            s["consecutive_failures"] = s.get("consecutive_failures", 0) + 1
+            s["last_failure"] = timestamp
+        # 请求级延迟与错误率按滑动平均更新，供下次运行调整超时和熔断（见 source_health.py）
+        if outcome.get("requests"):
+            s["p95_ms"] = round(smooth(s.get("p95_ms"), outcome["p95_ms"]), 1)
+            s["error_rate"] = round(smooth(s.get("error_rate"), outcome["errors"] / outcome["requests"]), 3)
+        s["success_rate"] = round(s["success_count"] / s["total_runs"], 3)
+    return stats
+
+
+def update_last_run(cache_path: Path, last_run: dict, source_outcomes: dict[str, dict] | None = None) -> dict:
+    cache = copy.deepcopy(load_cache(cache_path))
+    cache.setdefault("version", CACHE_VERSION)
+    cache["last_run"] = last_run
+    if source_outcomes:
+        update_source_stats(cache, source_outcomes, last_run["timestamp"])
+    save_cache(cache_path, cache)
+    return cache
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+import re
+from typing import Optional
+
+import numpy as np
+
+# 三维评分规范见 _shared/dedup-scoring.md 第二节
+DIMENSION_WEIGHTS = {"relevance": 0.4, "quality": 0.35, "timeliness": 0.25}
+
+DEFAULT_ENGAGEMENT_WEIGHTS = {
+    "hn_points": 0.01,
+    "hn_comments": 0.02,
+    "x_likes": 0.005,
+    "x_retweets": 0.01,
+}
+
+SOURCE_IDS = {
+    "HackerNews": "hn",
+    "GitHub": "github",
+}
+
+# 相关性基础分：AI/前沿核心 7-10，一般技术 4-6，无关 1-3
+CATEGORY_RELEVANCE = {
+    "🤖 AI / ML": 8.0,
+    "⚙️ 工程": 6.0,
+    "🛠 工具 / 开源": 6.0,
+    "🔒 安全": 6.0,
+    "💡 观点 / 杂谈": 5.0,
+    "📝 其他": 3.0,
+}
+
+# 热度参考阈值（低分上限, 高分下限），见 2.3 来源参考指标
+ENGAGEMENT_THRESHOLDS = {
+    "hn": (50.0, 300.0),
+    "github": (1000.0, 10000.0),
+    "hf_papers": (10.0, 50.0),
+    "x_list": (500.0, 5000.0),
+}
+
+KEYWORD_BONUSES = [
+    (1.5, ["breakthrough", "sota", "state-of-the-art"]),
+    (1.0, ["release", "released", "launch", "launches", "announce", "announces", "announcing"]),
+    (1.0, ["open source", "open-source", "oss"]),
+    (0.5, ["paper", "research", "study"]),
+]
+
+_KEYWORD_PATTERNS = [
+    (bonus, re.compile(r"(?<![a-z0-9])(?:" + "|".join(re.escape(w) for w in words) + r")(?![a-z0-9])"))
+    for bonus, words in KEYWORD_BONUSES
+]
+
+
+class ScoringWeights:
+    def __init__(
+        self,
+        dimensions: Optional[dict] = None,
+        source_weights: Optional[dict] = None,
+        engagement_weights: Optional[dict] = None,
+    ) -> None:
+        self.dimensions = {**DIMENSION_WEIGHTS, **(dimensions or {})}
+        self.source_weights = dict(source_weights or {})
+        self.engagement_weights = {**DEFAULT_ENGAGEMENT_WEIGHTS, **(engagement_weights or {})}
+
+    @classmethod
+    def from_sources_config(cls, config: dict) -> "ScoringWeights":
+        dims = config.get("scoring", {}).get("dimensions", {})
+        quality = config.get("quality_weights", {})
+        return cls(
+            dimensions={k: float(v["weight"]) for k, v in dims.items() if isinstance(v, dict) and "weight" in v},
+            source_weights=quality.get("source_weights"),
+            engagement_weights=quality.get("engagement_weights"),
+        )
+
+
+def keyword_bonus(text: str) -> float:
+    t = text.lower()
+    return sum(bonus for bonus, pattern in _KEYWORD_PATTERNS if pattern.search(t))
+
+
+def keyword_bonus_batch(texts: list[str]) -> np.ndarray:
+    # 拼成一个大字符串，每档关键词只跑一遍正则，再用偏移量把命中映射回条目
+    lengths = np.fromiter((len(t) + 1 for t in texts), dtype=np.int64, count=len(texts))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    blob = "\n".join(texts).lower()
+    bonus = np.zeros(len(texts))
+    for value, pattern in _KEYWORD_PATTERNS:
+        positions = np.fromiter((m.start() for m in pattern.finditer(blob)), dtype=np.int64)
+        if positions.size == 0:
+            continue
+        hit = np.zeros(len(texts), dtype=bool)
+        hit[np.searchsorted(starts, positions, side="right") - 1] = True
+        bonus += value * hit
+    return bonus
+
+
+def _engagement_quality(source_ids: np.ndarray, metric: np.ndarray) -> np.ndarray:
+    # 对数插值：低于低阈值映射到 1-3，阈值之间 4-6，高阈值以上 7-10（10 倍高阈值封顶）
+    low = np.full(metric.shape, np.nan)
+    high = np.full(metric.shape, np.nan)
+    for sid, (lo, hi) in ENGAGEMENT_THRESHOLDS.items():
+        mask = source_ids == sid
+        low[mask] = lo
+        high[mask] = hi
+
+    has_scale = ~np.isnan(low)
+    lo = np.where(has_scale, low, 1.0)
+    hi = np.where(has_scale, high, 10.0)
+    m = np.maximum(metric, 0.0)
+    log_m = np.log10(m + 1.0)
+    log_lo = np.log10(lo + 1.0)
+    log_hi = np.log10(hi + 1.0)
+
+    q = np.select(
+        [m < lo, m < hi],
+        [
+            1.0 + 2.0 * log_m / log_lo,
+            4.0 + 2.0 * (log_m - log_lo) / (log_hi - log_lo),
+        ],
+        default=7.0 + 3.0 * np.clip(log_m - log_hi, 0.0, 1.0),
+    )
+    # 无热度指标的源按内容中位质量处理
+    return np.where(has_scale, q, 5.0)
+
+
+def score_batch(items: list[dict], ref_ts: int, window_seconds: int, weights: Optional[ScoringWeights] = None) -> list[dict]:
+    # 原地写入 relevance / quality / timeliness / weighted / score_norm / final_star 并返回 items
+    if not items:
+        return items
+    weights = weights or ScoringWeights()
+    ew = weights.engagement_weights
+
+    source_ids = np.array([SOURCE_IDS.get(x.get("source", ""), x.get("source", "")) for x in items])
+    metric = np.array([float(x.get("score", x.get("stars", 0)) or 0) for x in items])
+    comments = np.array([float(x.get("comments", 0) or 0) for x in items])
+    ts = np.array([float(x.get("time", ref_ts) or ref_ts) for x in items])
+    blog_rank = np.array([float(x.get("top90_rank") or 0) for x in items])
+    base_rel = np.array([CATEGORY_RELEVANCE.get(x.get("category", ""), 5.0) for x in items])
+    kw_bonus = keyword_bonus_batch([f"{x.get('title', '')} {x.get('description', '')}" for x in items])
+    src_weight = np.array([float(weights.source_weights.get(s, 1.0)) for s in source_ids])
+
+    is_hn = source_ids == "hn"
+
+    relevance = base_rel + kw_bonus + np.where(is_hn & (metric > 300), 1.0, 0.0)
+
+    quality = _engagement_quality(source_ids, metric)
+    engagement = np.where(is_hn, np.minimum(1.0, metric * ew["hn_points"] + comments * ew["hn_comments"]), 0.0)
+    blog_bonus = np.select([blog_rank >= 6, blog_rank >= 1], [0.5, 1.0], default=0.0)
+    quality = (quality + engagement + blog_bonus) * src_weight
+
+    age_ratio = np.clip((ref_ts - ts) / max(1, window_seconds), 0.0, 1.0)
+    timeliness = 10.0 - 7.0 * age_ratio
+
+    relevance = np.clip(relevance, 1.0, 10.0)
+    quality = np.clip(quality, 1.0, 10.0)
+    timeliness = np.clip(timeliness, 1.0, 10.0)
+
+    d = weights.dimensions
+    weighted = relevance * d["relevance"] + quality * d["quality"] + timeliness * d["timeliness"]
+    score_norm = np.clip(weighted / 2.0, 1.0, 5.0)
+    final_star = np.clip(np.floor(score_norm + 0.5), 1, 5).astype(int)
+
+    columns = zip(
+        np.floor(relevance + 0.5).astype(int).tolist(),
+        np.floor(quality + 0.5).astype(int).tolist(),
+        np.floor(timeliness + 0.5).astype(int).tolist(),
+        weighted.tolist(),
+        score_norm.tolist(),
+        final_star.tolist(),
+    )
+    for x, (r, q, t, w, norm, star) in zip(items, columns):
+        x["relevance"] = r
+        x["quality"] = q
+        x["timeliness"] = t
+        x["weighted"] = w
+        x["score_norm"] = norm
+        x["final_star"] = star
+    return items
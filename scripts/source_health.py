@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, timezone
+from typing import Optional
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN_HOURS = 6.0
+# 熔断后冷却时间按连续失败次数翻倍，最长一周
+MAX_COOLDOWN_HOURS = 168.0
+DEFAULT_TIMEOUT_MULTIPLIER = 3.0
+DEFAULT_MIN_TIMEOUT_MS = 1000
+# p95 / 错误率在 source_stats 中按指数滑动平均更新，新一次运行占的权重
+SMOOTHING = 0.3
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+def smooth(previous: Optional[float], value: float, alpha: float = SMOOTHING) -> float:
+    return value if previous is None else previous + alpha * (value - previous)
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+class SourceHealth:
+    # 根据 cache.json 的 source_stats 决定本次运行每个源怎么抓：
+    # 连续失败达到阈值且仍在冷却期内的源直接跳过（熔断），冷却期过后放行一次试探；
+    # 单次请求超时取历史 p95 的若干倍，落在 [min_timeout, 配置的超时] 之间；p95 也作为对冲请求的发出时机
+    def __init__(
+        self,
+        source_stats: Optional[dict] = None,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown_hours: float = DEFAULT_COOLDOWN_HOURS,
+        timeout_multiplier: float = DEFAULT_TIMEOUT_MULTIPLIER,
+        min_timeout_ms: float = DEFAULT_MIN_TIMEOUT_MS,
+        hedge: bool = True,
+        now: Optional[datetime] = None,
+    ) -> None:
+        self.stats = source_stats or {}
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_hours = float(cooldown_hours)
+        self.timeout_multiplier = float(timeout_multiplier)
+        self.min_timeout = float(min_timeout_ms) / 1000
+        self.hedge = hedge
+        self.now = now or datetime.now(timezone.utc)
+
+    @classmethod
+    def from_sources_config(cls, config: dict, source_stats: Optional[dict] = None) -> "SourceHealth":
+        c = config.get("fetch_config", {}).get("source_health", {})
+        return cls(
+            source_stats,
+            failure_threshold=c.get("failure_threshold", DEFAULT_FAILURE_THRESHOLD),
+            cooldown_hours=c.get("cooldown_hours", DEFAULT_COOLDOWN_HOURS),
+            timeout_multiplier=c.get("timeout_p95_multiplier", DEFAULT_TIMEOUT_MULTIPLIER),
+            min_timeout_ms=c.get("min_timeout_ms", DEFAULT_MIN_TIMEOUT_MS),
+            hedge=c.get("hedge", True),
+        )
+
+    def cooldown_until(self, name: str) -> Optional[datetime]:
+        s = self.stats.get(name, {})
+        failures = int(s.get("consecutive_failures", 0))
+        last_failure = parse_timestamp(s.get("last_failure"))
+        if failures < self.failure_threshold or last_failure is None:
+            return None
+        hours = min(MAX_COOLDOWN_HOURS, self.cooldown_hours * 2 ** (failures - self.failure_threshold))
+        return datetime.fromtimestamp(last_failure.timestamp() + hours * 3600, timezone.utc)
+
+    def check(self, name: str) -> None:
+        until = self.cooldown_until(name)
+        if until and self.now < until:
+            failures = self.stats[name]["consecutive_failures"]
+            raise CircuitOpen(f"circuit open after {failures} consecutive failures, retry after {until:%Y-%m-%dT%H:%M:%SZ}")
+
+    def is_open(self, name: str) -> bool:
+        try:
+            self.check(name)
+        except CircuitOpen:
+            return True
+        return False
+
+    def timeout(self, name: str, default: float) -> float:
+        p95_ms = self.stats.get(name, {}).get("p95_ms")
+        if not p95_ms:
+            return default
+        return max(self.min_timeout, min(default, p95_ms / 1000 * self.timeout_multiplier))
+
+    def hedge_after(self, name: str) -> Optional[float]:
+        # 超过历史 p95 仍未返回的请求再发一份，先返回的为准
+        p95_ms = self.stats.get(name, {}).get("p95_ms")
+        return p95_ms / 1000 if self.hedge and p95_ms else None
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Optional
+
+import requests
+
+from feeds import FeedCache, discover_feed_url, iter_feed
+from fetch_orchestrator import SourceResult
+from fetch_pool import FetchPool
+from run_metrics import RunMetrics, in_source
+from source_health import CircuitOpen, SourceHealth
+
+DEFAULT_TIER_CONCURRENCY = 4
+DEFAULT_TIMEOUT_MS = 15000
+DEFAULT_EXTRACT_LIMIT = 5
+# 这些源在报告里已有专门的 API 抓取流程（HN Firebase/Algolia、GitHub Search），不再按网页重复抓取
+NATIVE_SOURCE_IDS = {"hn", "github"}
+SKIPPED_TIERS = {"disabled"}
+
+# fetch_method -> 抓取器类，由 @register 填充
+FETCHERS: dict[str, type] = {}
+
+
+class UnsupportedSource(Exception):
+    pass
+
+
+def register(method: str) -> Callable[[type], type]:
+    def wrap(cls: type) -> type:
+        cls.method = method
+        FETCHERS[method] = cls
+        return cls
+
+    return wrap
+
+
+def extract_limit(extract: str) -> int:
+    # sources.json 的 extract 约定：top_15 / latest_3 / latest_issue …
+    if extract == "latest_issue":
+        return 1
+    match = re.search(r"(\d+)$", extract or "")
+    return int(match.group(1)) if match else DEFAULT_EXTRACT_LIMIT
+
+
+class FeedLocator:
+    # 记住首页 -> 订阅地址的发现结果，之后的运行不再请求首页
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path else None
+        self.urls: dict[str, str] = {}
+        self.dirty = False
+        if self.path and self.path.exists():
+            try:
+                self.urls = json.loads(self.path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                self.urls = {}
+
+    def get(self, page_url: str) -> Optional[str]:
+        return self.urls.get(page_url)
+
+    def set(self, page_url: str, feed_url: str) -> None:
+        self.urls[page_url] = feed_url
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self.urls, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+class SourceFetcher:
+    method = ""
+
+    def __init__(
+        self,
+        pool: FetchPool,
+        tier_config: dict,
+        fetch_config: dict,
+        locator: FeedLocator,
+        feed_cache: Optional[FeedCache] = None,
+        as_of: Optional[float] = None,
+        health: Optional[SourceHealth] = None,
+    ) -> None:
+        self.pool = pool
+        self.health = health
+        self.tier_config = tier_config
+        self.locator = locator
+        self.feed_cache = feed_cache
+        method_config = fetch_config.get(self.method, {})
+        rss_config = tier_config.get("rss_config", {})
+        timeout_ms = rss_config.get("timeout_ms") or method_config.get("timeout_ms") or DEFAULT_TIMEOUT_MS
+        self.timeout = float(timeout_ms) / 1000
+        # rss_config.time_window_hours：只保留这段时间内发布的文章，以 as_of（默认当前时间）为终点
+        window_hours = rss_config.get("time_window_hours")
+        self.not_before = self.not_after = None
+        if window_hours:
+            self.not_after = int(as_of if as_of is not None else time.time())
+            self.not_before = self.not_after - int(float(window_hours) * 3600)
+
+    def request_timeout(self, source: dict) -> float:
+        # 配置的超时是上限，历史 p95 较低的源用更短的超时，挂掉的源不会拖满整个时限
+        return self.health.timeout(source_id(source), self.timeout) if self.health else self.timeout
+
+    def get(self, url: str, timeout: Optional[float] = None) -> requests.Response:
+        resp = self.pool.session.get(url, timeout=timeout or self.timeout)
+        resp.raise_for_status()
+        return resp
+
+    def fetch(self, source: dict) -> list[dict]:
+        raise NotImplementedError
+
+
+class FeedFetcher(SourceFetcher):
+    def limit(self, source: dict) -> int:
+        return DEFAULT_EXTRACT_LIMIT
+
+    def feed_url(self, source: dict) -> str:
+        if source.get("rss_url"):
+            return source["rss_url"]
+        page_url = source.get("url") or source.get("homepage")
+        if not page_url:
+            raise ValueError("source has neither rss_url nor url/homepage")
+        cached = self.locator.get(page_url)
+        if cached:
+            return cached
+        resp = self.get(page_url, self.request_timeout(source))
+        if "xml" in resp.headers.get("Content-Type", ""):
+            feed_url = resp.url
+        else:
+            feed_url = discover_feed_url(resp.text, resp.url)
+        if not feed_url:
+            raise ValueError(f"no RSS/Atom feed advertised at {page_url}")
+        self.locator.set(page_url, feed_url)
+        return feed_url
+
+    def in_window(self, entry: dict) -> bool:
+        # 没有发布时间的条目无法判断，保留下来交给报告窗口处理
+        if self.not_before is None or entry["time"] is None:
+            return True
+        return self.not_before <= entry["time"] <= self.not_after
+
+    def fetch(self, source: dict) -> list[dict]:
+        url = self.feed_url(source)
+        limit = self.limit(source)
+        cached = self.feed_cache.get(url) if self.feed_cache else None
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        with self.pool.session.get(url, headers=headers, timeout=self.request_timeout(source), stream=True) as resp:
+            if resp.status_code == 304 and cached:
+                entries = cached["entries"]
+            else:
+                resp.raise_for_status()
+                resp.raw.decode_content = True
+                # 订阅源通常按时间倒序，取够 limit 条窗口内的文章就停止读取
+                entries = list(islice(filter(self.in_window, iter_feed(resp.raw)), limit))
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
+                if self.feed_cache and (etag or last_modified):
+                    self.feed_cache.put(url, etag, last_modified, entries)
+        return [e for e in entries if self.in_window(e)][:limit]
+
+
+@register("rss_batch")
+class RSSBatchFetcher(FeedFetcher):
+    def limit(self, source: dict) -> int:
+        return int(self.tier_config.get("rss_config", {}).get("max_articles_per_feed", 3))
+
+
+@register("webfetch")
+class WebFetchFetcher(FeedFetcher):
+    # 网页没有通用的文章列表结构，机器抓取时改走页面声明的订阅源；没有订阅源的页面记为失败，交给 skill 的 WebFetch 处理
+    def limit(self, source: dict) -> int:
+        return extract_limit(source.get("extract", ""))
+
+
+@register("browser")
+class BrowserFetcher(SourceFetcher):
+    def fetch(self, source: dict) -> list[dict]:
+        raise UnsupportedSource("requires a headless browser")
+
+
+def source_id(source: dict) -> str:
+    return source.get("id") or source.get("name", "")
+
+
+def scheduled_sources(sources_config: dict, tiers: Optional[set[str]] = None) -> list[tuple[str, str, dict]]:
+    # 按 sources.json 中 tier -> batch 的书写顺序展开为 (tier, batch, source)；tiers 为空表示全部
+    plan = []
+    for tier, tier_config in sources_config.get("sources", {}).items():
+        if tier in SKIPPED_TIERS or not isinstance(tier_config, dict):
+            continue
+        if tiers and tier not in tiers:
+            continue
+        for batch, entries in tier_config.items():
+            if not isinstance(entries, list):
+                continue
+            for entry in entries:
+                if not isinstance(entry, dict) or not entry.get("enabled", True):
+                    continue
+                if entry.get("id") in NATIVE_SOURCE_IDS:
+                    continue
+                method = entry.get("fetch_method") or tier_config.get("fetch_method")
+                if method:
+                    plan.append((tier, batch, {**entry, "fetch_method": method}))
+    return plan
+
+
+class SourceRegistry:
+    def __init__(
+        self,
+        pool: FetchPool,
+        sources_config: dict,
+        cache_dir: Optional[Path] = None,
+        tiers: Optional[set[str]] = None,
+        as_of: Optional[float] = None,
+        metrics: Optional[RunMetrics] = None,
+        health: Optional[SourceHealth] = None,
+    ) -> None:
+        self.pool = pool
+        self.metrics = metrics
+        self.health = health
+        self.sources_config = sources_config
+        self.fetch_config = sources_config.get("fetch_config", {})
+        self.plan = scheduled_sources(sources_config, tiers)
+        self.locator = FeedLocator(Path(cache_dir) / "feed-urls.json" if cache_dir else None)
+        self.feed_cache = FeedCache(Path(cache_dir) / "feeds") if cache_dir else None
+        self.as_of = as_of
+
+    def tier_concurrency(self, tier: str) -> int:
+        tier_config = self.sources_config["sources"][tier]
+        value = tier_config.get("rss_config", {}).get("concurrency") or tier_config.get("concurrency")
+        if not value:
+            method = tier_config.get("fetch_method", "")
+            value = self.fetch_config.get(method, {}).get("concurrency", DEFAULT_TIER_CONCURRENCY)
+        return max(1, int(value))
+
+    def run(self) -> tuple[list[dict], dict[str, SourceResult]]:
+        # 各 tier 同时开跑、各用自己的并发上限；tier 内按 batch 顺序提交
+        spans: dict[int, tuple[float, float]] = {}
+
+        def timed(idx: int, fn: Callable, *args) -> list[dict]:
+            start = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                spans[idx] = (start, time.perf_counter())
+
+        executors: dict[str, ThreadPoolExecutor] = {}
+        fetchers: dict[tuple[str, str], SourceFetcher] = {}
+        futures = {}
+        try:
+            for tier, batch, source in self.plan:
+                if tier not in executors:
+                    executors[tier] = ThreadPoolExecutor(max_workers=self.tier_concurrency(tier))
+                method = source["fetch_method"]
+                fetcher_cls = FETCHERS.get(method)
+                if self.health and self.health.is_open(source_id(source)):
+                    futures[executors[tier].submit(timed, len(futures), self.health.check, source_id(source))] = len(futures)
+                    continue
+                if fetcher_cls is None:
+                    futures[executors[tier].submit(timed, len(futures), self._unsupported, method)] = len(futures)
+                    continue
+                key = (tier, method)
+                if key not in fetchers:
+                    fetchers[key] = fetcher_cls(
+                        self.pool,
+                        self.sources_config["sources"][tier],
+                        self.fetch_config,
+                        self.locator,
+                        self.feed_cache,
+                        self.as_of,
+                        self.health,
+                    )
+                task = in_source(source_id(source), timed, len(futures), fetchers[key].fetch, source)
+                futures[executors[tier].submit(task)] = len(futures)
+
+            fetched: dict[int, list[dict]] = {}
+            results: dict[str, SourceResult] = {}
+            for fut in as_completed(futures):
+                idx = futures[fut]
+                tier, batch, source = self.plan[idx]
+                sid = source_id(source)
+                start, ended = spans[idx]
+                elapsed = int((ended - start) * 1000)
+                try:
+                    entries = fut.result()
+                except (UnsupportedSource, CircuitOpen) as e:
+                    results[sid] = SourceResult(sid, error=str(e), duration_ms=elapsed, skipped=True)
+                    continue
+                except Exception as e:
+                    results[sid] = SourceResult(sid, error=f"{type(e).__name__}: {e}", duration_ms=elapsed)
+                    continue
+                finally:
+                    if self.metrics:
+                        self.metrics.span(sid, start, ended, cat="source", tier=tier, batch=batch)
+                results[sid] = SourceResult(sid, value=len(entries), duration_ms=elapsed)
+                fetched[idx] = entries
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=False, cancel_futures=True)
+            self.locator.save()
+
+        # 按计划顺序拼装，结果与完成先后无关；rss_config.total_max_articles 限制单个 tier 的总条数
+        items = []
+        per_tier: dict[str, int] = {}
+        for idx, (tier, batch, source) in enumerate(self.plan):
+            cap = self.sources_config["sources"][tier].get("rss_config", {}).get("total_max_articles")
+            for entry in fetched.get(idx, []):
+                if cap and per_tier.get(tier, 0) >= int(cap):
+                    break
+                per_tier[tier] = per_tier.get(tier, 0) + 1
+                items.append(
+                    {
+                        **entry,
+                        "source": source_id(source),
+                        "source_name": source.get("name") or source_id(source),
+                        "tier": tier,
+                        "batch": batch,
+                        "top90_rank": source.get("rank") if tier == "tier1_hn_blogs" else None,
+                    }
+                )
+        return items, {source_id(s): results[source_id(s)] for _, _, s in self.plan if source_id(s) in results}
+
+    @staticmethod
+    def _unsupported(method: str) -> list[dict]:
+        raise UnsupportedSource(f"no fetcher registered for fetch_method {method!r}")
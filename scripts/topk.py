@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+import heapq
+from itertools import count
+from typing import Callable, Iterable, Optional
+
+
+class TopK:
+    # 只保留 key 最大的 k 个元素，内存 O(k)；堆顶是当前第 k 名，不超过它的新元素 O(1) 拒绝。
+    # key 相同时先加入的排在前面，与 sorted(..., key=key, reverse=True)[:k] 的结果一致
+    def __init__(self, k: int, key: Callable) -> None:
+        self.k = max(0, int(k))
+        self.key = key
+        self.heap: list[tuple] = []
+        self.seq = count()
+        self.pushed = 0
+
+    def push(self, item) -> bool:
+        self.pushed += 1
+        if self.k == 0:
+            return False
+        entry = (self.key(item), -next(self.seq), item)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+            return True
+        if entry[:2] <= self.heap[0][:2]:
+            return False
+        heapq.heapreplace(self.heap, entry)
+        return True
+
+    def extend(self, items: Iterable) -> None:
+        for item in items:
+            self.push(item)
+
+    @property
+    def full(self) -> bool:
+        return self.k > 0 and len(self.heap) >= self.k
+
+    def floor(self) -> Optional[tuple]:
+        # 当前第 k 名的 key；未满时为 None
+        return self.heap[0][0] if self.full else None
+
+    def items(self) -> list:
+        return [item for _, _, item in sorted(self.heap, key=lambda e: e[:2], reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self.heap)
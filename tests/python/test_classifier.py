@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from classifier import DEFAULT_RULES, FALLBACK_CATEGORY, KeywordClassifier  # noqa: E402
+from generate_full_7d_report import DEFAULT_CLASSIFIER, load_classifier  # noqa: E402
+
+SKILL_DIR = Path("info-skills") / "daily-news-report"
+# 内置规则下的归类结果，默认运行（只有 sources.json.example）不应改变它们
+BASELINE = {
+    "OpenAI releases new model": "🤖 AI / ML",
+    "Anthropic ships MCP server": "🤖 AI / ML",
+    "Rust in the Linux kernel": "⚙️ 工程",
+    "Postgres 18 released": "⚙️ 工程",
+    "An essay on craft": "💡 观点 / 杂谈",
+}
+
+
+class KeywordClassifierTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.classifier = KeywordClassifier(DEFAULT_RULES)
+
+    def test_first_matching_rule_wins(self) -> None:
+        # 命中多个分类时按规则顺序取第一个，不按命中次数
+        self.assertEqual(self.classifier.classify("Rust compiler security"), "🔒 安全")
+        self.assertEqual(self.classifier.classify("Open-source LLM tools"), "🤖 AI / ML")
+        self.assertEqual(self.classifier.classify("Postgres kernel compiler database exploit"), "🔒 安全")
+
+    def test_word_boundaries(self) -> None:
+        self.assertEqual(self.classifier.classify("Google said it again"), FALLBACK_CATEGORY)
+        self.assertEqual(self.classifier.classify("Why we rewrote it in Go"), "⚙️ 工程")
+
+    def test_multi_word_and_plural_keywords(self) -> None:
+        self.assertEqual(self.classifier.classify("An open-source release"), "🛠 工具 / 开源")
+        self.assertEqual(self.classifier.hits("Agents and models"), {"🤖 AI / ML": 2})
+
+
+class SourcesConfigTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.example = json.loads((ROOT / SKILL_DIR / "sources.json.example").read_text(encoding="utf-8"))
+
+    def test_from_shipped_example(self) -> None:
+        classifier = KeywordClassifier.from_sources_config(self.example)
+        self.assertEqual(classifier.categories, ["🤖 AI / ML", "🔒 安全", "⚙️ 工程", "🛠 工具 / 开源", "💡 观点 / 杂谈"])
+        # 没有关键词的分类作为兜底
+        self.assertEqual(classifier.fallback, "📝 其他")
+        self.assertEqual(classifier.classify("Claude fine-tuning guide"), "🤖 AI / ML")
+        self.assertEqual(classifier.classify("Anthropic ships MCP server"), "🛠 工具 / 开源")
+        self.assertEqual(classifier.classify("Hiring remote engineers"), "💡 观点 / 杂谈")
+
+    def test_without_categories_uses_default_rules(self) -> None:
+        classifier = KeywordClassifier.from_sources_config({"categories": {"list": []}})
+        self.assertEqual(classifier.categories, [name for name, _ in DEFAULT_RULES])
+
+    def test_example_fallback_keeps_default_rules(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            skill_dir = Path(tmp) / SKILL_DIR
+            skill_dir.mkdir(parents=True)
+            shutil.copy(ROOT / SKILL_DIR / "sources.json.example", skill_dir)
+            self.assertIs(load_classifier(Path(tmp)), DEFAULT_CLASSIFIER)
+            for title, category in BASELINE.items():
+                self.assertEqual(load_classifier(Path(tmp)).classify(title), category, title)
+
+            # 用户自己的 sources.json 仍然可以改写分类规则
+            (skill_dir / "sources.json").write_text(json.dumps(self.example), encoding="utf-8")
+            self.assertEqual(load_classifier(Path(tmp)).classify("Anthropic ships MCP server"), "🛠 工具 / 开源")
+
+
+if __name__ == "__main__":
+    unittest.main()
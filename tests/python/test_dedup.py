@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "_shared" / "scripts"))
+
+from dedup import NearDuplicateIndex, deduplicate, jaccard, lsh_keys, minhash, minhash_batch, title_tokens  # noqa: E402
+
+
+def item(title: str, url: str, weighted: float, summary: str = "") -> dict:
+    return {"title": title, "url": url, "weighted": weighted, "summary": summary}
+
+
+class DeduplicateTest(unittest.TestCase):
+    def test_same_url_keeps_higher_score(self) -> None:
+        low = item("Postgres 18 is out", "https://www.example.com/pg18/?utm_source=hn", 5.0)
+        high = item("Release notes for PostgreSQL", "http://example.com/pg18", 8.0)
+        self.assertEqual(deduplicate([low, high]), [high])
+
+    def test_same_fingerprint_keeps_higher_score(self) -> None:
+        low = item("Rust 2.0: What's new?", "https://a.example.com/1", 4.0)
+        high = item("rust 2.0 — what's new", "https://b.example.com/2", 6.0)
+        self.assertEqual(deduplicate([low, high]), [high])
+
+    def test_near_duplicate_titles(self) -> None:
+        base = "Show HN a tiny compiler for the lambda calculus written in Rust with tests"
+        near = item(base + " today", "https://b.example.com/", 9.0)
+        original = item(base, "https://a.example.com/", 3.0)
+        # 与 base 只共享一半词的标题不算重复
+        other = item("Show HN a tiny database written in Go", "https://c.example.com/", 7.0)
+        self.assertGreater(jaccard(title_tokens(base), title_tokens(base + " today")), 0.8)
+        self.assertEqual(deduplicate([original, other, near]), [other, near])
+
+    def test_threshold_is_exclusive(self) -> None:
+        # 5 个词里有 4 个相同：Jaccard = 4/5 = 0.8，不超过阈值，两条都保留
+        a = item("alpha beta gamma delta epsilon", "https://a.example.com/", 2.0)
+        b = item("alpha beta gamma delta", "https://b.example.com/", 1.0)
+        self.assertEqual(jaccard(title_tokens(a["title"]), title_tokens(b["title"])), 0.8)
+        self.assertEqual(deduplicate([a, b]), [a, b])
+
+    def test_keeps_input_order_and_untitled_items(self) -> None:
+        items = [
+            item("", "https://a.example.com/", 1.0),
+            item("", "https://b.example.com/", 2.0),
+            item("Unique title", "", 3.0),
+        ]
+        self.assertEqual(deduplicate(items), items)
+
+    def test_default_score_key_falls_back_to_score_norm(self) -> None:
+        low = {"title": "Same story", "url": "https://x.example.com/", "score_norm": 2.0}
+        high = {"title": "Same story", "url": "https://y.example.com/", "score_norm": 4.5}
+        self.assertEqual(deduplicate([low, high]), [high])
+
+
+class MinHashTest(unittest.TestCase):
+    def test_batch_matches_single(self) -> None:
+        sets = [title_tokens(t) for t in ["LLM agents in production", "", "中文 标题 test", "a b c d e f g"]]
+        batch = minhash_batch(sets, chunk=2)
+        for tokens, signature in zip(sets, batch):
+            self.assertEqual(signature.tolist(), minhash(tokens).tolist())
+
+    def test_index_finds_similar_titles(self) -> None:
+        index = NearDuplicateIndex()
+        first = title_tokens("Why SQLite is the right database for local-first apps")
+        index.add(first, lsh_keys(minhash(first)))
+        similar = title_tokens("Why SQLite is the right database for local-first apps today")
+        unrelated = title_tokens("A field guide to Kubernetes networking")
+        self.assertEqual(index.find(similar, lsh_keys(minhash(similar))), 0)
+        self.assertIsNone(index.find(unrelated, lsh_keys(minhash(unrelated))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "_shared" / "scripts"))
+
+from dedup_index import DedupIndex, normalize_url  # noqa: E402
+
+
+class DedupIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "dedup-index.sqlite3"
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_url_variants_and_fingerprint(self) -> None:
+        index = DedupIndex(self.path, scope="notion")
+        index.record([{"url": "https://www.example.com/post/?utm_source=x", "title": "Hello, World!"}])
+        self.assertTrue(index.contains({"url": "http://example.com/post", "title": "other"}))
+        self.assertTrue(index.contains({"url": "https://elsewhere.com/", "title": "hello world"}))
+        self.assertFalse(index.contains({"url": "https://example.com/other", "title": "Goodbye"}))
+        self.assertEqual(normalize_url("https://Example.com:443/a/?b=2&a=1&ref=x"), "example.com/a?a=1&b=2")
+        index.close()
+
+    def test_evict_releases_expired_keys(self) -> None:
+        old = DedupIndex(self.path, scope="notion", as_of="2026-01-01")
+        old.record([{"url": "https://example.com/a", "title": "Same fingerprint"}])
+        old.close()
+
+        index = DedupIndex(self.path, scope="notion", ttl_days=7, as_of="2026-01-20")
+        later = {"url": "https://example.com/b", "title": "Same fingerprint"}
+        self.assertEqual(index.filter_unseen([later]), [])
+        self.assertEqual(index.evict(), 2)
+        self.assertEqual(index.filter_unseen([later]), [later])
+        index.close()
+
+    def test_scopes_are_separate(self) -> None:
+        report = DedupIndex(self.path, scope="report")
+        report.record([{"url": "https://example.com/a", "title": "A"}])
+        notion = DedupIndex(self.path, scope="notion")
+        self.assertEqual(len(notion), 0)
+        self.assertEqual(notion.evict(), 0)
+        self.assertEqual(len(report), 2)
+        report.close()
+        notion.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import io
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "_shared" / "scripts"))
+
+from feeds import FeedCache, discover_feed_url, iter_feed, parse_feed  # noqa: E402
+from fetch_pool import FetchPool  # noqa: E402
+from source_registry import FeedLocator, RSSBatchFetcher  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def ts(text: str) -> int:
+    return int(datetime.fromisoformat(text).replace(tzinfo=timezone.utc).timestamp())
+
+
+class IterFeedTest(unittest.TestCase):
+    def test_rss(self) -> None:
+        with (FIXTURES / "feed.rss.xml").open("rb") as fh:
+            entries = list(iter_feed(fh))
+
+        # 保持订阅源顺序，缺链接的条目被丢弃
+        self.assertEqual([e["url"] for e in entries], ["https://blog.example.com/second", "https://blog.example.com/first"])
+        self.assertEqual(entries[0]["time"], ts("2026-01-20T08:00:00"))
+        self.assertEqual(entries[1]["time"], ts("2026-01-18T08:00:00"))
+        self.assertEqual(entries[0]["summary"], "Hello world & more")
+        self.assertEqual(entries[1]["summary"], "")
+
+    def test_atom(self) -> None:
+        entries = parse_feed((FIXTURES / "feed.atom.xml").read_bytes())
+
+        self.assertEqual([e["title"] for e in entries], ["Published entry", "Updated only"])
+        # rel="alternate" 优先于其他 link；缺省 rel 视为 alternate
+        self.assertEqual([e["url"] for e in entries], ["https://atom.example.com/posts/1", "https://atom.example.com/posts/2"])
+        # published 优先，没有时用 updated
+        self.assertEqual([e["time"] for e in entries], [ts("2026-01-20T08:00:00"), ts("2026-01-19T08:00:00")])
+        self.assertEqual([e["summary"] for e in entries], ["Short summary", "Body text"])
+
+    def test_is_lazy(self) -> None:
+        # 只取第一条时不需要读到文档结尾，后面截断的 XML 不会报错
+        content = (FIXTURES / "feed.rss.xml").read_bytes()
+        truncated = content[: content.index(b"<title>First post")]
+        first = next(iter_feed(io.BytesIO(truncated)))
+        self.assertEqual(first["title"], "Second post")
+
+    def test_discover_feed_url(self) -> None:
+        page = (
+            '<html><head><link rel="stylesheet" href="/a.css">'
+            "<link rel='alternate' type='application/atom+xml' href='/feed.xml?a=1&amp;b=2'>"
+            "</head></html>"
+        )
+        self.assertEqual(discover_feed_url(page, "https://example.com/blog/"), "https://example.com/feed.xml?a=1&b=2")
+        self.assertIsNone(discover_feed_url('<link rel="alternate" type="text/html" href="/x">', "https://example.com/"))
+
+
+class FeedFetcherTest(unittest.TestCase):
+    def test_conditional_get_reuses_cached_entries(self) -> None:
+        body = (FIXTURES / "feed.rss.xml").read_bytes()
+
+        def respond(method, path, headers):
+            if headers.get("If-None-Match") == '"v1"':
+                return 304, {"ETag": '"v1"'}, b""
+            return 200, {"Content-Type": "application/rss+xml", "ETag": '"v1"'}, body
+
+        with tempfile.TemporaryDirectory() as tmp, StubServer(respond) as stub:
+            pool = FetchPool()
+            try:
+                fetcher = RSSBatchFetcher(pool, {}, {}, FeedLocator(), FeedCache(Path(tmp)))
+                source = {"rss_url": f"{stub.url}/feed.xml"}
+                first = fetcher.fetch(source)
+                second = fetcher.fetch(source)
+            finally:
+                pool.close()
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 2)
+        self.assertEqual([r["headers"].get("If-None-Match") for r in stub.requests], [None, '"v1"'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import fetch_pool  # noqa: E402
+from fetch_pool import FetchPool  # noqa: E402
+
+
+class FakePool(FetchPool):
+    # 不发网络请求：URL 里带的秒数就是这次请求的耗时
+    def __init__(self, concurrency: int) -> None:
+        super().__init__(concurrency=concurrency)
+        self.lock = threading.Lock()
+        self.calls: dict[str, int] = {}
+
+    def get_json(self, url, timeout=None):
+        with self.lock:
+            self.calls[url] = self.calls.get(url, 0) + 1
+        time.sleep(float(url.rsplit("/", 1)[1]))
+        return {"url": url}
+
+
+class MapJsonHedgeTest(unittest.TestCase):
+    def run_map(self, pool: FakePool, urls: list[str], hedge_after: float):
+        real_wait = fetch_pool.wait
+        calls = []
+
+        def counting_wait(fs, timeout=None, return_when=None):
+            calls.append((len(fs), timeout))
+            return real_wait(fs, timeout=timeout, return_when=return_when)
+
+        with mock.patch.object(fetch_pool, "wait", counting_wait):
+            results = list(pool.map_json(urls, hedge_after=hedge_after))
+        return results, calls
+
+    def test_full_hedge_slots_do_not_busy_wait(self) -> None:
+        pool = FakePool(concurrency=4)
+        # 慢请求耗时不一：对冲槽位占满时仍有未对冲的慢请求、对冲预算也未用完
+        slow = [f"https://x/slow{i}/{0.1 + 0.1 * (i % 4)}" for i in range(12)]
+        urls = [f"https://x/fast{i}/0" for i in range(40)] + slow
+        results, calls = self.run_map(pool, urls, hedge_after=0.02)
+
+        self.assertEqual(sorted(idx for idx, _, _ in results), list(range(len(urls))))
+        self.assertTrue(all(payload is not None for _, _, payload in results))
+        # 每次 wait 都应对应一次完成或一次对冲，不应出现大量 0 超时的空转
+        self.assertLess(len(calls), 2 * len(urls))
+        # 同时在途的请求不超过 concurrency + hedge_slots
+        self.assertLessEqual(max(n for n, _ in calls), pool.concurrency + pool.hedge_slots)
+        hedged = sum(n - 1 for n in pool.calls.values())
+        self.assertGreater(hedged, 0)
+        self.assertLessEqual(hedged, 6)
+
+    def test_no_hedge_without_hedge_after(self) -> None:
+        pool = FakePool(concurrency=3)
+        urls = [f"https://x/{i}/0.01" for i in range(10)]
+        results, calls = self.run_map(pool, urls, hedge_after=None)
+
+        self.assertEqual(len(results), 10)
+        self.assertTrue(all(n == 1 for n in pool.calls.values()))
+        self.assertTrue(all(timeout is None for _, timeout in calls))
+
+
+if __name__ == "__main__":
+    unittest.main()
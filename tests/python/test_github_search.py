@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from github_search import GitHubAPIError, GitHubSearchClient  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def search_api(pages: int, per_page: int):
+    # 按 page 参数分页，Link 头给出下一页；每页带固定 ETag，If-None-Match 命中时返回 304
+    def respond(method, path, headers):
+        query = parse_qs(urlparse(path).query)
+        page = int(query.get("page", ["1"])[0])
+        etag = f'"page-{page}"'
+        if headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        items = [{"full_name": f"o/r{(page - 1) * per_page + i}"} for i in range(per_page)]
+        reply = {"Content-Type": "application/json", "ETag": etag}
+        if page < pages:
+            reply["Link"] = f'<{stub.url}/search/repositories?q=x&page={page + 1}>; rel="next"'
+        return 200, reply, json.dumps({"items": items}).encode()
+
+    stub = StubServer(respond)
+    return stub
+
+
+class GitHubSearchClientTest(unittest.TestCase):
+    def test_follows_next_links_and_stops_at_max_results(self) -> None:
+        with search_api(pages=3, per_page=2) as stub:
+            client = GitHubSearchClient(base_url=stub.url, token="t")
+            repos = list(client.iter_repositories("x", max_results=3))
+
+        self.assertEqual([r["full_name"] for r in repos], ["o/r0", "o/r1", "o/r2"])
+        # 取够 3 条就停，不请求第 3 页
+        self.assertEqual(len(stub.requests), 2)
+        self.assertEqual(stub.requests[0]["headers"]["Authorization"], "Bearer t")
+
+    def test_reuses_cached_pages_on_304(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir, search_api(pages=2, per_page=2) as stub:
+            first = list(GitHubSearchClient(base_url=stub.url, cache_dir=Path(cache_dir)).iter_repositories("x", max_results=4))
+            client = GitHubSearchClient(base_url=stub.url, cache_dir=Path(cache_dir))
+            second = list(client.iter_repositories("x", max_results=4))
+
+        self.assertEqual(first, second)
+        self.assertEqual(client.not_modified, 2)
+        self.assertEqual([r["headers"].get("If-None-Match") for r in stub.requests[2:]], ['"page-1"', '"page-2"'])
+
+    def test_error_status_raises(self) -> None:
+        respond = lambda method, path, headers: (403, {"Content-Type": "application/json"}, b'{"message": "rate limited"}')  # noqa: E731
+        with StubServer(respond) as stub:
+            with self.assertRaises(GitHubAPIError) as ctx:
+                list(GitHubSearchClient(base_url=stub.url).iter_repositories("x"))
+        self.assertEqual(ctx.exception.status_code, 403)
+
+
+if __name__ == "__main__":
+    unittest.main()
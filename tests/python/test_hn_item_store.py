@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from hn_item_store import HNItemStore, to_hn_item  # noqa: E402
+
+HOUR = 3600
+POSTED = 1_768_000_000
+
+
+class NeedsRefreshTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        # 默认：发布 48 小时后冻结，未冻结的条目缓存 60 分钟
+        self.store = HNItemStore(Path(self.tmp.name) / "hn.db")
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self.tmp.cleanup()
+
+    def row(self, fetched_after_hours: float) -> dict:
+        return {"id": 1, "time": POSTED, "fetched_at": POSTED + int(fetched_after_hours * HOUR)}
+
+    def at(self, hours: float) -> int:
+        return POSTED + int(hours * HOUR)
+
+    def test_young_items_refresh_hourly(self) -> None:
+        row = self.row(10)
+        self.assertFalse(self.store.needs_refresh(row, now=self.at(10.5)))
+        self.assertTrue(self.store.needs_refresh(row, now=self.at(11)))
+
+    def test_frozen_item_refetched_once_after_freeze_line(self) -> None:
+        # 最后一次抓取在冻结线之前：越过冻结线后补抓一次
+        self.assertTrue(self.store.needs_refresh(self.row(47), now=self.at(49)))
+        # 冻结线之后已经抓过，不再刷新
+        self.assertFalse(self.store.needs_refresh(self.row(48), now=self.at(200)))
+        self.assertFalse(self.store.needs_refresh(self.row(60), now=self.at(500)))
+
+    def test_frozen_item_fetched_just_before_freeze_waits_for_refresh_interval(self) -> None:
+        row = self.row(47.5)
+        self.assertFalse(self.store.needs_refresh(row, now=self.at(48.2)))
+        self.assertTrue(self.store.needs_refresh(row, now=self.at(48.5)))
+
+    def test_round_trip_and_prune(self) -> None:
+        item = {"id": 7, "type": "story", "title": "t", "url": "https://x/", "time": POSTED, "score": 12, "descendants": 3}
+        self.store.put_many([item, None, {"title": "no id"}], now=self.at(1))
+        row = self.store.get_many([7, 8])[7]
+        self.assertEqual(to_hn_item(row), item)
+        self.assertEqual(row["fetched_at"], self.at(1))
+        self.assertEqual(self.store.prune(now=POSTED + 8 * 24 * HOUR), 1)
+        self.assertEqual(self.store.get_many([7]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from domain_index import DomainIndex  # noqa: E402
+from fetch_pool import FetchPool  # noqa: E402
+from generate_full_7d_report import HN_API, hn_key, hn_records, iter_list_items, rank_hn_items, score_hn_records  # noqa: E402
+from hn_scan import ScanRanker  # noqa: E402
+from scoring import ScoringWeights  # noqa: E402
+from topk import TopK  # noqa: E402
+
+START_TS = 1_768_000_000
+END_TS = START_TS + 7 * 86400 - 1
+# 第一条相关性封顶（AI 分类 + 关键词加分），剪枝只有在榜单前列的分数接近满分时才会发生
+TITLES = ["Open-source LLM breakthrough released", "LLM agents in production", "Postgres internals", "A new CLI tool", "Career advice", "Gardening notes", "CVE exploit"]
+
+
+class FakeHN(FetchPool):
+    # 榜单和条目都来自内存，记录每个被请求的条目 id
+    def __init__(self, ids: list[int], items: dict[int, dict]) -> None:
+        super().__init__(concurrency=4)
+        self.ids = ids
+        self.items = items
+        self.requested: list[int] = []
+
+    def get_json(self, url, timeout=None):
+        if url.endswith("/topstories.json"):
+            return list(self.ids)
+        sid = int(url.rsplit("/", 1)[1].split(".")[0])
+        self.requested.append(sid)
+        return self.items[sid]
+
+
+def make_items(seed: int, count: int = 120, titles: list[str] = TITLES) -> dict[int, dict]:
+    # id 越大发布越晚；少量条目在窗口之前
+    rng = random.Random(seed)
+    items = {}
+    for n in range(count):
+        sid = 40_000_000 + n
+        host = rng.choice(["simonwillison.net", "danluu.com", "example.com", "news.example.org"])
+        items[sid] = {
+            "id": sid,
+            "type": "story",
+            "title": rng.choice(titles),
+            "url": f"https://{host}/{sid}",
+            "score": rng.choice([5, 40, 150, 320, 800]),
+            "descendants": rng.randint(0, 400),
+            "time": START_TS - 86400 + n * (8 * 86400 // count),
+        }
+    return items
+
+
+class ScanRankerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.domains = DomainIndex()
+        self.domains.add("simonwillison.net", 1)
+        self.domains.add("danluu.com", 8)
+        self.weights = ScoringWeights()
+
+    def score(self, items: list[dict]) -> list[dict]:
+        records = hn_records(items, START_TS, END_TS, self.domains)
+        return score_hn_records(records, START_TS, END_TS, self.weights)
+
+    def scan(self, ids: list[int], items: dict[int, dict], target: int):
+        pool = FakeHN(ids, items)
+        ranker = ScanRanker(target, hn_key, self.score, START_TS, END_TS, self.weights.dimensions, patience=0)
+        scanned = list(iter_list_items(pool, None, len(ids), ranker=ranker))
+        return scanned, pool.requested, ranker
+
+    def top(self, items: list[dict], target: int) -> list[str]:
+        ranked, _ = rank_hn_items(items, START_TS, END_TS, self.domains, self.weights, target=target)
+        return [x["url"] for x in ranked]
+
+    def test_pruned_scan_selects_same_items_as_full_scan(self) -> None:
+        stopped = 0
+        for seed in range(20):
+            items = make_items(seed, titles=TITLES[:2] if seed % 2 else TITLES)
+            ids = sorted(items, reverse=True) if seed % 4 < 2 else random.Random(seed).sample(list(items), len(items))
+            for target in (5, 15, 20):
+                scanned, _, ranker = self.scan(ids, items, target)
+                stopped += ranker.stopped
+                self.assertEqual(self.top(scanned, target), self.top(list(items.values()), target), (seed, target))
+        # 确实有扫描被提前停止，比较才有意义
+        self.assertGreater(stopped, 0)
+
+    def test_newest_first_list_stops_early(self) -> None:
+        items = make_items(7, titles=TITLES[:1])
+        ids = sorted(items, reverse=True)
+        scanned, requested, ranker = self.scan(ids, items, 15)
+
+        self.assertTrue(ranker.stopped)
+        self.assertLess(len(requested), len(ids))
+        self.assertEqual(self.top(scanned, 15), self.top(list(items.values()), 15))
+
+    def test_topk_matches_sorted(self) -> None:
+        rng = random.Random(3)
+        values = [rng.randint(0, 20) for _ in range(200)]
+        top = TopK(15, lambda v: v)
+        top.extend(values)
+        self.assertEqual(top.items(), sorted(values, reverse=True)[:15])
+
+
+if __name__ == "__main__":
+    unittest.main()
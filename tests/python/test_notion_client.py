@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import json
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "utility-skills" / "notion-sync" / "scripts"))
+
+from notion_client import NotionClient  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+JSON = {"Content-Type": "application/json"}
+
+
+def replies(*responses):
+    queue = list(responses)
+
+    def respond(method, path, headers):
+        return queue.pop(0) if len(queue) > 1 else queue[0]
+
+    return respond
+
+
+class NotionClientRetryTest(unittest.TestCase):
+    def test_429_waits_for_retry_after_then_succeeds(self) -> None:
+        respond = replies((429, {"Retry-After": "0.3"}, b"{}"), (200, JSON, json.dumps({"id": "page-1"}).encode()))
+        with StubServer(respond) as stub:
+            client = NotionClient("secret", base_url=stub.url, rate=100, burst=10)
+            resp = client.create_page({"parent": {"database_id": "db"}, "properties": {}})
+            client.close()
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["id"], "page-1")
+        self.assertEqual([r["method"] for r in stub.requests], ["POST", "POST"])
+        self.assertEqual(stub.requests[0]["headers"]["Authorization"], "Bearer secret")
+        self.assertGreaterEqual(stub.requests[1]["at"] - stub.requests[0]["at"], 0.3)
+
+    def test_429_pauses_all_in_flight_requests(self) -> None:
+        # 一个请求收到 429 后整个令牌桶暂停，之后的请求都要等到 Retry-After 结束
+        respond = replies((429, {"Retry-After": "0.4"}, b"{}"), (200, JSON, b'{"id": "p"}'))
+        with StubServer(respond) as stub:
+            client = NotionClient("secret", base_url=stub.url, rate=5, burst=1, max_in_flight=3)
+            results = list(client.create_pages([{"properties": {"n": i}} for i in range(3)]))
+            client.close()
+
+        self.assertTrue(all(r.status_code == 200 for _, r in results))
+        self.assertEqual(len(stub.requests), 4)
+        throttled_at = stub.requests[0]["at"]
+        self.assertTrue(all(r["at"] - throttled_at >= 0.4 for r in stub.requests[1:]))
+
+    def test_gives_up_after_max_retries(self) -> None:
+        start = time.monotonic()
+        with StubServer(replies((429, {"Retry-After": "0"}, b"{}"))) as stub:
+            client = NotionClient("secret", base_url=stub.url, rate=100, burst=10, max_retries=2)
+            resp = client.request("GET", "/v1/databases/db")
+            client.close()
+
+        self.assertEqual(resp.status_code, 429)
+        self.assertEqual(len(stub.requests), 2)
+        self.assertLess(time.monotonic() - start, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "utility-skills" / "notion-sync" / "scripts"))
+
+from report_parser import iter_articles, iter_report  # noqa: E402
+from report_sidecar import write_sidecar  # noqa: E402
+
+REPORT = Path(__file__).resolve().parent / "fixtures" / "report.md"
+
+
+class IterArticlesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(REPORT, "r", encoding="utf-8") as f:
+            self.articles = list(iter_articles(f))
+
+    def test_ranks_and_titles(self) -> None:
+        self.assertEqual(
+            [(a["rank"], a["title"]) for a in self.articles],
+            [
+                (1, "model kernel database release 104"),
+                (2, "编译器里的 SSA / SSA in Compilers"),
+                (1, "model kernel database release 104"),
+                (1, "a/b5"),
+            ],
+        )
+
+    def test_full_article(self) -> None:
+        article = self.articles[1]
+        # 摘要包含折行，不包含后面的"推荐理由"
+        self.assertEqual(article["summary"], "文章从 phi 节点讲起，\n解释为什么 SSA 让常量传播更简单。")
+        self.assertEqual(article["key_points"], "1. phi 节点只出现在汇合点\n2. 支配树决定 phi 的位置")
+        self.assertEqual(article["url"], "https://blog.example.com/ssa")
+        self.assertEqual(article["source"], "Example Blog")
+        self.assertEqual(article["keywords"], ["SSA", "compiler", "LLVM", "phi", "dominator"])
+        self.assertEqual(article["score"], "4")
+
+    def test_generated_report_articles(self) -> None:
+        must_read, hn, github = self.articles[0], self.articles[2], self.articles[3]
+        # 没有"要点"的条目也保留摘要；没有 [原文] 时以来源链接作为 URL
+        self.assertEqual(must_read["summary"], "该条目来自近七天 HN 高热讨论，社区反馈集中在工程实现可行性与实践细节。")
+        self.assertEqual(must_read["url"], "https://www.jeffgeerling.com/p/104")
+        self.assertEqual((hn["source"], hn["url"], hn["score"]), ("HackerNews", "https://www.jeffgeerling.com/p/104", "5"))
+        self.assertEqual((github["source"], github["url"], github["summary"]), ("GitHub", "https://github.com/a/b5", ""))
+        self.assertEqual(github["key_points"], "")
+        self.assertEqual(github["keywords"], [])
+
+    def test_article_ends_at_next_heading(self) -> None:
+        lines = [
+            "### 1. Last article\n",
+            "- **来源**：[Blog](https://blog.example.com/a)\n",
+            "## 📊 数据概览\n",
+            "- **评分**：⭐⭐ (2/5)\n",
+            "[原文](https://elsewhere.example.com/)\n",
+        ]
+        (article,) = iter_articles(lines)
+        self.assertEqual((article["url"], article["score"]), ("https://blog.example.com/a", "3"))
+
+
+class IterReportTest(unittest.TestCase):
+    def test_prefers_fresh_sidecar(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = Path(tmp) / "report.md"
+            report.write_text(REPORT.read_text(encoding="utf-8"), encoding="utf-8")
+            record = {"rank": 1, "title": "t", "summary": "s", "key_points": "", "url": "https://x/", "source": "HN", "keywords": [], "score": "4", "heat": 1}
+            write_sidecar(report, [record])
+            self.assertEqual(list(iter_report(report)), [{k: v for k, v in record.items() if k != "heat"}])
+
+            # 报告比 sidecar 新时回退到解析 Markdown
+            stamp = report.stat().st_mtime + 10
+            os.utime(report, (stamp, stamp))
+            self.assertEqual(len(list(iter_report(report))), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
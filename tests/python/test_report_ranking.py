@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from generate_full_7d_report import rank_github_items, rank_source_items  # noqa: E402
+
+END = datetime(2025, 3, 9, tzinfo=timezone.utc)
+START = END - timedelta(days=6)
+START_TS = int(START.timestamp())
+END_TS = int((END + timedelta(days=1)).timestamp()) - 1
+
+
+class TimelinessTest(unittest.TestCase):
+    def test_github_uses_window_end_for_past_end_date(self) -> None:
+        fresh = END_TS - 3600
+        repos = [
+            {"title": "o/fresh", "description": "", "url": "https://github.com/o/fresh", "stars": 500, "time": fresh},
+            {"title": "o/stale", "description": "", "url": "https://github.com/o/stale", "stars": 500, "time": START_TS},
+        ]
+        ranked = {x["title"]: x for x in rank_github_items(repos, START_TS, END_TS, limit=None)}
+
+        self.assertEqual(ranked["o/fresh"]["timeliness"], 10)
+        self.assertEqual(ranked["o/stale"]["timeliness"], 3)
+
+        # 同一时刻发布的订阅源条目得到相同的时效分
+        feed = rank_source_items([{"title": "post", "url": "https://blog.example.com/p", "time": fresh}], START_TS, END_TS)
+        self.assertEqual(feed[0]["timeliness"], ranked["o/fresh"]["timeliness"])
+
+
+if __name__ == "__main__":
+    unittest.main()
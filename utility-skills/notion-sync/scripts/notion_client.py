@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+NOTION_API_BASE = "https://api.notion.com"
+NOTION_VERSION = "2022-06-28"
+
+# Notion 官方限流约为平均 3 req/s
+DEFAULT_RATE = 3.0
+DEFAULT_BURST = 3
+DEFAULT_MAX_IN_FLIGHT = 3
+MAX_RETRIES = 3
+RETRY_DELAY = 2
+
+
+class TokenBucket:
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: int = DEFAULT_BURST) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        # 收到 429 时所有请求一起暂停，而不是各自重试把限流打得更狠
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+            self.updated = self.paused_until
+
+
+def retry_after_seconds(response: requests.Response, default: float = RETRY_DELAY) -> float:
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else default
+    except ValueError:
+        return default
+
+
+class NotionClient:
+    def __init__(
+        self,
+        api_key: str,
+        notion_version: str = NOTION_VERSION,
+        base_url: str = NOTION_API_BASE,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_retries: int = MAX_RETRIES,
+        timeout: float = 30,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.bucket = TokenBucket(rate, burst)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+                "Notion-Version": notion_version,
+            }
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, path: str, payload: Optional[dict] = None) -> requests.Response:
+        last_error = None
+        for attempt in range(self.max_retries):
+            self.bucket.acquire()
+            try:
+                response = self.session.request(method, f"{self.base_url}{path}", json=payload, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                last_error = e
+                if attempt < self.max_retries - 1:
+                    print(f"  ⚠️ Retry {attempt + 1}/{self.max_retries}: {e}")
+                    time.sleep(RETRY_DELAY)
+                continue
+
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt < self.max_retries - 1:
+                    delay = retry_after_seconds(response, RETRY_DELAY * (attempt + 1))
+                    if response.status_code == 429:
+                        self.bucket.pause(delay)
+                    else:
+                        time.sleep(delay)
+                    continue
+            return response
+        raise last_error  # type: ignore
+
+    def create_page(self, payload: dict) -> requests.Response:
+        return self.request("POST", "/v1/pages", payload)
+
+    def update_page(self, page_id: str, payload: dict) -> requests.Response:
+        # 更新已有页面只能改 properties，parent 不能出现在 PATCH 请求体里
+        properties = {k: v for k, v in payload.items() if k != "parent"}
+        return self.request("PATCH", f"/v1/pages/{page_id}", properties)
+
+    def upsert_page(self, payload: dict, page_id: Optional[str] = None) -> requests.Response:
+        return self.update_page(page_id, payload) if page_id else self.create_page(payload)
+
+    def upsert_pages(self, jobs: Iterable[tuple[Optional[str], dict]]) -> Iterator[tuple[int, object]]:
+        # jobs: (page_id 或 None, payload)；按完成顺序产出 (index, response 或 exception)，在途请求数不超过 max_in_flight
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            futures = {executor.submit(self.upsert_page, p, page_id): i for i, (page_id, p) in enumerate(jobs)}
+            for fut in as_completed(futures):
+                try:
+                    yield futures[fut], fut.result()
+                except Exception as e:
+                    yield futures[fut], e
+
+    def create_pages(self, payloads: Iterable[dict]) -> Iterator[tuple[int, object]]:
+        return self.upsert_pages((None, p) for p in payloads)
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+import re
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# 不依赖调用方事先把 _shared/scripts 加进 sys.path（sync.py 之外还有基准脚本直接导入本模块）
+SHARED_SCRIPTS = str(Path(__file__).resolve().parents[3] / "_shared" / "scripts")
+if SHARED_SCRIPTS not in sys.path:
+    sys.path.insert(0, SHARED_SCRIPTS)
+from report_sidecar import ARTICLE_FIELDS, fresh_sidecar, iter_sidecar  # noqa: E402
+
+# 逐行状态机解析 _shared/format-spec.md 定义的条目格式，每行只看一次，耗时与报告大小成线性关系
+# 与早先整篇正则解析的结果有三处不同，同步到 Notion 的内容随之变化：
+# 1. 任何标题行都结束当前条目，分节标题和"数据概览"等内容不再并入前一条；
+# 2. 摘要取"摘要"行及其折行，止于下一个字段、空行或分隔线：不要求后面紧跟"要点"（原先没有"要点"的条目摘要为空，
+#    例如脚本生成的报告），也不再把中间的"推荐理由"并进来；
+# 3. 没有 [原文] 链接的条目（博客、GitHub 仓库、今日必读）以来源链接作为 URL，原先为空
+HEADING_RE = re.compile(r"#{2,3}\s+(\d+)\.\s+(.*\S)")
+KEY_POINT_RE = re.compile(r"  \d+\. (.+)")
+LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+ORIGINAL_LINK_RE = re.compile(r"\[原文\]\((.+?)\)")
+SCORE_RE = re.compile(r"⭐+\s*\((\d+)/5\)")
+KEYWORD_RE = re.compile(r"`([^`]+)`")
+
+SUMMARY_PREFIX = "- **摘要**："
+KEY_POINTS_PREFIX = "- **要点**："
+SOURCE_PREFIX = "- **来源**："
+KEYWORDS_PREFIX = "- **关键词**："
+SCORE_PREFIX = "- **评分**："
+
+MAX_KEYWORDS = 5
+
+
+def _new_article(rank: str, title: str) -> dict:
+    return {
+        "rank": int(rank),
+        "title": title.strip(),
+        "summary": [],
+        "key_points": [],
+        "url": "",
+        "source_url": "",
+        "source": "Other",
+        "keywords": [],
+        "score": "3",
+    }
+
+
+def _finish(article: dict) -> dict:
+    points = article.pop("key_points")
+    source_url = article.pop("source_url")
+    article["summary"] = "\n".join(article["summary"]).strip()
+    article["key_points"] = "\n".join(f"{i + 1}. {p}" for i, p in enumerate(points))
+    # 博客条目只有来源链接、没有 [原文]，此时来源链接就是文章地址
+    article["url"] = article["url"] or source_url
+    return article
+
+
+def iter_articles(lines: Iterable[str]) -> Iterator[dict]:
+    article = None
+    field = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+
+        if line.startswith("#"):
+            match = HEADING_RE.match(line)
+            if article is not None:
+                yield _finish(article)
+                article = None
+            if match:
+                article = _new_article(*match.groups())
+            field = None
+            continue
+
+        if article is None:
+            continue
+
+        if field == "key_points":
+            match = KEY_POINT_RE.match(line)
+            if match:
+                article["key_points"].append(match.group(1))
+                continue
+            field = None
+        elif field == "summary":
+            # 摘要可以折行，直到下一个字段、空行或分隔线为止
+            if line.strip() and not line.startswith(("- ", "---", "|", ">")):
+                article["summary"].append(line.strip())
+                continue
+            field = None
+
+        if not article["url"] and "[原文](" in line:
+            match = ORIGINAL_LINK_RE.search(line)
+            if match:
+                article["url"] = match.group(1)
+
+        if not line.startswith("- **"):
+            continue
+        if line.startswith(SUMMARY_PREFIX):
+            if not article["summary"]:
+                article["summary"].append(line[len(SUMMARY_PREFIX):].strip())
+                field = "summary"
+        elif line.startswith(KEY_POINTS_PREFIX):
+            if not article["key_points"]:
+                field = "key_points"
+        elif line.startswith(SOURCE_PREFIX):
+            match = LINK_RE.search(line, len(SOURCE_PREFIX))
+            if match and not article["source_url"]:
+                article["source"] = match.group(1)
+                article["source_url"] = match.group(2)
+        elif line.startswith(KEYWORDS_PREFIX):
+            if not article["keywords"]:
+                article["keywords"] = KEYWORD_RE.findall(line, len(KEYWORDS_PREFIX))[:MAX_KEYWORDS]
+        elif line.startswith(SCORE_PREFIX):
+            match = SCORE_RE.match(line, len(SCORE_PREFIX))
+            if match:
+                article["score"] = match.group(1)
+
+    if article is not None:
+        yield _finish(article)
+
+
+def iter_report(report_path: Path) -> Iterator[dict]:
+    # 报告旁有最新的 JSON Lines 副本时直接读取，否则解析 Markdown
+    sidecar = fresh_sidecar(report_path)
+    if sidecar is not None:
+        for record in iter_sidecar(sidecar):
+            yield {k: record[k] for k in ARTICLE_FIELDS if k in record}
+        return
+    with open(report_path, "r", encoding="utf-8") as f:
+        yield from iter_articles(f)
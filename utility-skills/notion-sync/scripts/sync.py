@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-import os
 import sys
 import json
 import re
-import time
-from datetime import datetime
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
@@ -15,13 +15,6 @@ if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-try:
-    from dotenv import dotenv_values
-    import requests
-except ImportError:
-    print("❌ Missing dependencies. Run: pip install python-dotenv requests")
-    sys.exit(1)
-
 SCRIPT_DIR = Path(__file__).parent
 SKILL_DIR = SCRIPT_DIR.parent
 PLUGIN_ROOT = SKILL_DIR.parent.parent
@@ -31,63 +24,80 @@ PROJECT_ENV_PATH = PLUGIN_ROOT / ".env"
 USER_ENV_PATH = Path.home() / ".info-agent-plugin" / ".env"
 LEGACY_ENV_PATH = WORKSPACE_ROOT / ".env"
 
+sys.path.insert(0, str(PLUGIN_ROOT / "_shared" / "scripts"))
+from config_loader import EnvFiles, read_json  # noqa: E402
+from dedup_index import DedupIndex  # noqa: E402
+from report_parser import iter_report  # noqa: E402
+from run_metrics import RunMetrics  # noqa: E402
+from sync_history import SyncHistory  # noqa: E402
 
-def resolve_env(key: str) -> Optional[str]:
-    # Priority: process.env > project-level .env > user-level .env > legacy project .env
-    if os.getenv(key):
-        return os.getenv(key)
-
-    project_env = dotenv_values(PROJECT_ENV_PATH) if PROJECT_ENV_PATH.exists() else {}
-    if project_env.get(key):
-        return project_env.get(key)
-
-    user_env = dotenv_values(USER_ENV_PATH) if USER_ENV_PATH.exists() else {}
-    if user_env.get(key):
-        return user_env.get(key)
+MISSING_DEPENDENCIES = "❌ Missing dependencies. Run: pip install python-dotenv requests"
+# Priority: process.env > project-level .env > user-level .env > legacy project .env
+ENV_FILES = EnvFiles([PROJECT_ENV_PATH, USER_ENV_PATH, LEGACY_ENV_PATH])
 
-    legacy_env = dotenv_values(LEGACY_ENV_PATH) if LEGACY_ENV_PATH.exists() else {}
-    if legacy_env.get(key):
-        return legacy_env.get(key)
 
-    return None
+def resolve_env(key: str) -> Optional[str]:
+    try:
+        return ENV_FILES.get(key)
+    except ImportError:
+        print(MISSING_DEPENDENCIES)
+        sys.exit(1)
 
 
-NOTION_API_KEY = resolve_env("NOTION_API_KEY")
-NOTION_DATABASE_ID = resolve_env("NOTION_DATABASE_ID")
-NOTION_VERSION = "2022-06-28"
 CONFIG_PATH = SKILL_DIR / "config.json"
-HISTORY_PATH = SKILL_DIR / "sync-history.json"
+HISTORY_PATH = SKILL_DIR / "sync-history.sqlite3"
+LEGACY_HISTORY_PATH = SKILL_DIR / "sync-history.json"
+DEDUP_INDEX_PATH = PLUGIN_ROOT / ".cache" / "dedup-index.sqlite3"
+VERIFY_CACHE_PATH = PLUGIN_ROOT / ".cache" / "notion-verify.json"
 REPORT_DIR = WORKSPACE_ROOT / "output_info"
+REPORT_NAME_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})-(news-report|full)\.md$")
+VERIFY_CACHE_HOURS = 24
+PARSE_WORKERS = 4
+
 
-MAX_RETRIES = 3
-RETRY_DELAY = 2
+class SyncConfig:
+    # 一次运行只解析一次：API key、database id 与 config.json 合并后的结果，由 main 向下传
+    def __init__(self, api_key: str, database_id: str, options: dict) -> None:
+        self.api_key = api_key
+        self.database_id = database_id
+        self.options = options
 
 
 def load_config():
-    if not CONFIG_PATH.exists():
+    config = read_json(CONFIG_PATH)
+    if config is None:
         print(f"❌ Config not found: {CONFIG_PATH}")
         print("Please copy config.json.example to config.json and fill database_id")
         sys.exit(1)
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return config
 
 
-def validate_required_env() -> None:
+def validate_required_env() -> str:
+    api_key = resolve_env("NOTION_API_KEY")
     missing = []
-    if not NOTION_API_KEY:
+    if not api_key:
         missing.append("NOTION_API_KEY")
     if missing:
         print(f"❌ Missing required environment variables: {', '.join(missing)}")
         print(f"Checked: {PROJECT_ENV_PATH}")
         print(f"Checked: {USER_ENV_PATH}")
         sys.exit(1)
+    return api_key
 
 
 def resolve_database_id(config: dict) -> Optional[str]:
     # Priority: env NOTION_DATABASE_ID > config.database_id
-    if NOTION_DATABASE_ID:
-        return NOTION_DATABASE_ID
-    return config.get("database_id")
+    return resolve_env("NOTION_DATABASE_ID") or config.get("database_id")
+
+
+def load_sync_config() -> SyncConfig:
+    api_key = validate_required_env()
+    config = load_config()
+    database_id = resolve_database_id(config)
+    if not database_id:
+        print("❌ Missing database id: set NOTION_DATABASE_ID or config.json(database_id)")
+        sys.exit(1)
+    return SyncConfig(api_key, database_id, config)
 
 
 def resolve_report_path(report_date: str) -> Optional[Path]:
@@ -102,90 +112,20 @@ def resolve_report_path(report_date: str) -> Optional[Path]:
 
 
 def load_history():
-    if not HISTORY_PATH.exists():
-        return {"synced_urls": [], "stats": {"total_synced": 0, "total_skipped": 0}}
-    with open(HISTORY_PATH, "r", encoding="utf-8") as f:
-        history = json.load(f)
-    history.setdefault("synced_urls", [])
-    history.setdefault("stats", {})
-    history["stats"].setdefault("total_synced", 0)
-    history["stats"].setdefault("total_skipped", 0)
+    history = SyncHistory(HISTORY_PATH)
+    # 首次打开时迁移旧版 sync-history.json，之后不再读写该文件
+    if history.get_meta("migrated_from") is None and LEGACY_HISTORY_PATH.exists():
+        count = history.import_json(LEGACY_HISTORY_PATH)
+        print(f"📦 Migrated {count} synced URLs from {LEGACY_HISTORY_PATH.name}")
     return history
 
 
-def save_history(history):
-    with open(HISTORY_PATH, "w", encoding="utf-8") as f:
-        json.dump(history, f, indent=2, ensure_ascii=False)
-
-
 def parse_report(report_path):
-    with open(report_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    articles = []
-    # 支持 ## 和 ### 两种标题层级
-    section_pattern = re.compile(
-        r"(?m)^##{1,2}\s+(\d+)\.\s+(.+?)\n(.*?)(?=^##{1,2}\s+\d+\.\s+|\Z)",
-        re.DOTALL,
-    )
-    matches = section_pattern.findall(content)
-
-    for rank_str, title_raw, article_text in matches:
-        rank = int(rank_str)
-        title = title_raw.strip()
-
-        summary_match = re.search(
-            r"- \*\*摘要\*\*：(.+?)(?=\n- \*\*要点\*\*：)", article_text, re.DOTALL
-        )
-        summary = summary_match.group(1).strip() if summary_match else ""
-
-        key_points_match = re.search(
-            r"- \*\*要点\*\*：\n((?:  \d+\. .+\n?)+)", article_text
-        )
-        key_points = ""
-        if key_points_match:
-            points = re.findall(r"  \d+\. (.+)", key_points_match.group(1))
-            key_points = "\n".join(f"{i + 1}. {p}" for i, p in enumerate(points))
-
-        url_match = re.search(r"\[原文\]\((.+?)\)", article_text)
-        url = url_match.group(1) if url_match else ""
-
-        source_match = re.search(r"- \*\*来源\*\*：\[(.+?)\]", article_text)
-        source = source_match.group(1) if source_match else "Other"
-
-        keywords_match = re.search(r"- \*\*关键词\*\*：(.+)", article_text)
-        keywords = []
-        if keywords_match:
-            keywords = re.findall(r"`([^`]+)`", keywords_match.group(1))
-
-        score_match = re.search(r"- \*\*评分\*\*：⭐+\s*\((\d+)/5\)", article_text)
-        score = score_match.group(1) if score_match else "3"
-
-        articles.append(
-            {
-                "rank": rank,
-                "title": title,
-                "summary": summary,
-                "key_points": key_points,
-                "url": url,
-                "source": source,
-                "keywords": keywords[:5],
-                "score": score,
-            }
-        )
+    return list(iter_report(report_path))
 
-    return articles
 
-
-def create_notion_page(database_id, article, report_date):
-    url = "https://api.notion.com/v1/pages"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": NOTION_VERSION,
-    }
-
-    data = {
+def build_page_payload(database_id, article, report_date):
+    return {
         "parent": {"database_id": database_id},
         "properties": {
             "Title": {"title": [{"text": {"content": article["title"]}}]},
@@ -204,125 +144,263 @@ def create_notion_page(database_id, article, report_date):
         },
     }
 
-    last_error = None
-    for attempt in range(MAX_RETRIES):
-        try:
-            response = requests.post(url, headers=headers, json=data, timeout=30)
-            return response
-        except requests.exceptions.RequestException as e:
-            last_error = e
-            if attempt < MAX_RETRIES - 1:
-                print(f"  ⚠️ Retry {attempt + 1}/{MAX_RETRIES}: {e}")
-                time.sleep(RETRY_DELAY)
-    raise last_error  # type: ignore
-
-
-def verify_database(database_id):
-    url = "https://api.notion.com/v1/search"
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": NOTION_VERSION,
-    }
-    data = {"filter": {"property": "object", "value": "database"}}
-
-    response = requests.post(url, headers=headers, json=data, timeout=30)
-    if response.status_code != 200:
-        return False, f"API error: {response.status_code}"
-
-    results = response.json().get("results", [])
-    for db in results:
-        if db["id"].replace("-", "") == database_id.replace("-", ""):
-            return True, db.get("title", [{}])[0].get("plain_text", "Untitled")
-
-    return False, "Database not found or not shared with integration"
-
-
-def main():
-    validate_required_env()
-
-    config = load_config()
-    database_id = resolve_database_id(config)
-
-    if not database_id:
-        print("❌ Missing database id: set NOTION_DATABASE_ID or config.json(database_id)")
-        sys.exit(1)
-
-    report_date = datetime.now().strftime("%Y-%m-%d")
-    force_sync = False
-
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--force" or sys.argv[1] == "-f":
-            force_sync = True
-            if len(sys.argv) > 2:
-                report_date = sys.argv[2]
-        else:
-            report_date = sys.argv[1]
 
+def verify_database(client, database_id):
+    # 直接按 ID 读取数据库，不再 /v1/search 遍历 Integration 可见的全部数据库
+    response = client.request("GET", f"/v1/databases/{database_id}")
+    if response.status_code == 200:
+        title = response.json().get("title") or [{}]
+        return True, title[0].get("plain_text", "Untitled")
+    if response.status_code in (400, 404):
+        return False, "Database not found or not shared with integration"
+    return False, f"API error: {response.status_code}"
+
+
+def load_verify_cache():
+    if not VERIFY_CACHE_PATH.exists():
+        return {}
+    try:
+        with open(VERIFY_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def verify_database_cached(client, database_id):
+    # 验证结果按 database_id 缓存 VERIFY_CACHE_HOURS 小时，批量补同步时只验证一次
+    key = database_id.replace("-", "")
+    cache = load_verify_cache()
+    entry = cache.get(key)
+    if entry:
+        verified_at = datetime.fromisoformat(entry["verified_at"])
+        if datetime.now() - verified_at < timedelta(hours=VERIFY_CACHE_HOURS):
+            return True, entry["title"]
+
+    db_ok, db_info = verify_database(client, database_id)
+    if db_ok:
+        cache[key] = {"title": db_info, "verified_at": datetime.now().isoformat()}
+        VERIFY_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(VERIFY_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2, ensure_ascii=False)
+    return db_ok, db_info
+
+
+def report_dates(date_from, date_to):
+    start = datetime.strptime(date_from, "%Y-%m-%d").date()
+    end = datetime.strptime(date_to, "%Y-%m-%d").date()
+    while start <= end:
+        yield start.isoformat()
+        start += timedelta(days=1)
+
+
+def glob_reports(pattern):
+    # 同一天同时存在两种命名时与 resolve_report_path 一致，优先 news-report
+    found = {}
+    for path in sorted(REPORT_DIR.glob(pattern)):
+        match = REPORT_NAME_RE.match(path.name)
+        if not match:
+            continue
+        report_date, kind = match.groups()
+        if report_date not in found or kind == "news-report":
+            found[report_date] = path
+    return sorted(found.items())
+
+
+def collect_reports(args):
+    if args.glob:
+        return glob_reports(args.glob)
+
+    if args.date_from or args.date_to:
+        date_from = args.date_from or args.date_to
+        date_to = args.date_to or datetime.now().strftime("%Y-%m-%d")
+        reports = []
+        for report_date in report_dates(date_from, date_to):
+            report_path = resolve_report_path(report_date)
+            if report_path is None:
+                print(f"⏭️  No report for {report_date}, skipped")
+                continue
+            reports.append((report_date, report_path))
+        return reports
+
+    report_date = args.date or datetime.now().strftime("%Y-%m-%d")
     report_path = resolve_report_path(report_date)
     if report_path is None:
         print(f"❌ Report not found for date: {report_date}")
         print(f"Tried: {REPORT_DIR / f'{report_date}-news-report.md'}")
         print(f"Tried: {REPORT_DIR / f'{report_date}-full.md'}")
         sys.exit(1)
+    return [(report_date, report_path)]
+
+
+def parse_reports(reports):
+    # 多份报告并行读取解析，结果按日期顺序返回
+    with ThreadPoolExecutor(max_workers=min(PARSE_WORKERS, len(reports))) as executor:
+        parsed = executor.map(parse_report, [path for _, path in reports])
+        return [(report_date, path, articles) for (report_date, path), articles in zip(reports, parsed)]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sync daily news reports to a Notion database")
+    parser.add_argument("date", nargs="?", help="report date (YYYY-MM-DD), defaults to today")
+    parser.add_argument("-f", "--force", action="store_true", help="sync all articles even if already synced")
+    parser.add_argument("--from", dest="date_from", help="first report date of a bulk sync (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", help="last report date of a bulk sync (YYYY-MM-DD), defaults to today")
+    parser.add_argument("--glob", help=f"bulk sync every report in {REPORT_DIR.name}/ matching this pattern, e.g. '2026-01-*.md'")
+    parser.add_argument("--trace", help="write a Chrome trace (chrome://tracing / Perfetto JSON) of sync stages and Notion requests")
+    parser.add_argument("--record", metavar="DIR", help="save every Notion response into this fixture directory while syncing normally")
+    parser.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="sync offline against a fixture directory written by --record; sync history and the verify cache are left untouched",
+    )
+    parser.add_argument("--replay-latency-ms", type=float, default=0.0, help="replay: synthetic latency added to each Notion response")
+    args = parser.parse_args()
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+    if args.date and (args.date_from or args.date_to or args.glob):
+        parser.error("positional date cannot be combined with --from/--to/--glob")
+    return args
+
+
+def print_timing(metrics, trace_path=None):
+    # 各阶段耗时与 Notion 请求延迟，便于发现变慢的环节
+    stages = " | ".join(f"{name} {ms}ms" for name, ms in metrics.stage_ms().items())
+    print(f"  ⏱️  Timing: {stages}")
+    for host, stats in metrics.latency_summary().items():
+        print(f"  🌐 {host}: {stats['requests']} requests, p50 {stats['p50_ms']}ms, p95 {stats['p95_ms']}ms, {stats['errors']} errors")
+    if trace_path:
+        print(f"  🧭 Trace: {metrics.write_trace(Path(trace_path))}")
+
+
+def open_client(config: SyncConfig, args):
+    # requests 在预检（环境变量、配置、报告）都通过之后才导入，预检失败的运行不必付这部分启动开销
+    try:
+        from http_fixtures import RECORD, REPLAY, mount_fixtures
+        from notion_client import NotionClient
+    except ImportError:
+        print(MISSING_DEPENDENCIES)
+        sys.exit(1)
+
+    client = NotionClient(config.api_key)
+    if args.record or args.replay:
+        mount_fixtures(
+            client.session,
+            Path(args.record or args.replay),
+            RECORD if args.record else REPLAY,
+            latency_ms=args.replay_latency_ms,
+            pool_maxsize=client.max_in_flight,
+        )
+    return client
+
+
+def main():
+    args = parse_args()
+    config = load_sync_config()
+    database_id = config.database_id
+
+    force_sync = args.force
+    metrics = RunMetrics()
+    with metrics.stage("collect"):
+        reports = collect_reports(args)
+    if not reports:
+        print("❌ No reports found to sync")
+        sys.exit(1)
+
+    client = open_client(config, args)
+    metrics.instrument(client.session)
 
     print(f"🔍 Verifying database access...")
-    db_ok, db_info = verify_database(database_id)
+    with metrics.stage("verify"):
+        # 回放时每次都走夹具验证，不读写真实的验证缓存
+        db_ok, db_info = verify_database(client, database_id) if args.replay else verify_database_cached(client, database_id)
     if not db_ok:
         print(f"❌ Database error: {db_info}")
         print("Please ensure the Integration has access to the database")
         sys.exit(1)
     print(f"✅ Database: {db_info}")
 
-    print(f"📰 Parsing report: {report_path}")
-    articles = parse_report(report_path)
-    print(f"✅ Found {len(articles)} articles")
-
     history = load_history()
-    synced_urls = set(history.get("synced_urls", []))
-
+    # 规范化 URL + 内容指纹索引，拦截 URL 写法不同的重复条目
+    dedup_index = DedupIndex(DEDUP_INDEX_PATH, scope="notion")
+
+    # 所有报告的新文章汇入同一条同步流水线；重复的 URL（含跨日期）只保留最早出现的那条
+    new_articles = []
+    queued_urls = set()
+    with metrics.stage("parse"):
+        parsed = parse_reports(reports)
+    with metrics.stage("filter"):
+        for report_date, report_path, articles in parsed:
+            print(f"📰 Parsing report: {report_path}")
+            print(f"✅ Found {len(articles)} articles")
+            if not force_sync:
+                articles = dedup_index.filter_unseen(history.filter_new(articles))
+            for article in articles:
+                if article["url"] in queued_urls:
+                    continue
+                queued_urls.add(article["url"])
+                new_articles.append((report_date, article))
+
+    page_ids = {}
     if force_sync:
-        print("🔄 Force sync mode: will sync all articles (may create duplicates)")
-        new_articles = articles
-    else:
-        new_articles = [a for a in articles if a["url"] not in synced_urls]
-    
+        # 已记录 page_id 的文章改为 PATCH 原页面，不再重复创建
+        page_ids = history.page_ids([a["url"] for _, a in new_articles])
+        print(f"🔄 Force sync mode: will update {len(page_ids)} existing pages and create the rest")
+
     print(f"🆕 New articles to sync: {len(new_articles)}")
 
     if not new_articles:
         print("✅ All articles already synced!")
         if not force_sync:
             print("💡 Tip: Use --force flag to re-sync all articles")
+        dedup_index.close()
+        history.close()
+        client.close()
+        print_timing(metrics, args.trace)
         return
 
     success_count = 0
     failed = []
-
-    for i, article in enumerate(new_articles, 1):
-        print(f"[{i}/{len(new_articles)}] Syncing: {article['title'][:50]}...")
-        try:
-            response = create_notion_page(database_id, article, report_date)
-            if response.status_code == 200:
+    synced_articles = []
+    synced_entries = []
+
+    with metrics.stage("sync"):
+        jobs = [(page_ids.get(a["url"]), build_page_payload(database_id, a, report_date)) for report_date, a in new_articles]
+        for done, (idx, result) in enumerate(client.upsert_pages(jobs), 1):
+            report_date, article = new_articles[idx]
+            prefix = f"[{report_date}] " if len(reports) > 1 else ""
+            print(f"[{done}/{len(new_articles)}] {prefix}Syncing: {article['title'][:50]}...")
+            if isinstance(result, Exception):
+                failed.append((article["title"], "Error", str(result)[:100]))
+                print(f"  ❌ Error: {result}")
+            elif result.status_code == 200:
                 success_count += 1
-                synced_urls.add(article["url"])
+                synced_entries.append((article["url"], result.json().get("id"), report_date))
+                synced_articles.append(article)
                 print("  ✅ Success")
             else:
-                failed.append(
-                    (article["title"], response.status_code, response.text[:100])
-                )
-                print(f"  ❌ Failed: {response.status_code}")
-        except Exception as e:
-            failed.append((article["title"], "Error", str(e)[:100]))
-            print(f"  ❌ Error: {e}")
-
-    history["synced_urls"] = list(synced_urls)
-    history["last_sync"] = datetime.now().isoformat()
-    history["stats"]["total_synced"] = len(synced_urls)
-    save_history(history)
+                failed.append((article["title"], result.status_code, result.text[:100]))
+                print(f"  ❌ Failed: {result.status_code}")
+    client.close()
+
+    with metrics.stage("record"):
+        if args.replay:
+            # 回放得到的 page_id 并不存在，不能写进同步历史
+            print("🎞️ Replay mode: sync history not updated")
+        else:
+            history.record(synced_entries)
+            history.compact()
+            dedup_index.record(synced_articles)
+            # 与报告侧一致，超过 TTL 未再出现的键及时清掉：指纹只取标题和摘要前 50 个字符，留着会永久拦下撞上指纹的新文章
+            dedup_index.evict()
+        history.close()
+        dedup_index.close()
 
     print(f"\n📊 Sync Summary:")
+    if len(reports) > 1:
+        print(f"  📅 Reports: {len(reports)} ({reports[0][0]} ~ {reports[-1][0]})")
     print(f"  ✅ Success: {success_count}")
     print(f"  ❌ Failed: {len(failed)}")
+    print_timing(metrics, args.trace)
 
     if failed:
         print(f"\n❌ Failed articles:")
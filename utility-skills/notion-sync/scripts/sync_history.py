@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Optional
+
+# normalize_url 来自 _shared/scripts，单独导入本模块时也能找到
+SHARED_SCRIPTS = str(Path(__file__).resolve().parents[3] / "_shared" / "scripts")
+if SHARED_SCRIPTS not in sys.path:
+    sys.path.insert(0, SHARED_SCRIPTS)
+from dedup_index import normalize_url  # noqa: E402
+
+COMPACT_INTERVAL_DAYS = 7
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS synced_pages (
+    url_hash INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    page_id TEXT,
+    report_date TEXT,
+    synced_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def url_hash(url: str) -> int:
+    # 规范化 URL 的 64 位哈希直接作为 rowid，索引和数据在同一棵 B 树里，百万条记录也只需一次 B 树查找
+    digest = hashlib.blake2b(normalize_url(url).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class SyncHistory:
+    # 打开即用，不需要把全部历史读进内存；写入只追加新行（WAL），定期 checkpoint + VACUUM 压缩
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def _lookup(self, urls: list[str]) -> dict[int, Optional[str]]:
+        hashes = list({url_hash(u) for u in urls})
+        found = {}
+        for start in range(0, len(hashes), 900):
+            chunk = hashes[start : start + 900]
+            marks = ",".join("?" * len(chunk))
+            rows = self.conn.execute(f"SELECT url_hash, page_id FROM synced_pages WHERE url_hash IN ({marks})", chunk)
+            found.update(rows)
+        return found
+
+    def __contains__(self, url: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM synced_pages WHERE url_hash = ?", (url_hash(url),)
+        ).fetchone() is not None
+
+    def filter_new(self, articles: list[dict]) -> list[dict]:
+        found = self._lookup([a["url"] for a in articles])
+        return [a for a in articles if url_hash(a["url"]) not in found]
+
+    def page_ids(self, urls: list[str]) -> dict[str, str]:
+        found = self._lookup(urls)
+        return {u: found[url_hash(u)] for u in urls if found.get(url_hash(u))}
+
+    def record(self, entries: Iterable[tuple[str, Optional[str], str]]) -> None:
+        # entries: (url, page_id, report_date)；已存在的 URL 只更新 page_id 和时间，不产生重复行
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = [(url_hash(url), url, page_id, report_date, now) for url, page_id, report_date in entries]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO synced_pages (url_hash, url, page_id, report_date, synced_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (url_hash) DO UPDATE SET page_id = COALESCE(excluded.page_id, page_id), "
+                "synced_at = excluded.synced_at",
+                rows,
+            )
+            self.set_meta("last_sync", now)
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM sync_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str) -> None:
+        self.conn.execute(
+            "INSERT INTO sync_meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def import_json(self, json_path: Path) -> int:
+        # 迁移旧版 sync-history.json 的 synced_urls（旧格式没有 page_id）
+        if not Path(json_path).exists():
+            return 0
+        with open(json_path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+        urls = legacy.get("synced_urls", [])
+        synced_at = legacy.get("last_sync") or datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO synced_pages (url_hash, url, page_id, report_date, synced_at) "
+                "VALUES (?, ?, NULL, NULL, ?)",
+                [(url_hash(u), u, synced_at) for u in urls],
+            )
+            self.set_meta("migrated_from", str(json_path))
+        return len(urls)
+
+    def compact(self, force: bool = False) -> bool:
+        last = self.get_meta("last_compact")
+        if not force and last and datetime.now() - datetime.fromisoformat(last) < timedelta(days=COMPACT_INTERVAL_DAYS):
+            return False
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conn.execute("VACUUM")
+        with self.conn:
+            self.set_meta("last_compact", datetime.now().isoformat(timespec="seconds"))
+        return True
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM synced_pages").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()